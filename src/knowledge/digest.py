@@ -0,0 +1,225 @@
+"""Compact, cached digests of knowledge files.
+
+A digest holds a file's sections (headings with their condensed bullets),
+any hard-nos, tone markers (greeting, sign-off, contractions, exclamations,
+emoji) and length stats. That is enough to load context at session start
+without reading every file in full.
+
+Digests are stored in data/knowledge/.digests/, one per content hash, and
+data/knowledge/.digests/manifest.json maps each file to its current hash.
+A digest is only regenerated when the file's content changes.
+
+    python -m src.knowledge.digest                       # profile + lessons learned
+    python -m src.knowledge.digest data/knowledge/messages
+    python -m src.knowledge.digest --all
+"""
+
+import argparse
+import json
+import re
+from pathlib import Path
+
+from .files import KNOWLEDGE_DIR, REPO_ROOT, content_hash, iter_documents, relative
+
+DIGEST_DIR = KNOWLEDGE_DIR / ".digests"
+MANIFEST_PATH = DIGEST_DIR / "manifest.json"
+DIGEST_VERSION = 3
+
+DEFAULT_FILES = [
+    KNOWLEDGE_DIR / "profile" / "user_profile.md",
+    KNOWLEDGE_DIR / "profile" / "lessons_learned.md",
+]
+
+# Limits that keep a digest small
+MAX_ITEMS_PER_SECTION = 12
+MAX_ITEM_CHARS = 200
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*)$")
+BULLET_RE = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+(.*)$")
+HARD_NO_HEADING_RE = re.compile(r"hard[\s-]*nos?|not looking|deal[\s-]*breakers?|avoid|won'?t", re.IGNORECASE)
+HARD_NO_LINE_RE = re.compile(r"\bhard[\s-]*no\b|\bnever\b|\bno way\b|\bdeal[\s-]*breaker\b", re.IGNORECASE)
+SENTENCE_RE = re.compile(r"[^.!?]+[.!?]+")
+CONTRACTION_RE = re.compile(r"\b\w+'(?:s|re|ve|ll|d|m|t)\b", re.IGNORECASE)
+EMOJI_RE = re.compile("[\U0001F300-\U0001FAFF☀-➿]")
+MARKDOWN_RE = re.compile(r"[*_`]+|\[([^\]]*)\]\([^)]*\)")
+COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+
+
+def _strip_markdown(line: str) -> str:
+    return MARKDOWN_RE.sub(lambda m: m.group(1) or "", line).strip()
+
+
+def _clean(line: str) -> str:
+    line = _strip_markdown(line)
+    return line if len(line) <= MAX_ITEM_CHARS else line[:MAX_ITEM_CHARS - 1] + "…"
+
+
+def _items(text: str):
+    """(heading, item) for every bullet or prose line, in full; headings alone as (heading, None)."""
+    current = "(top)"
+    for raw in text.splitlines():
+        heading = HEADING_RE.match(raw)
+        if heading:
+            current = _clean(heading.group(2))
+            yield current, None
+            continue
+        bullet = BULLET_RE.match(raw)
+        line = _strip_markdown(bullet.group(1) if bullet else raw)
+        if not line or set(line) <= set("-=|"):
+            continue
+        yield current, line
+
+
+def _sections(text: str) -> dict:
+    """Heading -> condensed items (bullets, or paragraph lines for prose)."""
+    sections = {}
+    for heading, line in _items(text):
+        items = sections.setdefault(heading, [])
+        if line is not None and len(items) < MAX_ITEMS_PER_SECTION:
+            items.append(_clean(line))
+    return {heading: items for heading, items in sections.items() if items}
+
+
+def _hard_nos(text: str) -> list[str]:
+    """Every hard no, in full: unlike sections, these are never capped or shortened."""
+    hard_nos = []
+    for heading, line in _items(text):
+        if line is not None and (HARD_NO_HEADING_RE.search(heading) or HARD_NO_LINE_RE.search(line)):
+            hard_nos.append(line)
+    return hard_nos
+
+
+def _tone_markers(text: str) -> dict:
+    # Greeting and sign-off only make sense for prose (messages, letters), not bullet lists
+    lines = [
+        line.strip() for line in text.splitlines()
+        if line.strip() and not HEADING_RE.match(line) and not BULLET_RE.match(line)
+    ]
+    words = text.split()
+    markers = {
+        "contractions_per_100_words": round(100 * len(CONTRACTION_RE.findall(text)) / max(len(words), 1), 1),
+        "exclamations": text.count("!"),
+        "questions": text.count("?"),
+        "emoji": len(EMOJI_RE.findall(text)),
+    }
+    if lines:
+        markers["greeting"] = _clean(lines[0])[:60]
+        markers["sign_off"] = _clean(" ".join(lines[-2:]))[:80]
+    return markers
+
+
+def _stats(text: str) -> dict:
+    words = text.split()
+    sentences = SENTENCE_RE.findall(text)
+    paragraphs = [p for p in re.split(r"\n\s*\n", text) if p.strip()]
+    return {
+        "chars": len(text),
+        "words": len(words),
+        "lines": text.count("\n") + 1 if text else 0,
+        "paragraphs": len(paragraphs),
+        "sentences": len(sentences),
+        "avg_sentence_words": round(len(words) / len(sentences), 1) if sentences else None,
+    }
+
+
+def build_digest(data: bytes) -> dict:
+    """Digest of a file's content; the path is left out so identical files share one cached blob."""
+    text = COMMENT_RE.sub("", data.decode("utf-8", errors="replace"))
+    sections = _sections(text)
+    return {
+        "version": DIGEST_VERSION,
+        "hash": content_hash(data),
+        "sections": sections,
+        "hard_nos": _hard_nos(text),
+        "tone": _tone_markers(text),
+        "stats": _stats(text),
+    }
+
+
+class DigestCache:
+    def __init__(self, directory: Path = DIGEST_DIR):
+        self.directory = directory
+        self.manifest_path = directory / "manifest.json"
+        self.manifest = json.loads(self.manifest_path.read_text()) if self.manifest_path.exists() else {}
+        self.regenerated = 0
+        self._dirty = False
+
+    def _digest_path(self, digest_hash: str) -> Path:
+        return self.directory / f"{digest_hash}.json"
+
+    def get(self, path: Path) -> dict:
+        """Digest for `path`, regenerated only if the file's content changed."""
+        key = relative(path)
+        stat = path.stat()
+        entry = self.manifest.get(key)
+
+        if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+            cached = self._digest_path(entry["hash"])
+            digest = json.loads(cached.read_text()) if cached.exists() else None
+            if digest and digest.get("version") == DIGEST_VERSION:
+                return {"path": key, **digest}
+
+        data = path.read_bytes()
+        digest_hash = content_hash(data)
+        cached = self._digest_path(digest_hash)
+        digest = json.loads(cached.read_text()) if cached.exists() else None
+        if digest is None or digest.get("version") != DIGEST_VERSION:
+            digest = build_digest(data)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            cached.write_text(json.dumps(digest, ensure_ascii=False))
+            self.regenerated += 1
+
+        old_hash = entry["hash"] if entry else None
+        self.manifest[key] = {"mtime": stat.st_mtime, "size": stat.st_size, "hash": digest_hash}
+        self._dirty = True
+        if old_hash and old_hash != digest_hash:
+            self._drop_if_unused(old_hash)
+        return {"path": key, **digest}
+
+    def _drop_if_unused(self, digest_hash: str):
+        if not any(e["hash"] == digest_hash for e in self.manifest.values()):
+            self._digest_path(digest_hash).unlink(missing_ok=True)
+
+    def save(self):
+        if not self._dirty:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.manifest, indent=2))
+        tmp.replace(self.manifest_path)
+        self._dirty = False
+
+
+def digests(paths: list[Path]) -> list[dict]:
+    """Digests for the given files and directories (missing files are skipped)."""
+    cache = DigestCache()
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(iter_documents(path))
+        elif path.exists():
+            files.append(path)
+
+    result = [cache.get(f) for f in files]
+    cache.save()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact digests of knowledge files")
+    parser.add_argument("paths", nargs="*", help="Files or directories (default: user profile and lessons learned)")
+    parser.add_argument("--all", action="store_true", help="Every file under data/knowledge")
+    args = parser.parse_args()
+
+    if args.all:
+        paths = [KNOWLEDGE_DIR]
+    elif args.paths:
+        paths = [Path(p) if Path(p).is_absolute() else REPO_ROOT / p for p in args.paths]
+    else:
+        paths = DEFAULT_FILES
+
+    print(json.dumps(digests(paths), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
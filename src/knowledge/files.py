@@ -0,0 +1,27 @@
+"""Walking and fingerprinting the knowledge tree (data/knowledge)."""
+
+import hashlib
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+KNOWLEDGE_DIR = REPO_ROOT / "data" / "knowledge"
+TEXT_SUFFIXES = {".md", ".txt"}
+
+
+def iter_documents(root: Path = KNOWLEDGE_DIR):
+    """Yield every text document under the knowledge tree, skipping hidden cache dirs."""
+    for path in sorted(root.rglob("*")):
+        if path.suffix.lower() not in TEXT_SUFFIXES or not path.is_file():
+            continue
+        if any(part.startswith(".") for part in path.relative_to(root).parts):
+            continue
+        yield path
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def relative(path: Path) -> str:
+    """Path relative to the repo root, as the skills refer to files."""
+    return path.resolve().relative_to(REPO_ROOT.resolve()).as_posix()
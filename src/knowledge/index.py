@@ -0,0 +1,172 @@
+"""BM25 full-text index over data/knowledge.
+
+The index lives in data/knowledge/.index/bm25.json and is updated
+incrementally: files whose mtime and size are unchanged are skipped, and a
+changed mtime only triggers re-indexing if the content hash changed too.
+
+    python -m src.knowledge.index update
+    python -m src.knowledge.index query --company Anthropic --role "Research Engineer" -k 5
+    python -m src.knowledge.index query --dirs messages "follow up after coffee chat"
+
+`query` updates the index first, so results always reflect the files on disk.
+"""
+
+import argparse
+import json
+import math
+import re
+from collections import Counter
+from pathlib import Path
+
+from .files import KNOWLEDGE_DIR, content_hash, iter_documents, relative
+
+INDEX_PATH = KNOWLEDGE_DIR / ".index" / "bm25.json"
+INDEX_VERSION = 1
+
+# BM25 parameters
+K1 = 1.5
+B = 0.75
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "has", "have", "i",
+    "in", "is", "it", "its", "me", "my", "of", "on", "or", "our", "so", "that", "the", "their",
+    "this", "to", "was", "we", "were", "will", "with", "you", "your",
+}
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+class KnowledgeIndex:
+    def __init__(self, path: Path = INDEX_PATH, root: Path = KNOWLEDGE_DIR):
+        self.path = path
+        self.root = root
+        data = json.loads(path.read_text()) if path.exists() else {}
+        if data.get("version") != INDEX_VERSION:
+            data = {}
+        self.docs = data.get("docs", {})          # relpath -> {mtime, size, hash, length, terms}
+        self.postings = data.get("postings", {})  # term -> {relpath: tf}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": INDEX_VERSION, "docs": self.docs, "postings": self.postings}))
+        tmp.replace(self.path)
+
+    def _remove(self, key):
+        for term in self.docs.pop(key)["terms"]:
+            doc_postings = self.postings.get(term)
+            if doc_postings is not None:
+                doc_postings.pop(key, None)
+                if not doc_postings:
+                    del self.postings[term]
+
+    def _add(self, key, path: Path, data: bytes, stat):
+        # The filename carries company/role for saved applications, so index it too
+        text = path.stem.replace("_", " ") + "\n" + data.decode("utf-8", errors="replace")
+        counts = Counter(tokenize(text))
+        for term, tf in counts.items():
+            self.postings.setdefault(term, {})[key] = tf
+        self.docs[key] = {
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "hash": content_hash(data),
+            "length": sum(counts.values()),
+            "terms": sorted(counts),
+        }
+
+    def update(self) -> dict:
+        """Bring the index in line with the files on disk. Returns change counts."""
+        seen = set()
+        added = updated = touched = 0
+
+        for path in iter_documents(self.root):
+            key = relative(path)
+            seen.add(key)
+            stat = path.stat()
+            doc = self.docs.get(key)
+            if doc and doc["mtime"] == stat.st_mtime and doc["size"] == stat.st_size:
+                continue
+
+            data = path.read_bytes()
+            if doc and doc["hash"] == content_hash(data):
+                doc["mtime"] = stat.st_mtime  # touched, not changed
+                touched += 1
+                continue
+
+            if doc:
+                self._remove(key)
+                updated += 1
+            else:
+                added += 1
+            self._add(key, path, data, stat)
+
+        removed = [key for key in self.docs if key not in seen]
+        for key in removed:
+            self._remove(key)
+
+        # Save new mtimes of touched files too, or they'd be re-read and re-hashed on every update
+        if added or updated or removed or touched:
+            self.save()
+        return {"added": added, "updated": updated, "removed": len(removed), "total": len(self.docs)}
+
+    def search(self, query: str, k: int = 5, dirs: list[str] = None) -> list[dict]:
+        """Top-k documents for `query` by BM25, optionally limited to knowledge subdirectories.
+
+        A term repeated in the query counts that many times, so callers can weight terms up.
+        """
+        if not self.docs:
+            return []
+
+        prefixes = [relative(self.root / d) + "/" for d in dirs] if dirs else None
+        n_docs = len(self.docs)
+        avg_length = sum(d["length"] for d in self.docs.values()) / n_docs
+
+        scores = Counter()
+        for term, weight in Counter(tokenize(query)).items():
+            doc_postings = self.postings.get(term)
+            if not doc_postings:
+                continue
+            idf = math.log(1 + (n_docs - len(doc_postings) + 0.5) / (len(doc_postings) + 0.5))
+            for key, tf in doc_postings.items():
+                if prefixes and not any(key.startswith(p) for p in prefixes):
+                    continue
+                length = self.docs[key]["length"]
+                scores[key] += weight * idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avg_length))
+
+        return [{"path": key, "score": round(score, 3)} for key, score in scores.most_common(k)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text index over data/knowledge")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("update", help="Index new and changed files")
+
+    p = sub.add_parser("query", help="Most relevant past documents")
+    p.add_argument("text", nargs="*", help="Free-text query")
+    p.add_argument("--company", default="")
+    p.add_argument("--role", default="")
+    p.add_argument("-k", type=int, default=5, help="Number of results (default: 5)")
+    p.add_argument(
+        "--dirs", default=None,
+        help="Comma-separated knowledge subdirectories to search (e.g. cover_letters,applications)"
+    )
+    args = parser.parse_args()
+
+    index = KnowledgeIndex()
+    changes = index.update()
+
+    if args.command == "update":
+        print(json.dumps(changes))
+        return
+
+    # Company and role are what matter most for picking examples, so weight them up
+    query = " ".join([args.company] * 2 + [args.role] * 2 + args.text)
+    dirs = [d.strip() for d in args.dirs.split(",")] if args.dirs else None
+    print(json.dumps(index.search(query, k=args.k, dirs=dirs), indent=2))
+
+
+if __name__ == "__main__":
+    main()
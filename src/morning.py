@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Everything the Morning Routine needs, fetched at once into one snapshot.
+
+Runs these parts concurrently and writes data/morning_snapshot.json:
+
+    scrape        update_queue.py for the confirmed sources (new jobs → scraped_tmp.json)
+    weekly_plan   this week's plan from Notion
+    todo          the to-do page from Notion
+    mirror        contacts and applications: the local mirror is synced, then
+                  read, including the follow-up lists (awaiting reply, stale)
+    inbox         unprocessed Telegram captures
+    outbox        Notion writes that haven't gone through yet
+
+Once the to-do page and the contacts are in, the Telegram triage vocabulary
+is rewritten from them (no extra Notion calls). Each part is timed and may
+fail on its own; a failed part is recorded with its error and the rest of
+the snapshot is still written, so wall time is the slowest part rather than
+the sum of all of them.
+
+Usage (from the repo root):
+    python -m src.morning --sources "Anthropic,Mistral"   # scrape only these sources
+    python -m src.morning --no-scrape
+    python -m src.morning --show weekly_plan              # print one part of the last snapshot
+    python -m src.morning --show mirror.stale_contacts
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from src.notion import client, mirror, outbox
+from src.telegram import triage
+from src.telegram.inbox import InboxLog
+
+REPO_ROOT = Path(__file__).parent.parent
+SNAPSHOT_FILE = REPO_ROOT / "data" / "morning_snapshot.json"
+SCRAPED_TMP = REPO_ROOT / "data" / "scraped_jobs" / "scraped_tmp.json"
+LOG_LINES = 15  # lines of scraper output kept in the snapshot
+
+
+def scrape(sources: str = None) -> dict:
+    # update_queue.py runs as a script from the repo root (its imports and paths rely on it)
+    command = [sys.executable, "src/scraping/update_queue.py"]
+    if sources:
+        command += ["--sources", sources]
+    done = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True)
+    log = (done.stdout + done.stderr).strip().splitlines()[-LOG_LINES:]
+    if done.returncode != 0:
+        raise RuntimeError(f"update_queue.py exited with {done.returncode}: {log[-1] if log else ''}")
+    new_jobs = len(json.loads(SCRAPED_TMP.read_text())) if SCRAPED_TMP.exists() else 0
+    return {"new_jobs": new_jobs, "log": log}
+
+
+def follow_ups() -> dict:
+    conn = mirror.connect()
+    mirror.sync(conn)
+    return {
+        "contacts": mirror.contacts(conn),
+        "applications": mirror.applications(conn),
+        "awaiting_reply": mirror.awaiting_reply(conn=conn),
+        "stale_contacts": mirror.stale_contacts(7, conn=conn),
+        "stale_applications": mirror.stale_applications(14, conn=conn),
+    }
+
+
+def _notion(func):
+    """Client reads report some problems as {"error": ...} rather than raising."""
+    def read():
+        result = func()
+        if isinstance(result, dict) and "error" in result:
+            raise RuntimeError(result["error"])
+        return result
+    return read
+
+
+def _run(func):
+    start = time.perf_counter()
+    try:
+        outcome = {"ok": True, "result": func()}
+    except Exception as e:
+        outcome = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    outcome["seconds"] = round(time.perf_counter() - start, 2)
+    return outcome
+
+
+def snapshot(sources: str = None, no_scrape: bool = False) -> dict:
+    """Run every part concurrently and return the snapshot (also written to SNAPSHOT_FILE)."""
+    parts = {
+        "weekly_plan": _notion(client.get_weekly_plan),
+        "todo": _notion(client.get_todo_page),
+        "mirror": follow_ups,
+        "inbox": lambda: InboxLog().unprocessed(),
+        "outbox": outbox.status,
+    }
+    if not no_scrape:
+        parts["scrape"] = lambda: scrape(sources)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(parts)) as pool:
+        futures = {name: pool.submit(_run, func) for name, func in parts.items()}
+        outcomes = {name: futures[name].result() for name in ("todo", "mirror")}
+        if outcomes["todo"]["ok"] and outcomes["mirror"]["ok"]:
+            # The triage vocabulary comes from these two; refresh it while the scrape runs
+            contacts = outcomes["mirror"]["result"]["contacts"]
+            todo_page = outcomes["todo"]["result"]
+            outcomes["vocabulary"] = _run(lambda: triage.save_vocabulary(todo_page, contacts)["categories"])
+        for name, future in futures.items():
+            outcomes[name] = future.result()
+
+    result = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "wall_seconds": round(time.perf_counter() - start, 2),
+        "parts": {},
+    }
+    for name, outcome in outcomes.items():
+        result["parts"][name] = {k: v for k, v in outcome.items() if k != "result"}
+        result[name] = outcome.get("result")
+
+    SNAPSHOT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = SNAPSHOT_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(result, indent=2, ensure_ascii=False, default=str))
+    os.replace(tmp, SNAPSHOT_FILE)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch everything the morning routine needs into one snapshot")
+    parser.add_argument("--sources", type=str, default=None, help="Comma-separated sources to scrape (default: all)")
+    parser.add_argument("--no-scrape", action="store_true", help="Skip the scrape")
+    parser.add_argument("--show", type=str, default=None, metavar="PART",
+                        help="Print one part of the last snapshot instead of running (e.g. inbox, mirror.awaiting_reply)")
+    args = parser.parse_args()
+
+    if args.show:
+        if not SNAPSHOT_FILE.exists():
+            print("No snapshot yet. Run python -m src.morning first.")
+            sys.exit(1)
+        value = json.loads(SNAPSHOT_FILE.read_text())
+        for key in args.show.split("."):
+            value = value.get(key) if isinstance(value, dict) else None
+        print(json.dumps(value, indent=2, ensure_ascii=False))
+        return
+
+    result = snapshot(args.sources, args.no_scrape)
+    for name, part in result["parts"].items():
+        status = "ok" if part["ok"] else f"FAILED — {part['error']}"
+        print(f"  {name:<12} {part['seconds']:>6.1f}s  {status}")
+    print(f"Snapshot written to {SNAPSHOT_FILE.relative_to(REPO_ROOT)} in {result['wall_seconds']:.1f}s")
+    if not any(part["ok"] for part in result["parts"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Batch mode: run many client operations in one process.
+
+Reads one operation per line from stdin and writes one result per line to
+stdout, in input order:
+
+    {"op": "add_todo_item", "args": {"category": "Networking", "task_name": "..."}}
+    {"op": "add_contact", "args": ["Jane Doe"], "id": "jane"}
+
+    → {"index": 0, "op": "add_todo_item", "ok": true, "result": {...}}
+    → {"index": 1, "op": "add_contact", "id": "jane", "ok": true, "result": {...}}
+
+All operations share one Notion session. Independent operations run
+concurrently; operations that append under the same parent (same to-do
+category, same day, the backlog page) run in input order.
+
+Usage:
+    python -m src.notion < operations.jsonl
+    python -m src.notion --workers 1 < operations.jsonl   # strictly sequential
+"""
+
+import argparse
+import json
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from . import ops
+
+# Notion allows roughly 3 requests per second per integration
+DEFAULT_WORKERS = 3
+
+
+def _run(line_index, request, wait_for=None):
+    if wait_for is not None:
+        wait_for.exception()  # block until done; its failure doesn't stop us
+
+    result = {"index": line_index, "op": request.get("op")}
+    if "id" in request:
+        result["id"] = request["id"]
+    try:
+        value = ops.call(request.get("op"), request.get("args"))
+        result.update(ok=True, result=value)
+    except Exception as e:
+        result.update(ok=False, error=f"{type(e).__name__}: {e}")
+    return result
+
+
+def _parse_error(line_index, error):
+    return {"index": line_index, "op": None, "ok": False, "error": f"Invalid request: {error}"}
+
+
+def _write_results(pending: queue.Queue, out):
+    """Print results in input order as soon as each one is ready."""
+    while True:
+        future = pending.get()
+        if future is None:
+            return
+        out.write(json.dumps(future.result(), default=str) + "\n")
+        out.flush()
+
+
+def run_batch(lines, out=sys.stdout, workers: int = DEFAULT_WORKERS):
+    """Execute a stream of JSON-line operations, writing results to `out`."""
+    pending = queue.Queue()
+    writer = threading.Thread(target=_write_results, args=(pending, out))
+    writer.start()
+
+    last_by_key = {}
+    # FIFO scheduling guarantees a predecessor is picked up before the task
+    # waiting on it, so chaining by waiting can't deadlock the pool.
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        try:
+            for line_index, line in enumerate(lines):
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("expected a JSON object")
+                except ValueError as e:
+                    pending.put(pool.submit(_parse_error, line_index, e))
+                    continue
+
+                key = ops.ordering_key(request.get("op"), request.get("args"))
+                future = pool.submit(_run, line_index, request, last_by_key.get(key) if key else None)
+                if key:
+                    last_by_key[key] = future
+                pending.put(future)
+        finally:
+            pending.put(None)
+            writer.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run JSON-line Notion operations from stdin")
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS,
+        help=f"Maximum concurrent operations (default: {DEFAULT_WORKERS})"
+    )
+    args = parser.parse_args()
+    run_batch(sys.stdin, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 import os
+import threading
+import time
 from datetime import datetime
 from dotenv import load_dotenv
 import requests
@@ -18,32 +20,82 @@ HEADERS = {
     "Content-Type": "application/json"
 }
 
+# One pooled session per process so repeated calls reuse the TLS connection
+_session = requests.Session()
+
+# Per-thread pacing: a thread that sets `_local.throttle` (the outbox flusher)
+# calls it before every request it makes
+_local = threading.local()
+
+
+MAX_RETRIES = 5
+
 
 def _request(method, endpoint, json=None):
-    """Make a request to the Notion API."""
+    """Make a request to the Notion API.
+
+    Rate-limited requests (429) are retried after the delay Notion asks for.
+    """
     url = f"{BASE_URL}/{endpoint}"
-    response = requests.request(method, url, headers=HEADERS, json=json)
+    throttle = getattr(_local, "throttle", None)
+    for attempt in range(MAX_RETRIES):
+        if throttle:
+            throttle()
+        response = _session.request(method, url, headers=HEADERS, json=json)
+        if response.status_code != 429 or attempt == MAX_RETRIES - 1:
+            break
+        time.sleep(float(response.headers.get("Retry-After", 1)))
     response.raise_for_status()
     return response.json()
 
 
-def get_applications():
-    """Returns all entries from the Applications Log database."""
-    response = _request("POST", f"databases/{APPLICATIONS_DB_ID}/query")
-    applications = []
+def _query_database(database_id, filter=None, filter_properties=None):
+    """Query a database, following pagination. Returns the raw page objects."""
+    endpoint = f"databases/{database_id}/query"
+    if filter_properties:
+        endpoint += "?" + "&".join(f"filter_properties={p}" for p in filter_properties)
+
+    body = {"page_size": 100}
+    if filter:
+        body["filter"] = filter
+
+    pages = []
+    while True:
+        response = _request("POST", endpoint, json=body)
+        pages.extend(response["results"])
+        if not response.get("has_more"):
+            return pages
+        body["start_cursor"] = response["next_cursor"]
+
+
+def _parse_application(page):
+    props = page["properties"]
+    return {
+        "id": page["id"],
+        "company": _get_title(props.get("Company")),
+        "role": _get_rich_text(props.get("Role")),
+        "date": _get_date(props.get("Submission Date")),
+        "status": _get_select(props.get("Application Status")),
+        "notes": _get_rich_text(props.get("Notes")),
+    }
 
-    for page in response["results"]:
-        props = page["properties"]
-        applications.append({
-            "id": page["id"],
-            "company": _get_title(props.get("Company")),
-            "role": _get_rich_text(props.get("Role")),
-            "date": _get_date(props.get("Submission Date")),
-            "status": _get_select(props.get("Application Status")),
-            "notes": _get_rich_text(props.get("Notes")),
-        })
 
-    return applications
+def _parse_contact(page):
+    props = page["properties"]
+    return {
+        "id": page["id"],
+        "name": _get_title(props.get("Name")),
+        "company": _get_rich_text(props.get("Company")),
+        "role": _get_rich_text(props.get("Role")),
+        "status": _get_select(props.get("Status")),
+        "last_contact": _get_date(props.get("Last Contact")),
+        "notes": _get_rich_text(props.get("Notes")),
+    }
+
+
+def get_applications():
+    """Returns all entries from the Applications Log database."""
+    return [_parse_application(page) for page in _query_database(APPLICATIONS_DB_ID)]
 
 
 def add_application(company: str, role: str, date: str = None, status: str = "Applied", notes: str = ""):
@@ -69,22 +121,7 @@ def add_application(company: str, role: str, date: str = None, status: str = "Ap
 
 def get_contacts():
     """Returns all contacts from the Contacts database."""
-    response = _request("POST", f"databases/{CONTACTS_DB_ID}/query")
-    contacts = []
-
-    for page in response["results"]:
-        props = page["properties"]
-        contacts.append({
-            "id": page["id"],
-            "name": _get_title(props.get("Name")),
-            "company": _get_rich_text(props.get("Company")),
-            "role": _get_rich_text(props.get("Role")),
-            "status": _get_select(props.get("Status")),
-            "last_contact": _get_date(props.get("Last Contact")),
-            "notes": _get_rich_text(props.get("Notes")),
-        })
-
-    return contacts
+    return [_parse_contact(page) for page in _query_database(CONTACTS_DB_ID)]
 
 
 def add_contact(name: str, company: str = "", role: str = "", status: str = "New",
@@ -244,66 +281,69 @@ def get_todo_page():
     return {"page_id": MAIN_PAGE_ID, "categories": todos}
 
 
-def add_todo_item(category: str, task_name: str):
-    """Adds a task under a category toggle (heading_3) in the main page."""
-    # Get blocks from the main page
-    blocks = _request("GET", f"blocks/{MAIN_PAGE_ID}/children")
+def _todo_block(task_name):
+    return {
+        "type": "to_do",
+        "to_do": {
+            "rich_text": [{"type": "text", "text": {"content": task_name}}],
+            "checked": False
+        }
+    }
 
-    target_heading_id = None
 
-    # Find the toggleable heading_3 for this category
+def _find_category_heading(category):
+    """ID of the toggleable heading_3 for a to-do category, or None."""
+    blocks = _request("GET", f"blocks/{MAIN_PAGE_ID}/children")
+
     for block in blocks["results"]:
-        if block["type"] == "column_list":
-            columns = _request("GET", f"blocks/{block['id']}/children")
-            for column in columns["results"]:
-                items = _request("GET", f"blocks/{column['id']}/children")
-                for item in items["results"]:
-                    if item["type"] == "heading_3" and item.get("has_children"):
-                        heading_text = _get_rich_text_from_block(item["heading_3"]["rich_text"])
-                        if category.lower() in heading_text.lower():
-                            target_heading_id = item["id"]
-                            break
-                if target_heading_id:
-                    break
-            if target_heading_id:
-                break
+        if block["type"] != "column_list":
+            continue
+        columns = _request("GET", f"blocks/{block['id']}/children")
+        for column in columns["results"]:
+            items = _request("GET", f"blocks/{column['id']}/children")
+            for item in items["results"]:
+                if item["type"] == "heading_3" and item.get("has_children"):
+                    heading_text = _get_rich_text_from_block(item["heading_3"]["rich_text"])
+                    if category.lower() in heading_text.lower():
+                        return item["id"]
+    return None
 
+
+def add_todo_item(category: str, task_name: str):
+    """Adds a task under a category toggle (heading_3) in the main page."""
+    return add_todo_items(category, [task_name])
+
+
+def add_todo_items(category: str, task_names: list):
+    """Adds several tasks under one category, in order, with a single append."""
+    target_heading_id = _find_category_heading(category)
     if not target_heading_id:
         return {"error": f"Category '{category}' not found. Available: ML Research Industry, Academia Collaborations, Exploring Fit in Other Fields, Other"}
 
-    # Add the to-do item as a child of the heading
+    # Add the to-do items as children of the heading
     return _request("PATCH", f"blocks/{target_heading_id}/children", json={
-        "children": [{
-            "type": "to_do",
-            "to_do": {
-                "rich_text": [{"type": "text", "text": {"content": task_name}}],
-                "checked": False
-            }
-        }]
+        "children": [_todo_block(task_name) for task_name in task_names]
     })
 
 
-def add_to_backlog(company: str, role: str, url: str, notes: str = ""):
-    """Adds a job to the Phase 2 Backlog page as a bullet point."""
+def _backlog_block(company, role, url, notes=""):
     # Format: Company - Role (URL) - Notes
     text = f"{company} - {role}"
 
-    children = [
-        {
-            "type": "bulleted_list_item",
-            "bulleted_list_item": {
-                "rich_text": [
-                    {"type": "text", "text": {"content": text + " ("}},
-                    {"type": "text", "text": {"content": "link", "link": {"url": url}}},
-                    {"type": "text", "text": {"content": ")"}}
-                ]
-            }
+    block = {
+        "type": "bulleted_list_item",
+        "bulleted_list_item": {
+            "rich_text": [
+                {"type": "text", "text": {"content": text + " ("}},
+                {"type": "text", "text": {"content": "link", "link": {"url": url}}},
+                {"type": "text", "text": {"content": ")"}}
+            ]
         }
-    ]
+    }
 
     # Add notes as nested item if provided
     if notes:
-        children[0]["bulleted_list_item"]["children"] = [
+        block["bulleted_list_item"]["children"] = [
             {
                 "type": "paragraph",
                 "paragraph": {
@@ -311,9 +351,21 @@ def add_to_backlog(company: str, role: str, url: str, notes: str = ""):
                 }
             }
         ]
+    return block
+
+
+def add_to_backlog(company: str, role: str, url: str, notes: str = ""):
+    """Adds a job to the Phase 2 Backlog page as a bullet point."""
+    return add_items_to_backlog([{"company": company, "role": role, "url": url, "notes": notes}])
 
+
+def add_items_to_backlog(items: list):
+    """Adds several jobs to the backlog, in order, with a single append.
+
+    Each item is a dict with add_to_backlog's arguments.
+    """
     return _request("PATCH", f"blocks/{BACKLOG_PAGE_ID}/children", json={
-        "children": children
+        "children": [_backlog_block(**item) for item in items]
     })
 
 
@@ -403,6 +455,11 @@ def add_todo_to_day(day: str, task_name: str):
     Appends the to-do block after the last existing to-do for that day
     (or after the day label paragraph if no to-dos exist yet).
     """
+    return add_todos_to_day(day, [task_name])
+
+
+def add_todos_to_day(day: str, task_names: list):
+    """Adds several to-dos under one day of the weekly plan, in order, with a single append."""
     weekly = get_weekly_plan()
     if "error" in weekly:
         return weekly
@@ -424,13 +481,7 @@ def add_todo_to_day(day: str, task_name: str):
 
     # Append to the column, positioned after the last block for this day
     return _request("PATCH", f"blocks/{target_data['column_id']}/children", json={
-        "children": [{
-            "type": "to_do",
-            "to_do": {
-                "rich_text": [{"type": "text", "text": {"content": task_name}}],
-                "checked": False
-            }
-        }],
+        "children": [_todo_block(task_name) for task_name in task_names],
         "after": after_id
     })
 
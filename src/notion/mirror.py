@@ -0,0 +1,254 @@
+"""Local SQLite mirror of the Contacts and Applications databases.
+
+The mirror is synced incrementally: after the first full pull, only pages
+edited since the last sync are fetched (a `last_edited_time` on_or_after
+filter). Deleted or archived pages never show up in a delta query, so every
+RECONCILE_INTERVAL the mirror also fetches the list of live page IDs (titles
+only) and drops rows that are gone.
+
+Follow-up queries then run locally:
+
+    python -m src.notion.mirror sync
+    python -m src.notion.mirror stale-contacts --days 7
+    python -m src.notion.mirror awaiting-reply
+    python -m src.notion.mirror applications --status Applied
+"""
+
+import argparse
+import json
+import sqlite3
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from . import client
+
+MIRROR_PATH = Path(__file__).parent.parent.parent / "data" / "notion_mirror.sqlite"
+RECONCILE_INTERVAL = timedelta(hours=6)
+
+# Statuses from the Contacts database (see setup_notion.create_contacts_db)
+WAITING_ON_ME = "Replied-waiting for my answer"
+WAITING_ON_THEM = "Replied-waiting for their answer"
+ENDED = "Ended"
+
+TABLES = {
+    "contacts": {
+        "database_id": lambda: client.CONTACTS_DB_ID,
+        "parse": client._parse_contact,
+        "columns": ["name", "company", "role", "status", "last_contact", "notes"],
+    },
+    "applications": {
+        "database_id": lambda: client.APPLICATIONS_DB_ID,
+        "parse": client._parse_application,
+        "columns": ["company", "role", "date", "status", "notes"],
+    },
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id TEXT PRIMARY KEY,
+    name TEXT, company TEXT, role TEXT, status TEXT, last_contact TEXT, notes TEXT,
+    last_edited_time TEXT
+);
+CREATE INDEX IF NOT EXISTS contacts_status ON contacts (status);
+CREATE INDEX IF NOT EXISTS contacts_last_contact ON contacts (last_contact);
+
+CREATE TABLE IF NOT EXISTS applications (
+    id TEXT PRIMARY KEY,
+    company TEXT, role TEXT, date TEXT, status TEXT, notes TEXT,
+    last_edited_time TEXT
+);
+CREATE INDEX IF NOT EXISTS applications_status ON applications (status);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    edited_cursor TEXT,
+    reconciled_at TEXT
+);
+"""
+
+
+def connect(path: Path = MIRROR_PATH) -> sqlite3.Connection:
+    """Open (and create if needed) the mirror database."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _upsert(conn, table, rows):
+    columns = ["id"] + TABLES[table]["columns"] + ["last_edited_time"]
+    placeholders = ", ".join("?" for _ in columns)
+    conn.executemany(
+        f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+        [[row[c] for c in columns] for row in rows],
+    )
+
+
+def _sync_table(conn, table, full=False):
+    """Pull the delta for one table. Returns (updated, deleted) counts."""
+    spec = TABLES[table]
+    database_id = spec["database_id"]()
+
+    state = conn.execute(
+        "SELECT edited_cursor, reconciled_at FROM sync_state WHERE name = ?", (table,)
+    ).fetchone()
+    cursor = None if full or state is None else state["edited_cursor"]
+    reconciled_at = None if full or state is None else state["reconciled_at"]
+
+    query_filter = None
+    if cursor:
+        query_filter = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": cursor}}
+    pages = client._query_database(database_id, filter=query_filter)
+
+    rows = []
+    for page in pages:
+        row = spec["parse"](page)
+        row["last_edited_time"] = page["last_edited_time"]
+        rows.append(row)
+
+    now = datetime.now(timezone.utc)
+    deleted = 0
+    with conn:
+        if cursor is None:
+            # Full pull: the result set is the whole database
+            live_ids = {row["id"] for row in rows}
+            deleted = _delete_missing(conn, table, live_ids)
+            reconciled_at = now.isoformat()
+        elif reconciled_at is None or now - datetime.fromisoformat(reconciled_at) > RECONCILE_INTERVAL:
+            live_ids = {page["id"] for page in client._query_database(database_id, filter_properties=["title"])}
+            deleted = _delete_missing(conn, table, live_ids)
+            reconciled_at = now.isoformat()
+
+        _upsert(conn, table, rows)
+
+        # Advance to the newest edit we have seen, not to "now": Notion's
+        # timestamps are minute-granular and on_or_after re-fetches the
+        # boundary minute, so nothing edited concurrently is skipped.
+        new_cursor = max([cursor or ""] + [row["last_edited_time"] for row in rows]) or None
+        conn.execute(
+            "INSERT OR REPLACE INTO sync_state (name, edited_cursor, reconciled_at) VALUES (?, ?, ?)",
+            (table, new_cursor, reconciled_at),
+        )
+
+    return len(rows), deleted
+
+
+def _delete_missing(conn, table, live_ids):
+    local_ids = {r["id"] for r in conn.execute(f"SELECT id FROM {table}")}
+    missing = local_ids - live_ids
+    conn.executemany(f"DELETE FROM {table} WHERE id = ?", [(i,) for i in missing])
+    return len(missing)
+
+
+def sync(conn: sqlite3.Connection = None, full: bool = False):
+    """Bring the mirror up to date. Only edited pages are fetched from Notion.
+
+    Returns {table: {"updated": n, "deleted": n}}.
+    """
+    conn = conn or connect()
+    result = {}
+    for table in TABLES:
+        updated, deleted = _sync_table(conn, table, full=full)
+        result[table] = {"updated": updated, "deleted": deleted}
+    return result
+
+
+def _rows(cursor):
+    return [dict(r) for r in cursor]
+
+
+def contacts(conn: sqlite3.Connection = None):
+    """All mirrored contacts, same shape as client.get_contacts()."""
+    conn = conn or connect()
+    return _rows(conn.execute("SELECT * FROM contacts ORDER BY name"))
+
+
+def stale_contacts(days: int = 7, conn: sqlite3.Connection = None):
+    """Contacts not contacted in `days`+ days (ignores ended conversations)."""
+    conn = conn or connect()
+    cutoff = (date.today() - timedelta(days=days)).isoformat()
+    return _rows(conn.execute(
+        "SELECT * FROM contacts WHERE last_contact IS NOT NULL AND last_contact <= ? "
+        "AND (status IS NULL OR status != ?) ORDER BY last_contact",
+        (cutoff, ENDED),
+    ))
+
+
+def awaiting_reply(from_me: bool = True, conn: sqlite3.Connection = None):
+    """Contacts waiting on the user's reply (or, with from_me=False, on theirs)."""
+    conn = conn or connect()
+    status = WAITING_ON_ME if from_me else WAITING_ON_THEM
+    return _rows(conn.execute(
+        "SELECT * FROM contacts WHERE status = ? ORDER BY last_contact", (status,)
+    ))
+
+
+def applications(conn: sqlite3.Connection = None):
+    """All mirrored applications, same shape as client.get_applications()."""
+    conn = conn or connect()
+    return _rows(conn.execute("SELECT * FROM applications ORDER BY date DESC"))
+
+
+def applications_by_status(status: str = None, conn: sqlite3.Connection = None):
+    """Applications grouped by status, or the list for a single status."""
+    conn = conn or connect()
+    if status:
+        return _rows(conn.execute(
+            "SELECT * FROM applications WHERE status = ? ORDER BY date", (status,)
+        ))
+    grouped = {}
+    for row in conn.execute("SELECT * FROM applications ORDER BY date"):
+        grouped.setdefault(row["status"], []).append(dict(row))
+    return grouped
+
+
+def stale_applications(days: int = 14, status: str = "Applied", conn: sqlite3.Connection = None):
+    """Applications still in `status` submitted `days`+ days ago."""
+    conn = conn or connect()
+    cutoff = (date.today() - timedelta(days=days)).isoformat()
+    return _rows(conn.execute(
+        "SELECT * FROM applications WHERE status = ? AND date IS NOT NULL AND date <= ? ORDER BY date",
+        (status, cutoff),
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mirror of the Contacts and Applications databases")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("sync", help="Pull changes from Notion")
+    p.add_argument("--full", action="store_true", help="Re-download everything")
+
+    p = sub.add_parser("stale-contacts", help="Contacts not contacted in N+ days")
+    p.add_argument("--days", type=int, default=7)
+
+    p = sub.add_parser("awaiting-reply", help="Contacts waiting on your answer")
+    p.add_argument("--theirs", action="store_true", help="Contacts you are waiting on instead")
+
+    p = sub.add_parser("applications", help="Applications by status")
+    p.add_argument("--status", default=None)
+
+    p = sub.add_parser("stale-applications", help="Applications with no update in N+ days")
+    p.add_argument("--days", type=int, default=14)
+
+    args = parser.parse_args()
+    conn = connect()
+
+    if args.command == "sync":
+        result = sync(conn, full=args.full)
+    elif args.command == "stale-contacts":
+        result = stale_contacts(args.days, conn=conn)
+    elif args.command == "awaiting-reply":
+        result = awaiting_reply(from_me=not args.theirs, conn=conn)
+    elif args.command == "applications":
+        result = applications_by_status(args.status, conn=conn)
+    else:
+        result = stale_applications(args.days, conn=conn)
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
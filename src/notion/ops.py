@@ -0,0 +1,96 @@
+"""Client operations callable by name.
+
+Shared by the service daemon and the batch CLI so both expose exactly the
+same set of operations as `src/notion/client.py` (plus the local mirror).
+"""
+
+import inspect
+
+from . import client, mirror, outbox
+
+OPERATIONS = {
+    # Notion reads
+    "get_applications": client.get_applications,
+    "get_contacts": client.get_contacts,
+    "get_todo_page": client.get_todo_page,
+    "get_weekly_plan": client.get_weekly_plan,
+    "get_backlog": client.get_backlog,
+    # Notion writes
+    "add_application": client.add_application,
+    "add_contact": client.add_contact,
+    "add_todo_item": client.add_todo_item,
+    "add_todo_items": client.add_todo_items,
+    "add_todo_to_day": client.add_todo_to_day,
+    "add_todos_to_day": client.add_todos_to_day,
+    "add_to_backlog": client.add_to_backlog,
+    "add_items_to_backlog": client.add_items_to_backlog,
+    "delete_block": client.delete_block,
+    "move_todo_to_day": client.move_todo_to_day,
+    # Local mirror
+    "mirror_sync": mirror.sync,
+    "mirror_contacts": mirror.contacts,
+    "mirror_applications": mirror.applications,
+    "stale_contacts": mirror.stale_contacts,
+    "awaiting_reply": mirror.awaiting_reply,
+    "applications_by_status": mirror.applications_by_status,
+    "stale_applications": mirror.stale_applications,
+    # Write-behind outbox
+    "queue": outbox.submit,
+    "outbox_status": outbox.status,
+    "outbox_retry": outbox.retry,
+    "outbox_wake": outbox.wake,
+}
+
+
+def call(op: str, args=None):
+    """Run an operation. `args` may be a dict (keyword), a list (positional) or None."""
+    func = OPERATIONS.get(op)
+    if func is None:
+        raise ValueError(f"Unknown operation '{op}'. Available: {', '.join(sorted(OPERATIONS))}")
+
+    if args is None:
+        return func()
+    if isinstance(args, dict):
+        return func(**args)
+    if isinstance(args, list):
+        return func(*args)
+    return func(args)
+
+
+def bind(op: str, args=None) -> dict:
+    """Arguments of a call by parameter name. Raises TypeError if they don't fit."""
+    func = OPERATIONS.get(op)
+    if func is None:
+        raise ValueError(f"Unknown operation '{op}'. Available: {', '.join(sorted(OPERATIONS))}")
+
+    signature = inspect.signature(func)
+    if isinstance(args, dict):
+        return signature.bind(**args).arguments
+    if isinstance(args, list):
+        return signature.bind(*args).arguments
+    return signature.bind(*([] if args is None else [args])).arguments
+
+
+def ordering_key(op: str, args=None):
+    """Key shared by operations that must run in their original order.
+
+    Appends under the same Notion parent (a to-do category, a day in the
+    weekly plan, the backlog page) keep their relative order; everything
+    else is independent and returns None.
+    """
+    try:
+        params = bind(op, args)
+    except (TypeError, ValueError):
+        return None  # unknown operation or bad arguments: let call() report the error
+
+    if op in ("add_todo_item", "add_todo_items"):
+        parent = params["category"]
+        return f"category:{parent.lower()}" if isinstance(parent, str) else None
+    if op in ("add_todo_to_day", "add_todos_to_day", "move_todo_to_day"):
+        parent = params["day"]
+        return f"day:{parent.lower()}" if isinstance(parent, str) else None
+    if op in ("add_to_backlog", "add_items_to_backlog"):
+        return "backlog"
+    if op == "delete_block":
+        return f"block:{params['block_id']}"
+    return None
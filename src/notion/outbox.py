@@ -0,0 +1,507 @@
+"""Durable write-behind outbox for Notion writes.
+
+A Notion write holds the session up for a second or more, and fails
+outright when Notion is slow or down. Queued writes are instead recorded in
+a local SQLite outbox and return at once with a local id ("local:..."); a
+background flusher then sends them:
+
+- appends under the same parent (a to-do category, a day of the weekly
+  plan, the backlog page) that are waiting together go out as one request,
+  in their original order
+- requests are paced under Notion's rate limit
+- an operation may name an earlier one's local id in its arguments (e.g.
+  delete_block on a to-do that is still queued); it waits until that one has
+  been sent and gets its real Notion id in place of the local one
+- transient failures (network errors, 409, 429, 5xx) are retried with
+  backoff until they go through; anything else is marked failed and kept,
+  so it can be looked at and re-queued
+
+    python -m src.notion.outbox add add_todo_item '{"category": "Networking", "task_name": "..."}'
+    python -m src.notion.outbox add delete_block '["local:3f2a9c..."]'
+    python -m src.notion.outbox status [ID]
+    python -m src.notion.outbox retry [ID]      # re-queue failed operations
+    python -m src.notion.outbox flush           # send everything now, in the foreground
+
+When the Gertrudix service is running it flushes the outbox itself, and
+`service call queue '{"op": ..., "args": ...}'` enqueues. Otherwise `add`
+starts a background flusher that exits once the outbox is empty.
+
+Delivery is at least once: if the flusher dies between Notion accepting a
+write and the outbox recording it, that write is sent again.
+"""
+
+import argparse
+import fcntl
+import json
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import requests
+
+from . import client
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+OUTBOX_PATH = REPO_ROOT / "data" / "notion_outbox.sqlite"
+LOCK_PATH = OUTBOX_PATH.with_suffix(".lock")
+
+WRITE_OPS = {
+    "add_application", "add_contact",
+    "add_todo_item", "add_todo_items", "add_todo_to_day", "add_todos_to_day",
+    "add_to_backlog", "add_items_to_backlog",
+    "delete_block", "move_todo_to_day",
+}
+
+# Notion allows about 3 requests per second per integration; the flusher
+# stays under that so interactive reads still get through
+RATE = 2.0
+BURST = 3
+MAX_BATCH = 100  # Notion's limit on children per append
+BASE_DELAY = 5  # seconds before the first retry, doubled on each failure
+MAX_DELAY = 15 * 60
+POLL = 2.0  # how often a waiting flusher looks for new work
+DONE_RETENTION = timedelta(days=7)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT UNIQUE NOT NULL,
+    op TEXT NOT NULL,
+    args TEXT NOT NULL,
+    key TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    sent_at TEXT,
+    notion_id TEXT,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_status ON outbox (status, seq);
+"""
+
+
+def _todo_items(group):
+    return [group[0]["category"], [params["task_name"] for params in group]]
+
+
+def _todos_to_day(group):
+    return [group[0]["day"], [params["task_name"] for params in group]]
+
+
+def _items_to_backlog(group):
+    return [[dict(params) for params in group]]
+
+
+# Single appends that can share one request: the operation that sends a
+# group of them, and its arguments for the group
+COALESCE = {
+    "add_todo_item": ("add_todo_items", _todo_items),
+    "add_todo_to_day": ("add_todos_to_day", _todos_to_day),
+    "add_to_backlog": ("add_items_to_backlog", _items_to_backlog),
+}
+
+
+class _Pacer:
+    """Token bucket: `rate` requests per second on average, up to `burst` at once."""
+
+    def __init__(self, rate: float, burst: int):
+        self.interval = 1 / rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) / self.interval)
+            self.updated = now
+            wait = (1 - self.tokens) * self.interval if self.tokens < 1 else 0
+            self.tokens -= 1
+        if wait:
+            time.sleep(wait)
+
+
+_pacer = _Pacer(RATE, BURST)
+_wake = threading.Event()
+_flusher = None  # the service's flusher thread, when running in the service
+
+
+def connect(path: Path = OUTBOX_PATH) -> sqlite3.Connection:
+    """Open (and create if needed) the outbox database."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _refs(value) -> list:
+    """Local ids mentioned anywhere in an operation's arguments."""
+    if isinstance(value, str):
+        return [value] if value.startswith("local:") else []
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, list):
+        return [ref for item in value for ref in _refs(item)]
+    return []
+
+
+def _resolve(conn, value):
+    """`value` with each local id replaced by the Notion id it was sent as."""
+    if isinstance(value, str) and value.startswith("local:"):
+        row = conn.execute("SELECT notion_id FROM outbox WHERE id = ?", (value,)).fetchone()
+        if row is None or row["notion_id"] is None:
+            raise ValueError(f"{value} has no Notion id")
+        return row["notion_id"]
+    if isinstance(value, dict):
+        return {k: _resolve(conn, v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_resolve(conn, v) for v in value]
+    return value
+
+
+def _created_id(result):
+    """The Notion id of the page or first block a write created, if any."""
+    if not isinstance(result, dict):
+        return None
+    if result.get("results"):
+        return result["results"][0].get("id")
+    return result.get("id")
+
+
+def _transient(error: Exception) -> bool:
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status in (409, 429) or status >= 500
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+def enqueue(op: str, args=None, conn: sqlite3.Connection = None) -> str:
+    """Record a write in the outbox. Returns its local id; nothing is sent yet."""
+    from . import ops
+
+    if op not in WRITE_OPS:
+        raise ValueError(f"'{op}' can't be queued. Queueable: {', '.join(sorted(WRITE_OPS))}")
+    params = ops.bind(op, args)
+
+    conn = conn or connect()
+    for ref in _refs(params):
+        if conn.execute("SELECT 1 FROM outbox WHERE id = ?", (ref,)).fetchone() is None:
+            raise ValueError(f"Unknown local id '{ref}'")
+
+    local_id = f"local:{uuid.uuid4().hex[:12]}"
+    with conn:
+        conn.execute(
+            "INSERT INTO outbox (id, op, args, key, created_at) VALUES (?, ?, ?, ?, ?)",
+            (local_id, op, json.dumps(params), ops.ordering_key(op, params), _now()),
+        )
+    _wake.set()
+    return local_id
+
+
+def submit(op: str, args=None) -> dict:
+    """Queue a write and make sure something is flushing the outbox."""
+    local_id = enqueue(op, args)
+    _ensure_flusher()
+    return {"id": local_id, "status": "queued"}
+
+
+def wake() -> bool:
+    """Nudge this process's flusher. False if this process doesn't have one."""
+    _wake.set()
+    return _flusher is not None and _flusher.is_alive()
+
+
+def _ensure_flusher():
+    if _flusher is not None and _flusher.is_alive():
+        return
+    from . import service
+
+    response = service.request("outbox_wake")
+    if response and response.get("ok") and response.get("result"):
+        return
+    # Nobody is flushing: start a flusher that outlives this process
+    subprocess.Popen(
+        [sys.executable, "-m", "src.notion.outbox", "flush"],
+        cwd=REPO_ROOT,
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def _finish(conn, rows, status, result=None, error=None):
+    with conn:
+        for row in rows:
+            conn.execute(
+                "UPDATE outbox SET status = ?, sent_at = ?, result = ?, notion_id = ?, error = ? WHERE id = ?",
+                (status, _now(), json.dumps(result, default=str), _created_id(result), error, row["id"]),
+            )
+
+
+def _retry_later(conn, rows, error):
+    with conn:
+        for row in rows:
+            delay = min(BASE_DELAY * 2 ** row["attempts"], MAX_DELAY)
+            conn.execute(
+                "UPDATE outbox SET status = 'pending', attempts = attempts + 1, next_attempt_at = ?, error = ? "
+                "WHERE id = ?",
+                (time.time() + delay, error, row["id"]),
+            )
+
+
+def _plan(conn, counts) -> list:
+    """Batches of pending operations that can be sent now, in outbox order.
+
+    Operations sharing an ordering key go out in order, so only the first
+    pending one of each key is a candidate; consecutive appends of the same
+    kind behind it join its batch.
+    """
+    now = time.time()
+    heads, batches = {}, []
+    for row in conn.execute("SELECT * FROM outbox WHERE status = 'pending' ORDER BY seq").fetchall():
+        key = row["key"] or row["id"]
+        try:
+            refs = _refs(json.loads(row["args"]))
+        except ValueError as e:
+            # A row that can't be read fails on its own instead of stopping every flush
+            _finish(conn, [row], "failed", error=f"{type(e).__name__}: {e}")
+            counts["failed"] += 1
+            continue
+
+        if key in heads:
+            batch = heads[key]
+            if batch and row["op"] in COALESCE and row["op"] == batch[0]["op"] and len(batch) < MAX_BATCH \
+                    and row["next_attempt_at"] <= now and not refs:
+                batch.append(row)
+            else:
+                heads[key] = None  # everything after this on the key waits for it
+            continue
+        heads[key] = None
+        if row["next_attempt_at"] > now:
+            continue
+
+        waiting = False
+        for ref in refs:
+            dependency = conn.execute("SELECT status FROM outbox WHERE id = ?", (ref,)).fetchone()
+            if dependency is None or dependency["status"] == "failed":
+                error = f"{ref} failed" if dependency else f"{ref} is no longer in the outbox"
+                _finish(conn, [row], "failed", error=error)
+                counts["failed"] += 1
+                waiting = True
+                break
+            if dependency["status"] != "done":
+                waiting = True
+        if waiting:
+            continue
+
+        heads[key] = [row]
+        batches.append(heads[key])
+    return batches
+
+
+def _send(conn, batch, counts):
+    from . import ops
+
+    op = batch[0]["op"]
+    with conn:
+        conn.executemany("UPDATE outbox SET status = 'sending' WHERE id = ?", [(row["id"],) for row in batch])
+    try:
+        params = [_resolve(conn, json.loads(row["args"])) for row in batch]
+        if len(batch) == 1:
+            results = [ops.call(op, params[0])]
+        else:
+            name, group_args = COALESCE[op]
+            response = ops.call(name, group_args(params))
+            ok = isinstance(response, dict) and "error" not in response
+            if ok and len(response.get("results", [])) == len(batch):
+                blocks = response["results"]
+                results = [{"object": "list", "results": [block]} for block in blocks]
+            else:
+                results = [response] * len(batch)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        if _transient(e):
+            _retry_later(conn, batch, error)
+            counts["retrying"] += len(batch)
+        else:
+            _finish(conn, batch, "failed", error=error)
+            counts["failed"] += len(batch)
+        return
+
+    for row, result in zip(batch, results):
+        if isinstance(result, dict) and "error" in result:
+            _finish(conn, [row], "failed", result=result, error=str(result["error"]))
+            counts["failed"] += 1
+        else:
+            _finish(conn, [row], "done", result=result)
+            counts["sent"] += 1
+
+
+def flush(conn: sqlite3.Connection = None):
+    """Send every operation that is due.
+
+    Returns {"sent", "retrying", "failed"} counts, or None if another
+    flusher is already at work.
+    """
+    LOCK_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(LOCK_PATH, "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return None
+
+        conn = conn or connect()
+        with conn:
+            # Left over by a flusher that died mid-send
+            conn.execute("UPDATE outbox SET status = 'pending' WHERE status = 'sending'")
+            # Old sent operations go, unless an unsent one still needs their Notion id
+            cutoff = (datetime.now(timezone.utc) - DONE_RETENTION).isoformat()
+            needed = {ref for (args,) in conn.execute("SELECT args FROM outbox WHERE status != 'done'")
+                      for ref in _refs(json.loads(args))}
+            old = [row["id"] for row in conn.execute(
+                "SELECT id FROM outbox WHERE status = 'done' AND sent_at < ?", (cutoff,))]
+            conn.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in old if i not in needed])
+
+        counts = {"sent": 0, "retrying": 0, "failed": 0}
+        client._local.throttle = _pacer.take
+        try:
+            # Sending a batch can unblock others (a move waiting on its add), so plan again
+            while batches := _plan(conn, counts):
+                for batch in batches:
+                    _send(conn, batch, counts)
+        finally:
+            client._local.throttle = None
+        return counts
+
+
+def _next_wait(conn) -> float:
+    """Seconds until the next retry falls due (at most POLL), or None if nothing is pending."""
+    if conn.execute("SELECT 1 FROM outbox WHERE status = 'pending' LIMIT 1").fetchone() is None:
+        return None
+    # Anything pending and already due is waiting on an operation that is itself waiting to retry
+    due = conn.execute(
+        "SELECT MIN(next_attempt_at) FROM outbox WHERE status = 'pending' AND next_attempt_at > ?", (time.time(),)
+    ).fetchone()[0]
+    return POLL if due is None else min(due - time.time(), POLL)
+
+
+def drain(until_empty: bool = True, log=print):
+    """Flush repeatedly, waiting out retries. Returns once nothing is pending (if `until_empty`)."""
+    conn = connect()
+    while True:
+        _wake.clear()
+        try:
+            counts = flush(conn)
+            wait = _next_wait(conn)
+        except Exception as e:
+            if until_empty:
+                raise
+            # Never let one bad flush end the service's flusher: the outbox would stay stuck behind it
+            if log:
+                log(f"Outbox: flush failed ({type(e).__name__}: {e}); trying again in {POLL:.0f}s")
+            _wake.wait(POLL)
+            continue
+        if counts and any(counts.values()) and log:
+            log(f"Outbox: {counts['sent']} sent, {counts['retrying']} to retry, {counts['failed']} failed")
+        if wait is None and until_empty:
+            return
+        _wake.wait(POLL if wait is None else max(wait, 0.05))
+
+
+def start_flusher():
+    """Flush the outbox from a background thread of this process (used by the service)."""
+    global _flusher
+    if _flusher is None or not _flusher.is_alive():
+        _flusher = threading.Thread(target=drain, kwargs={"until_empty": False}, daemon=True)
+        _flusher.start()
+    return _flusher
+
+
+def _describe(row) -> dict:
+    entry = {k: row[k] for k in ("id", "op", "status", "attempts", "created_at", "sent_at", "notion_id", "error")}
+    entry["args"] = json.loads(row["args"])
+    if row["status"] == "pending" and row["attempts"]:
+        entry["next_attempt_at"] = datetime.fromtimestamp(row["next_attempt_at"], timezone.utc).isoformat()
+    return entry
+
+
+def status(local_id: str = None, conn: sqlite3.Connection = None) -> dict:
+    """One operation by local id, or counts by status plus everything not yet sent."""
+    conn = conn or connect()
+    if local_id:
+        row = conn.execute("SELECT * FROM outbox WHERE id = ?", (local_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"Unknown local id '{local_id}'")
+        return _describe(row)
+
+    counts = {row["status"]: row["n"] for row in conn.execute("SELECT status, COUNT(*) AS n FROM outbox GROUP BY status")}
+    unsent = conn.execute("SELECT * FROM outbox WHERE status != 'done' ORDER BY seq").fetchall()
+    return {"counts": counts, "unsent": [_describe(row) for row in unsent]}
+
+
+def retry(local_id: str = None, conn: sqlite3.Connection = None) -> int:
+    """Re-queue failed operations (one, or all). Returns how many."""
+    conn = conn or connect()
+    query = "UPDATE outbox SET status = 'pending', attempts = 0, next_attempt_at = 0 WHERE status = 'failed'"
+    with conn:
+        if local_id:
+            requeued = conn.execute(query + " AND id = ?", (local_id,)).rowcount
+        else:
+            requeued = conn.execute(query).rowcount
+    if requeued:
+        _wake.set()
+        _ensure_flusher()
+    return requeued
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Durable write-behind outbox for Notion writes")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("add", help="Queue a write and return its local id")
+    p.add_argument("op", help=f"One of: {', '.join(sorted(WRITE_OPS))}")
+    p.add_argument("args", nargs="?", default=None, help="Arguments as JSON (object or list)")
+
+    p = sub.add_parser("status", help="What hasn't been sent yet, or one operation")
+    p.add_argument("id", nargs="?", default=None)
+
+    p = sub.add_parser("retry", help="Re-queue failed operations")
+    p.add_argument("id", nargs="?", default=None)
+
+    p = sub.add_parser("flush", help="Send everything now, waiting out retries")
+    p.add_argument("--once", action="store_true", help="Send what is due and stop")
+
+    args = parser.parse_args()
+
+    if args.command == "add":
+        result = submit(args.op, json.loads(args.args) if args.args else None)
+    elif args.command == "status":
+        result = status(args.id)
+    elif args.command == "retry":
+        result = {"requeued": retry(args.id)}
+    elif args.once:
+        result = flush()
+        if result is None:
+            result = {"error": "Another flusher is running"}
+    else:
+        drain()
+        result = status()["counts"]
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
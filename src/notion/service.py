@@ -0,0 +1,181 @@
+"""Long-lived Gertrudix service for Notion operations.
+
+Running every operation as its own `python -c` pays interpreter startup,
+dotenv loading, the requests import and a fresh TLS handshake each time.
+The service keeps one process (and its pooled Notion session) warm and
+answers calls over a Unix socket.
+
+    python -m src.notion.service start                  # run in the foreground
+    python -m src.notion.service call get_contacts
+    python -m src.notion.service call add_todo_item '{"category": "Networking", "task_name": "..."}'
+    python -m src.notion.service stop
+
+Protocol: one JSON object per line in each direction. Requests are
+{"op": name, "args": dict | list}; responses are {"ok": true, "result": ...}
+or {"ok": false, "error": "..."}.
+
+The client half only imports the standard library, so `call` stays cheap.
+If the service is not running, `call` runs the operation in-process.
+
+The service also flushes the write-behind outbox (see outbox.py) in the
+background; `call queue '{"op": ..., "args": ...}'` queues a write there
+and returns its local id straight away.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from pathlib import Path
+
+SOCKET_PATH = Path(os.getenv(
+    "GERTRUDIX_SOCKET",
+    Path(__file__).parent.parent.parent / "data" / "gertrudix.sock",
+))
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        from . import ops
+
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            op = None
+            try:
+                request = json.loads(line)
+                op = request.get("op")
+                if op == "ping":
+                    response = {"ok": True, "result": "pong"}
+                elif op == "shutdown":
+                    response = {"ok": True, "result": "stopping"}
+                else:
+                    response = {"ok": True, "result": ops.call(op, request.get("args"))}
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+            self.wfile.write((json.dumps(response, default=str) + "\n").encode())
+            self.wfile.flush()
+
+            if op == "shutdown":
+                # Reply first, then stop; shutdown() blocks so it needs its own thread
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _warm_up():
+    """Open the TLS connection to Notion ahead of the first real call."""
+    from . import client
+
+    try:
+        client._request("GET", "users/me")
+    except Exception as e:
+        print(f"  Warm-up request failed: {e}")
+
+
+def serve(path: Path = SOCKET_PATH):
+    """Run the service in the foreground until stopped."""
+    if path.exists():
+        sock = _connect(path)
+        if sock is not None:
+            sock.close()
+            print(f"Service already running on {path}")
+            return
+        path.unlink()  # stale socket from a previous run
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Import everything up front so the first call is as fast as the rest
+    from . import ops, outbox  # noqa: F401
+
+    server = _Server(str(path), _Handler)
+    os.chmod(path, 0o600)
+    threading.Thread(target=_warm_up, daemon=True).start()
+    outbox.start_flusher()
+
+    print(f"Gertrudix service listening on {path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+        print("Gertrudix service stopped")
+
+
+def _connect(path: Path = SOCKET_PATH):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def request(op: str, args=None, path: Path = SOCKET_PATH):
+    """Send one call to the running service. Returns the response dict, or None if not running."""
+    sock = _connect(path)
+    if sock is None:
+        return None
+
+    with sock, sock.makefile("rwb") as stream:
+        stream.write((json.dumps({"op": op, "args": args}) + "\n").encode())
+        stream.flush()
+        line = stream.readline()
+
+    if not line:
+        return {"ok": False, "error": "Service closed the connection"}
+    return json.loads(line)
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("start", "stop", "status", "call"):
+        print(__doc__)
+        sys.exit(1)
+
+    command = sys.argv[1]
+
+    if command == "start":
+        serve()
+        return
+
+    if command in ("stop", "status"):
+        response = request("shutdown" if command == "stop" else "ping")
+        if response is None:
+            print("Service not running")
+        else:
+            print(response.get("result") or response.get("error"))
+        return
+
+    if len(sys.argv) < 3:
+        print("Usage: python -m src.notion.service call OP [ARGS_JSON]")
+        sys.exit(1)
+
+    op = sys.argv[2]
+    args = json.loads(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    response = request(op, args)
+    if response is None:
+        # No service running: do the work in this process instead
+        from . import ops
+        try:
+            response = {"ok": True, "result": ops.call(op, args)}
+        except Exception as e:
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    if not response["ok"]:
+        print(json.dumps({"error": response["error"]}), file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(response["result"], indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
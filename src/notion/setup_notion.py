@@ -7,12 +7,21 @@ Creates:
 - Contacts database
 - Applications database
 
-Run: python src/notion/setup_notion.py
+Run: python src/notion/setup_notion.py --page-id PAGE_ID
+
+Progress is recorded in a checkpoint file (data/notion_setup/PAGE_ID.json by
+default). If setup fails midway, re-run the same command: finished steps are
+skipped, so nothing is created twice.
 """
 
 import argparse
+import json
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import requests
 from dotenv import load_dotenv
 
@@ -21,6 +30,8 @@ load_dotenv()
 BASE_URL = "https://api.notion.com/v1"
 NOTION_VERSION = "2022-06-28"
 
+CHECKPOINT_DIR = Path(__file__).parent.parent.parent / "data" / "notion_setup"
+
 DEFAULT_CATEGORIES = [
     "Interesting Companies",
     "Networking",
@@ -37,17 +48,43 @@ def get_headers(api_key):
     }
 
 
+class SetupError(Exception):
+    """A Notion API call failed during setup."""
+
+
+_session = requests.Session()
+
+
 def api_request(method, endpoint, headers, json=None):
     url = f"{BASE_URL}/{endpoint}"
-    response = requests.request(method, url, headers=headers, json=json)
+    response = _session.request(method, url, headers=headers, json=json)
     if not response.ok:
-        print(f"Error: {response.status_code} - {response.text}")
-        sys.exit(1)
+        raise SetupError(f"{response.status_code} - {response.text}")
     return response.json()
 
 
-def create_main_page(headers, page_id, categories):
-    """Populate an existing Notion page as the Gertrudix workspace."""
+class Checkpoint:
+    """Setup progress for one page, saved to disk after every completed step."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.data = json.loads(path.read_text()) if path.exists() else {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        with self._lock:
+            self.data[key] = value
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.data, indent=2))
+            tmp.replace(self.path)
+
+
+def main_page_blocks(categories):
+    """All top-of-page content for the Gertrudix workspace, up to the Contacts database."""
 
     # --- TO-DO LIST ---
 
@@ -201,167 +238,142 @@ def create_main_page(headers, page_id, categories):
         },
     ]
 
-    # Rename the page and set the capybara icon
-    api_request("PATCH", f"pages/{page_id}", headers, json={
-        "icon": {"type": "emoji", "emoji": "🦫"},
-        "properties": {
-            "title": [{"type": "text", "text": {"content": "Job Search HQ"}}],
-        },
-    })
-
-    # Add all content blocks to the existing page
-    api_request("PATCH", f"blocks/{page_id}/children", headers, json={
-        "children": [
-            # Header banner
-            {
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [
-                        {"type": "text", "text": {"content": "powered by "}, "annotations": {"color": "gray"}},
-                        {"type": "text", "text": {"content": "Gertrudix 🦫"}, "annotations": {"bold": True, "color": "yellow"}},
-                        {"type": "text", "text": {"content": "  ·  your AI job search sidekick"}, "annotations": {"italic": True, "color": "gray"}},
-                    ],
-                },
+    banner = [
+        # Header banner
+        {
+            "type": "paragraph",
+            "paragraph": {
+                "rich_text": [
+                    {"type": "text", "text": {"content": "powered by "}, "annotations": {"color": "gray"}},
+                    {"type": "text", "text": {"content": "Gertrudix 🦫"}, "annotations": {"bold": True, "color": "yellow"}},
+                    {"type": "text", "text": {"content": "  ·  your AI job search sidekick"}, "annotations": {"italic": True, "color": "gray"}},
+                ],
             },
-            {"type": "divider", "divider": {}},
-        ] + children,
-    })
-
-    return page_id
+        },
+        {"type": "divider", "divider": {}},
+    ]
 
+    return banner + children + contacts_intro_blocks()
 
-def add_databases(headers, main_page_id):
-    """Add dividers and databases to the main page (appended after initial content)."""
 
-    # Add divider + contacts header + description
-    api_request("PATCH", f"blocks/{main_page_id}/children", headers, json={
-        "children": [
-            {"type": "divider", "divider": {}},
-            {
-                "type": "heading_2",
-                "heading_2": {
-                    "rich_text": [{"type": "text", "text": {"content": "Contacts"}}],
-                },
+def contacts_intro_blocks():
+    """Divider, Contacts header and description (the Contacts database follows)."""
+    return [
+        {"type": "divider", "divider": {}},
+        {
+            "type": "heading_2",
+            "heading_2": {
+                "rich_text": [{"type": "text", "text": {"content": "Contacts"}}],
             },
-            {
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [
-                        {"type": "text", "text": {
-                            "content": "Everyone relevant to your job search — people you've talked to, "
-                                       "want to reach out to, or were referred to. "
-                                       "If you ask Gertrudix to run the morning routine, they will check this "
-                                       "database and flag who needs attention: "
-                        }},
-                        {"type": "text", "text": {
-                            "content": "contacts you haven't reached out to yet, "
-                                       "people waiting on your reply, "
-                                       "or anyone you haven't followed up with in over a week."
-                        }, "annotations": {"italic": True}},
-                    ],
-                },
+        },
+        {
+            "type": "paragraph",
+            "paragraph": {
+                "rich_text": [
+                    {"type": "text", "text": {
+                        "content": "Everyone relevant to your job search — people you've talked to, "
+                                   "want to reach out to, or were referred to. "
+                                   "If you ask Gertrudix to run the morning routine, they will check this "
+                                   "database and flag who needs attention: "
+                    }},
+                    {"type": "text", "text": {
+                        "content": "contacts you haven't reached out to yet, "
+                                   "people waiting on your reply, "
+                                   "or anyone you haven't followed up with in over a week."
+                    }, "annotations": {"italic": True}},
+                ],
             },
-        ],
-    })
+        },
+    ]
 
-    # Create contacts DB
-    contacts_db_id = create_contacts_db(headers, main_page_id)
-
-    # Add formula manual step — broken into readable blocks
-    api_request("PATCH", f"blocks/{main_page_id}/children", headers, json={
-        "children": [
-            {
-                "type": "callout",
-                "callout": {
-                    "rich_text": [{"type": "text", "text": {
-                        "content": "Manual step — Add the 'Needs to be contacted' formula",
-                    }, "annotations": {"bold": True}}],
-                    "icon": {"type": "emoji", "emoji": "⚠️"},
-                },
+
+def applications_section_blocks():
+    """Formula manual step and Applications header, between the two databases."""
+    return [
+        {
+            "type": "callout",
+            "callout": {
+                "rich_text": [{"type": "text", "text": {
+                    "content": "Manual step — Add the 'Needs to be contacted' formula",
+                }, "annotations": {"bold": True}}],
+                "icon": {"type": "emoji", "emoji": "⚠️"},
             },
-            {
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [{"type": "text", "text": {
-                        "content": "The Notion API can't create formula properties, so you need to do this once by hand:"
-                    }}],
-                },
+        },
+        {
+            "type": "paragraph",
+            "paragraph": {
+                "rich_text": [{"type": "text", "text": {
+                    "content": "The Notion API can't create formula properties, so you need to do this once by hand:"
+                }}],
             },
-            {
-                "type": "numbered_list_item",
-                "numbered_list_item": {
-                    "rich_text": [{"type": "text", "text": {"content": "Open the Contacts database"}}],
-                },
+        },
+        {
+            "type": "numbered_list_item",
+            "numbered_list_item": {
+                "rich_text": [{"type": "text", "text": {"content": "Open the Contacts database"}}],
             },
-            {
-                "type": "numbered_list_item",
-                "numbered_list_item": {
-                    "rich_text": [{"type": "text", "text": {"content": "Click  +  to add a new property → choose "}, },
-                                  {"type": "text", "text": {"content": "Formula"}, "annotations": {"bold": True}}],
-                },
+        },
+        {
+            "type": "numbered_list_item",
+            "numbered_list_item": {
+                "rich_text": [{"type": "text", "text": {"content": "Click  +  to add a new property → choose "}, },
+                              {"type": "text", "text": {"content": "Formula"}, "annotations": {"bold": True}}],
             },
-            {
-                "type": "numbered_list_item",
-                "numbered_list_item": {
-                    "rich_text": [{"type": "text", "text": {"content": "Name it: "}, },
-                                  {"type": "text", "text": {"content": "Needs to be contacted"}, "annotations": {"code": True}}],
-                },
+        },
+        {
+            "type": "numbered_list_item",
+            "numbered_list_item": {
+                "rich_text": [{"type": "text", "text": {"content": "Name it: "}, },
+                              {"type": "text", "text": {"content": "Needs to be contacted"}, "annotations": {"code": True}}],
             },
-            {
-                "type": "numbered_list_item",
-                "numbered_list_item": {
-                    "rich_text": [{"type": "text", "text": {"content": "Paste this formula:"}}],
-                },
+        },
+        {
+            "type": "numbered_list_item",
+            "numbered_list_item": {
+                "rich_text": [{"type": "text", "text": {"content": "Paste this formula:"}}],
             },
-            {
-                "type": "code",
-                "code": {
-                    "rich_text": [{"type": "text", "text": {
-                        "content": "(not empty(prop(\"Last Contact\")) and now() > dateAdd(prop(\"Last Contact\"), 1, \"weeks\") "
-                                   "and (prop(\"Status\") == \"Contacted\" or prop(\"Status\") == \"Replied-waiting for their answer\")) "
-                                   "or prop(\"Status\") == \"Replied-waiting for my answer\" "
-                                   "or prop(\"Status\") == \"Not started\""
-                    }}],
-                    "language": "plain text",
-                },
+        },
+        {
+            "type": "code",
+            "code": {
+                "rich_text": [{"type": "text", "text": {
+                    "content": "(not empty(prop(\"Last Contact\")) and now() > dateAdd(prop(\"Last Contact\"), 1, \"weeks\") "
+                               "and (prop(\"Status\") == \"Contacted\" or prop(\"Status\") == \"Replied-waiting for their answer\")) "
+                               "or prop(\"Status\") == \"Replied-waiting for my answer\" "
+                               "or prop(\"Status\") == \"Not started\""
+                }}],
+                "language": "plain text",
             },
-            {"type": "divider", "divider": {}},
-            {
-                "type": "heading_2",
-                "heading_2": {
-                    "rich_text": [{"type": "text", "text": {"content": "Applications"}}],
-                },
+        },
+        {"type": "divider", "divider": {}},
+        {
+            "type": "heading_2",
+            "heading_2": {
+                "rich_text": [{"type": "text", "text": {"content": "Applications"}}],
             },
-            {
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [
-                        {"type": "text", "text": {
-                            "content": "Have Gertrudix log every application you submit. "
-                        }},
-                        {"type": "text", "text": {
-                            "content": "Company · Role · Date · Status"
-                        }, "annotations": {"bold": True}},
-                        {"type": "text", "text": {
-                            "content": " — so you always know where things stand."
-                        }},
-                    ],
-                },
+        },
+        {
+            "type": "paragraph",
+            "paragraph": {
+                "rich_text": [
+                    {"type": "text", "text": {
+                        "content": "Have Gertrudix log every application you submit. "
+                    }},
+                    {"type": "text", "text": {
+                        "content": "Company · Role · Date · Status"
+                    }, "annotations": {"bold": True}},
+                    {"type": "text", "text": {
+                        "content": " — so you always know where things stand."
+                    }},
+                ],
             },
-        ],
-    })
-
-    # Create applications DB
-    applications_db_id = create_applications_db(headers, main_page_id)
+        },
+    ]
 
-    # Final divider after databases
-    api_request("PATCH", f"blocks/{main_page_id}/children", headers, json={
-        "children": [
-            {"type": "divider", "divider": {}},
-        ],
-    })
 
-    return contacts_db_id, applications_db_id
+CLOSING_BLOCKS = [
+    {"type": "divider", "divider": {}},
+]
 
 
 def create_contacts_db(headers, parent_page_id):
@@ -426,10 +438,81 @@ def create_applications_db(headers, parent_page_id):
     return result["id"]
 
 
+def setup_workspace(headers, page_id, categories, checkpoint: Checkpoint):
+    """Build the workspace on `page_id`, skipping steps the checkpoint marks as done.
+
+    Inline databases are always appended at the end of the page, so the page is
+    built in four rounds:
+      1. page title/icon and all content up to the Contacts database (concurrent)
+      2. the Contacts database
+      3. the Applications database, and the blocks that go between the two
+         databases, inserted right after Contacts (concurrent)
+      4. the closing divider
+    Returns (contacts_db_id, applications_db_id).
+    """
+    categories = checkpoint.get("categories") or categories
+    checkpoint.set("categories", categories)
+
+    def set_page_properties():
+        # Rename the page and set the capybara icon
+        api_request("PATCH", f"pages/{page_id}", headers, json={
+            "icon": {"type": "emoji", "emoji": "🦫"},
+            "properties": {
+                "title": [{"type": "text", "text": {"content": "Job Search HQ"}}],
+            },
+        })
+        checkpoint.set("page_properties", True)
+
+    def add_main_content():
+        api_request("PATCH", f"blocks/{page_id}/children", headers, json={
+            "children": main_page_blocks(categories),
+        })
+        checkpoint.set("main_content", True)
+
+    def add_contacts_db():
+        checkpoint.set("contacts_db_id", create_contacts_db(headers, page_id))
+
+    def add_applications_section():
+        api_request("PATCH", f"blocks/{page_id}/children", headers, json={
+            "children": applications_section_blocks(),
+            "after": checkpoint.get("contacts_db_id"),
+        })
+        checkpoint.set("applications_section", True)
+
+    def add_applications_db():
+        checkpoint.set("applications_db_id", create_applications_db(headers, page_id))
+
+    def add_closing_blocks():
+        api_request("PATCH", f"blocks/{page_id}/children", headers, json={
+            "children": CLOSING_BLOCKS,
+        })
+        checkpoint.set("closing_blocks", True)
+
+    rounds = [
+        [("page_properties", set_page_properties), ("main_content", add_main_content)],
+        [("contacts_db_id", add_contacts_db)],
+        [("applications_section", add_applications_section), ("applications_db_id", add_applications_db)],
+        [("closing_blocks", add_closing_blocks)],
+    ]
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        for steps in rounds:
+            futures = [pool.submit(step) for key, step in steps if not checkpoint.get(key)]
+            # Wait for every step in the round so finished ones are checkpointed,
+            # then surface the first failure
+            errors = [f.exception() for f in futures if f.exception() is not None]
+            if errors:
+                raise errors[0]
+
+    checkpoint.set("complete", True)
+    return checkpoint.get("contacts_db_id"), checkpoint.get("applications_db_id")
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--page-id", help="Notion page ID (32-char string from the page URL) — this page will become Job Search HQ")
     parser.add_argument("--categories", help="Comma-separated to-do categories")
+    parser.add_argument("--checkpoint", help="Progress file (default: data/notion_setup/PAGE_ID.json)")
     args = parser.parse_args()
 
     print("=== Gertrudix Notion Setup ===\n")
@@ -459,15 +542,23 @@ def main():
         print("Error: At least 2 categories are required (Notion needs at least 2 columns).")
         sys.exit(1)
 
+    checkpoint = Checkpoint(Path(args.checkpoint) if args.checkpoint else CHECKPOINT_DIR / f"{page_id}.json")
+    if checkpoint.get("complete"):
+        print("This page was already set up — nothing to do.")
+    elif checkpoint.data:
+        print(f"Resuming from {checkpoint.path}")
+        if checkpoint.get("categories") and checkpoint.get("categories") != categories:
+            print(f"  Keeping the categories from the first run: {', '.join(checkpoint.get('categories'))}")
+
     # Create everything
     print("\nSetting up Notion workspace...")
+    try:
+        contacts_db_id, applications_db_id = setup_workspace(headers, page_id, categories, checkpoint)
+    except (SetupError, requests.RequestException) as e:
+        print(f"\nError: {e}")
+        print(f"Progress saved to {checkpoint.path} — re-run the same command to resume.")
+        sys.exit(1)
 
-    print("  - Populating page (weekly plan, to-do list, notes)...")
-    create_main_page(headers, page_id, categories)
-    print(f"    Done.")
-
-    print("  - Contacts & Applications databases...")
-    contacts_db_id, applications_db_id = add_databases(headers, page_id)
     print(f"    Contacts DB: {contacts_db_id}")
     print(f"    Applications DB: {applications_db_id}")
 
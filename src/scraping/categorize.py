@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Categorize new jobs with the Anthropic API, in concurrent batches.
+
+Reads data/scraped_jobs/scraped_tmp.json, sends the jobs to the model in
+batches of --batch-size with at most --concurrency requests in flight and at
+most --rpm requests started per minute, and adds the categorized jobs to the
+review queue (see review_queue.py). Each job gets a "category" (one of
+CATEGORIES) and a one-line "reason".
+
+The user profile and the Reviewing Roles section of lessons_learned.md are
+the same for every batch, so they go in the system prompt and are marked for
+prompt caching. Only the first request pays for them in full.
+
+Results are cached in data/scraped_jobs/category_cache.json, keyed by a hash
+of the job's content (title, company, location, department, description; not
+its URL or dates) plus a hash of the prompt context. A re-listed or re-scraped
+job is answered from the cache without a model call. Only what the model is
+given counts as context: the profile without its Preferences section (name,
+personality) and the Reviewing Roles lessons. Editing anything else changes
+nothing; editing those makes jobs be judged again under the new context,
+while the answers made under the last few contexts are kept, so undoing an
+edit brings them back.
+
+Jobs whose batch fails (after the SDK's own retries) stay in scraped_tmp.json
+for the next run. The file is deleted once every job has been categorized.
+
+--data-dir reads scraped_tmp.json from, and writes the cache and the review
+queue to, another directory instead of data/scraped_jobs/ (the Messages API
+stand-in in tools/ uses a scratch directory this way).
+
+Usage:
+    python src/scraping/categorize.py
+    python src/scraping/categorize.py --concurrency 4 --batch-size 10
+    python src/scraping/categorize.py --no-cache                        # ask the model about every job
+    python src/scraping/categorize.py --base-url http://127.0.0.1:8082 --data-dir /tmp/standin   # local stand-in
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+from anthropic import AsyncAnthropic
+from dotenv import load_dotenv
+
+from prescore import LESSONS_FILE, LESSONS_SECTION, PROFILE_FILE
+from review_queue import QUEUE_FILE, enqueue
+from scrapers.descriptions import job_description
+
+load_dotenv()
+
+TMP_FILE = Path("data/scraped_jobs/scraped_tmp.json")
+CACHE_FILE = Path("data/scraped_jobs/category_cache.json")
+
+MODEL = os.getenv("GERTRUDIX_CATEGORIZE_MODEL", "claude-haiku-4-5")
+MAX_TOKENS = 4096
+MAX_DESCRIPTION_CHARS = 1500
+CACHE_MAX_AGE_DAYS = 180
+CACHE_MAX_CONTEXTS = 3  # answers are kept for this many most recently used contexts
+# Profile sections that don't bear on judging roles, left out of the prompt (and so of the cache key)
+PROFILE_IGNORED_SECTIONS = ("preferences",)
+
+# The parts of a job that decide its category; URL and dates change on re-listing.
+# description_ref is itself a hash of the description text.
+JOB_HASH_FIELDS = ("title", "company", "location", "department", "description", "description_ref")
+
+CATEGORIES = {
+    "Apply": "Good fit — role, level, and direction align",
+    "Worth discussing": "Not a perfect fit but interesting — adjacent role, stretch, or something they hadn't considered",
+    "Worth knowing about": "Role isn't right but company/team is relevant — good for a connection, future role, "
+                           "or keeping on radar",
+    "Skip": "Genuinely irrelevant — wrong field, geography, clearly misaligned",
+}
+
+INSTRUCTIONS = """You are Gertrudix, a job search assistant, doing a first pass over newly scraped job postings \
+for the user described below. Assign every job exactly one category:
+
+{categories}
+
+Be conservative. When in doubt, bump a job up a category: the user reviews everything that isn't \
+Skip, and their feedback is how your judgement improves. Give a one-line reason per job that names \
+what specifically fits or doesn't.
+
+Record your answer with the record_categories tool, one entry per job, using the job's index."""
+
+TOOL = {
+    "name": "record_categories",
+    "description": "Record the category and reason for each job in the batch.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "jobs": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "index": {"type": "integer"},
+                        "category": {"type": "string", "enum": list(CATEGORIES)},
+                        "reason": {"type": "string"},
+                    },
+                    "required": ["index", "category", "reason"],
+                },
+            },
+        },
+        "required": ["jobs"],
+    },
+}
+
+HEADING_RE = re.compile(r"^#{1,6}\s+(.*)$")
+
+
+def load_json(path: Path, default):
+    return json.loads(path.read_text()) if path.exists() else default
+
+
+def save_json(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2))
+    tmp.replace(path)
+
+
+def _section(text: str, name: str) -> str:
+    """The body of the markdown section titled `name` (case-insensitive), without its heading."""
+    lines, inside = [], False
+    for line in text.splitlines():
+        heading = HEADING_RE.match(line)
+        if heading:
+            inside = heading.group(1).strip().lower() == name
+            continue
+        if inside:
+            lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def _without_sections(text: str, names) -> str:
+    """`text` without the markdown sections titled any of `names` (case-insensitive)."""
+    lines, skipping = [], False
+    for line in text.splitlines():
+        heading = HEADING_RE.match(line)
+        if heading:
+            skipping = heading.group(1).strip().lower() in names
+        if not skipping:
+            lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def load_context(profile_path: Path = PROFILE_FILE, lessons_path: Path = LESSONS_FILE) -> str:
+    """Profile plus the lessons that matter for reviewing roles — the stable part of every prompt."""
+    profile = _without_sections(profile_path.read_text(), PROFILE_IGNORED_SECTIONS) if profile_path.exists() else ""
+    profile = profile or "(no profile yet)"
+    lessons = _section(lessons_path.read_text(), LESSONS_SECTION) if lessons_path.exists() else ""
+    return f"<user_profile>\n{profile}\n</user_profile>\n\n<reviewing_roles_lessons>\n{lessons or '(none yet)'}\n" \
+           f"</reviewing_roles_lessons>"
+
+
+def system_prompt(context: str) -> list[dict]:
+    categories = "\n".join(f"- {name}: {meaning}" for name, meaning in CATEGORIES.items())
+    return [{
+        "type": "text",
+        "text": INSTRUCTIONS.format(categories=categories) + "\n\n" + context,
+        "cache_control": {"type": "ephemeral"},
+    }]
+
+
+def job_summary(index: int, job: dict) -> dict:
+    summary = {
+        "index": index,
+        "title": job.get("title"),
+        "company": job.get("company"),
+        "location": job.get("location"),
+        "department": job.get("department"),
+    }
+    description = job_description(job)
+    if description:
+        summary["description"] = description[:MAX_DESCRIPTION_CHARS]
+    if job.get("prescore"):
+        summary["profile_terms_matched"] = job["prescore"].get("terms", [])
+    return summary
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+
+def job_hash(job: dict) -> str:
+    return _hash("\x1f".join(" ".join(str(job.get(f) or "").lower().split()) for f in JOB_HASH_FIELDS))
+
+
+class CategoryCache:
+    """Past categorizations, keyed by job hash and the hash of the prompt context they were made with.
+
+    Entries made under other contexts are kept (for the CACHE_MAX_CONTEXTS most recently used
+    contexts), so a context change only affects lookups, never what's already there.
+    """
+
+    def __init__(self, context_hash: str, path: Path = CACHE_FILE):
+        self.path = path
+        self.context_hash = context_hash
+        data = load_json(path, {})
+        now = time.strftime("%Y-%m-%dT%H:%M:%S")  # when each context was last used
+        self.contexts, self.entries = data.get("contexts", {}), data.get("entries", {})
+        self.contexts[context_hash] = now
+
+    def _key(self, key: str) -> str:
+        return f"{key}:{self.context_hash}"
+
+    def get(self, key: str):
+        entry = self.entries.get(self._key(key))
+        return {"category": entry["category"], "reason": entry["reason"]} if entry else None
+
+    def put(self, key: str, result: dict):
+        self.entries[self._key(key)] = dict(result, cached_at=time.strftime("%Y-%m-%d"))
+
+    def save(self):
+        cutoff = time.strftime("%Y-%m-%d", time.localtime(time.time() - CACHE_MAX_AGE_DAYS * 86400))
+        # Most recently used first; the current context always comes first
+        recent = sorted(self.contexts, key=lambda h: (h == self.context_hash, self.contexts[h]), reverse=True)
+        contexts = {h: self.contexts[h] for h in recent[:CACHE_MAX_CONTEXTS]}
+        entries = {k: v for k, v in self.entries.items()
+                   if k.rpartition(":")[2] in contexts and v["cached_at"] >= cutoff}
+        save_json(self.path, {"contexts": contexts, "entries": entries})
+
+
+class RateLimiter:
+    """Spaces request starts so no more than `per_minute` begin in any minute."""
+
+    def __init__(self, per_minute: int):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self.next_start = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_start - now
+            self.next_start = max(now, self.next_start) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class Categorizer:
+    def __init__(self, client: AsyncAnthropic, context: str, model: str = MODEL,
+                 concurrency: int = 8, rpm: int = 50):
+        self.client = client
+        self.system = system_prompt(context)
+        self.model = model
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.limiter = RateLimiter(rpm)
+        self.usage = {"input_tokens": 0, "output_tokens": 0, "cache_creation_input_tokens": 0,
+                      "cache_read_input_tokens": 0}
+
+    def _record_usage(self, usage):
+        for key in self.usage:
+            self.usage[key] += getattr(usage, key, None) or 0
+
+    async def categorize_batch(self, offset: int, jobs: list[dict]) -> dict:
+        """Returns {index: {"category", "reason"}} for the jobs the model answered for."""
+        batch = [job_summary(offset + i, job) for i, job in enumerate(jobs)]
+        async with self.semaphore:
+            await self.limiter.wait()
+            response = await self.client.messages.create(
+                model=self.model,
+                max_tokens=MAX_TOKENS,
+                system=self.system,
+                tools=[TOOL],
+                tool_choice={"type": "tool", "name": TOOL["name"]},
+                messages=[{
+                    "role": "user",
+                    "content": f"Categorize these {len(batch)} jobs:\n{json.dumps(batch, ensure_ascii=False)}",
+                }],
+            )
+        self._record_usage(response.usage)
+
+        valid = {item["index"] for item in batch}
+        results = {}
+        for block in response.content:
+            if block.type != "tool_use":
+                continue
+            for item in block.input.get("jobs", []):
+                if item.get("index") in valid and item.get("category") in CATEGORIES:
+                    results[item["index"]] = {"category": item["category"], "reason": item.get("reason", "")}
+        return results
+
+    async def run(self, jobs: list[dict], batch_size: int) -> tuple[dict, int]:
+        """Categorize all jobs. Returns ({index: result}, number of failed batches)."""
+        offsets = list(range(0, len(jobs), batch_size))
+
+        async def attempt(offset):
+            try:
+                return await self.categorize_batch(offset, jobs[offset:offset + batch_size])
+            except Exception as e:
+                return e
+
+        # The first batch writes the prompt cache; the rest start once it's there and read from it
+        outcomes = [await attempt(offsets[0])]
+        outcomes += await asyncio.gather(*(attempt(offset) for offset in offsets[1:]))
+
+        results, failed = {}, 0
+        for offset, outcome in zip(offsets, outcomes):
+            if isinstance(outcome, Exception):
+                failed += 1
+                print(f"  Batch starting at job {offset} failed: {outcome}")
+            else:
+                results.update(outcome)
+        return results, failed
+
+
+async def categorize(args) -> int:
+    tmp_file = args.data_dir / TMP_FILE.name
+    jobs = load_json(tmp_file, [])
+    if not jobs:
+        print(f"Nothing to categorize — {tmp_file} is empty or missing.")
+        return 0
+
+    context = load_context()
+    cache = CategoryCache(_hash(args.model + "\n" + system_prompt(context)[0]["text"]),
+                          args.data_dir / CACHE_FILE.name)
+    keys = [job_hash(job) for job in jobs]
+
+    # Ask the model once per distinct job that isn't cached yet
+    answers = {}
+    if not args.no_cache:
+        for key in keys:
+            hit = cache.get(key)
+            if hit:
+                answers[key] = hit
+    cached = sum(1 for key in keys if key in answers)
+    pending = {}
+    for key, job in zip(keys, jobs):
+        if key not in answers:
+            pending.setdefault(key, job)
+
+    client_kwargs = {"max_retries": args.max_retries}
+    if args.base_url:
+        client_kwargs["base_url"] = args.base_url
+        client_kwargs["api_key"] = os.getenv("ANTHROPIC_API_KEY") or "standin"
+    client = AsyncAnthropic(**client_kwargs)
+
+    categorizer = Categorizer(client, context, model=args.model,
+                              concurrency=args.concurrency, rpm=args.rpm)
+    start = time.perf_counter()
+    failed = 0
+    try:
+        if pending:
+            pending_keys = list(pending)
+            results, failed = await categorizer.run(list(pending.values()), args.batch_size)
+            for i, result in results.items():
+                answers[pending_keys[i]] = result
+                cache.put(pending_keys[i], result)
+    finally:
+        await client.close()
+    elapsed = time.perf_counter() - start
+
+    done = [dict(job, **answers[key]) for key, job in zip(keys, jobs) if key in answers]
+    remaining = [job for key, job in zip(keys, jobs) if key not in answers]
+
+    # Append first, then shrink scraped_tmp.json, so an interruption can only duplicate, never lose
+    enqueue(done, args.data_dir / QUEUE_FILE.name)
+    cache.save()
+    if remaining:
+        save_json(tmp_file, remaining)
+    else:
+        tmp_file.unlink()
+
+    counts = {name: sum(1 for job in done if job["category"] == name) for name in CATEGORIES}
+    print(f"Categorized {len(done)}/{len(jobs)} jobs in {elapsed:.1f}s ({cached} from cache)")
+    for name, count in counts.items():
+        print(f"  {name:<20}: {count}")
+    if remaining:
+        print(f"{len(remaining)} jobs left in {tmp_file} ({failed} failed batches) — run again to retry")
+    usage = categorizer.usage
+    print(f"Tokens: {usage['input_tokens']} in ({usage['cache_read_input_tokens']} cache read, "
+          f"{usage['cache_creation_input_tokens']} cache write), {usage['output_tokens']} out")
+    return 1 if remaining else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Categorize scraped_tmp.json into the review queue")
+    parser.add_argument("--model", default=MODEL, help=f"Model to use (default: {MODEL})")
+    parser.add_argument("--batch-size", type=int, default=20, help="Jobs per request (default: 20)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight (default: 8)")
+    parser.add_argument("--rpm", type=int, default=50, help="Max requests started per minute (default: 50)")
+    parser.add_argument("--max-retries", type=int, default=4, help="Retries per request on 429/5xx (default: 4)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached categories (results are still saved)")
+    parser.add_argument("--base-url", default=os.getenv("ANTHROPIC_BASE_URL"),
+                        help="Messages API base URL, e.g. a local stand-in")
+    parser.add_argument("--data-dir", type=Path, default=TMP_FILE.parent,
+                        help=f"Directory with scraped_tmp.json, the cache and the review queue (default: {TMP_FILE.parent})")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(categorize(args)))
+
+
+if __name__ == "__main__":
+    main()
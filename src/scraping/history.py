@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Append-only history of what each source listed, run by run.
+
+Every scrape of a source appends one line to data/scraped_jobs/history.jsonl
+with only what changed since that source's previous scrape:
+
+    {"t": "...", "source": "Anthropic", "n": 212,
+     "added": {url: job}, "changed": {url: job}, "removed": [url, ...]}
+
+Every CHECKPOINT_EVERY scrapes of a source, a line with the source's full
+listing is written as well ({"t", "source", "checkpoint": {url: job}}), so
+reconstructing a point in time only replays deltas from the nearest
+checkpoint. data/scraped_jobs/history_head.json caches the current listing
+and the checkpoint offsets; it's rebuilt from the log if it's missing or
+stale.
+
+Stored job fields are those that describe the posting (title, company,
+location, department, posted_at, description_ref), not scrape metadata.
+
+    python src/scraping/history.py job https://boards.greenhouse.io/acme/jobs/123
+    python src/scraping/history.py time-to-fill [--source Anthropic]
+    python src/scraping/history.py velocity [--weeks 8] [--source Anthropic]
+    python src/scraping/history.py at 2026-09-01 [--source Anthropic]
+    python src/scraping/history.py stats
+"""
+import argparse
+import fcntl
+import json
+import os
+import statistics
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+HISTORY_FILE = Path("data/scraped_jobs/history.jsonl")
+HEAD_FILE = Path("data/scraped_jobs/history_head.json")
+
+CHECKPOINT_EVERY = 20
+JOB_FIELDS = ("title", "company", "location", "department", "posted_at", "description_ref")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _parse(t: str) -> datetime:
+    dt = datetime.fromisoformat(t.replace("Z", "+00:00"))
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _summary(job: dict) -> dict:
+    return {field: job.get(field) for field in JOB_FIELDS if job.get(field) is not None}
+
+
+def _records(start: int = 0):
+    """Yield (offset, record) from the log, starting at byte offset `start`."""
+    if not HISTORY_FILE.exists():
+        return
+    with open(HISTORY_FILE, "rb") as f:
+        f.seek(start)
+        offset = start
+        for line in f:
+            if line.endswith(b"\n"):
+                yield offset, json.loads(line)
+            offset += len(line)
+
+
+def _apply(listing: dict, record: dict):
+    if "checkpoint" in record:
+        listing.clear()
+        listing.update(record["checkpoint"])
+        return
+    for url in record.get("removed", []):
+        listing.pop(url, None)
+    listing.update(record.get("added", {}))
+    listing.update(record.get("changed", {}))
+
+
+def _rebuild_head() -> dict:
+    sources = {}
+    offset = 0
+    for offset, record in _records():
+        source = sources.setdefault(record["source"], {"jobs": {}, "runs_since_checkpoint": 0, "checkpoints": []})
+        _apply(source["jobs"], record)
+        if "checkpoint" in record:
+            source["runs_since_checkpoint"] = 0
+            source["checkpoints"].append([record["t"], offset])
+        else:
+            source["runs_since_checkpoint"] += 1
+    return {"offset": HISTORY_FILE.stat().st_size if HISTORY_FILE.exists() else 0, "sources": sources}
+
+
+def load_head() -> dict:
+    """Current listing per source, rebuilt from the log if the cached copy is out of date."""
+    size = HISTORY_FILE.stat().st_size if HISTORY_FILE.exists() else 0
+    if HEAD_FILE.exists():
+        head = json.loads(HEAD_FILE.read_text())
+        if head.get("offset") == size:
+            return head
+    return _rebuild_head()
+
+
+def _save_head(head: dict):
+    tmp = HEAD_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(head))
+    os.replace(tmp, HEAD_FILE)
+
+
+def record_run(jobs_by_source: dict, t: str = None) -> dict:
+    """
+    Append one delta per source for a scrape. `jobs_by_source` maps a source
+    name to every job dict fetched from it. Returns {source: (added, changed, removed)}.
+
+    An empty result for a source that had jobs is treated as a failed fetch
+    (scrapers return [] on errors) and not recorded.
+    """
+    t = t or _now()
+    HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    summary = {}
+
+    with open(HISTORY_FILE, "ab") as log:
+        fcntl.flock(log, fcntl.LOCK_EX)
+        try:
+            head = load_head()
+            offset = log.seek(0, os.SEEK_END)
+            lines = []
+            for name, jobs in jobs_by_source.items():
+                source = head["sources"].setdefault(name, {"jobs": {}, "runs_since_checkpoint": 0, "checkpoints": []})
+                previous = source["jobs"]
+                if not jobs and previous:
+                    print(f"  History: {name} returned no jobs — treating as a failed fetch, not recording")
+                    continue
+
+                current = {job["url"]: _summary(job) for job in jobs if job.get("url")}
+                record = {
+                    "t": t, "source": name, "n": len(current),
+                    "added": {u: j for u, j in current.items() if u not in previous},
+                    "changed": {u: j for u, j in current.items() if u in previous and previous[u] != j},
+                    "removed": sorted(u for u in previous if u not in current),
+                }
+                lines.append(record)
+                summary[name] = (len(record["added"]), len(record["changed"]), len(record["removed"]))
+                source["jobs"] = current
+                source["runs_since_checkpoint"] += 1
+
+                if source["runs_since_checkpoint"] >= CHECKPOINT_EVERY:
+                    lines.append({"t": t, "source": name, "checkpoint": current})
+                    source["runs_since_checkpoint"] = 0
+
+            for record in lines:
+                data = (json.dumps(record, separators=(",", ":")) + "\n").encode()
+                if "checkpoint" in record:
+                    head["sources"][record["source"]]["checkpoints"].append([t, offset])
+                log.write(data)
+                offset += len(data)
+            log.flush()
+            os.fsync(log.fileno())
+
+            head["offset"] = offset
+            _save_head(head)
+        finally:
+            fcntl.flock(log, fcntl.LOCK_UN)
+    return summary
+
+
+def state_at(when: datetime, source: str = None) -> dict:
+    """Reconstruct {source: {url: job}} as it was listed at `when`."""
+    head = load_head()
+    names = [source] if source else list(head["sources"])
+
+    # Start each source from its latest checkpoint at or before `when`
+    starts = {}
+    for name in names:
+        checkpoints = head["sources"].get(name, {}).get("checkpoints", [])
+        starts[name] = max((off for t, off in checkpoints if _parse(t) <= when), default=0)
+
+    listings = {name: {} for name in names}
+    for offset, record in _records(min(starts.values(), default=0)):
+        if _parse(record["t"]) > when:
+            break
+        name = record["source"]
+        if name in starts and offset >= starts[name]:
+            _apply(listings[name], record)
+    return listings
+
+
+def lifetimes(source: str = None) -> dict:
+    """{url: {"source", "job", "first_seen", "last_seen", "removed"}} over the whole log."""
+    jobs = {}
+    for _, record in _records():
+        if "checkpoint" in record or (source and record["source"] != source):
+            continue
+        t = record["t"]
+        for url, job in {**record.get("added", {}), **record.get("changed", {})}.items():
+            entry = jobs.setdefault(url, {"source": record["source"], "first_seen": t, "removed": None})
+            entry["job"] = job
+            if entry["removed"]:  # re-listed
+                entry["removed"] = None
+        for url in record.get("removed", []):
+            if url in jobs:
+                jobs[url]["removed"] = t
+    return jobs
+
+
+def _opened(entry: dict) -> datetime:
+    posted = entry["job"].get("posted_at")
+    try:
+        return _parse(posted) if posted else _parse(entry["first_seen"])
+    except ValueError:
+        return _parse(entry["first_seen"])
+
+
+def time_to_fill(source: str = None):
+    by_source = defaultdict(lambda: {"closed": [], "open": []})
+    now = datetime.now(timezone.utc)
+    for entry in lifetimes(source).values():
+        opened = _opened(entry)
+        if entry["removed"]:
+            by_source[entry["source"]]["closed"].append((_parse(entry["removed"]) - opened).days)
+        else:
+            by_source[entry["source"]]["open"].append((now - opened).days)
+
+    print(f"{'Source':<28} {'Closed':>6} {'Median days':>12} {'Open':>6} {'Median age':>11}")
+    for name, days in sorted(by_source.items()):
+        closed = f"{statistics.median(days['closed']):.0f}" if days["closed"] else "—"
+        age = f"{statistics.median(days['open']):.0f}" if days["open"] else "—"
+        print(f"{name:<28} {len(days['closed']):>6} {closed:>12} {len(days['open']):>6} {age:>11}")
+
+
+def velocity(weeks: int, source: str = None):
+    now = datetime.now(timezone.utc)
+    week_start = (now - timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+    starts = [week_start - timedelta(weeks=i) for i in reversed(range(weeks))]
+
+    counts = defaultdict(Counter)
+    for entry in lifetimes(source).values():
+        first_seen = _parse(entry["first_seen"])
+        for i, start in enumerate(starts):
+            if start <= first_seen < start + timedelta(weeks=1):
+                counts[entry["source"]][i] += 1
+
+    print(f"New postings per week (weeks starting {starts[0]:%Y-%m-%d} … {starts[-1]:%Y-%m-%d})")
+    for name in sorted(counts):
+        row = " ".join(f"{counts[name][i]:>3}" for i in range(weeks))
+        print(f"{name:<28} {row}   total {sum(counts[name].values())}")
+
+
+def show_job(url: str):
+    found = False
+    for _, record in _records():
+        if "checkpoint" in record:
+            continue
+        for kind in ("added", "changed"):
+            if url in record.get(kind, {}):
+                job = record[kind][url]
+                print(f"{record['t']}  {kind:<8} {job.get('title')} — {job.get('location', '')}")
+                found = True
+        if url in record.get("removed", []):
+            print(f"{record['t']}  removed")
+            found = True
+    if not found:
+        print(f"No history for {url}")
+
+
+def stats():
+    size = HISTORY_FILE.stat().st_size if HISTORY_FILE.exists() else 0
+    runs = checkpoints = 0
+    snapshot_bytes = 0
+    listings = {}
+    for _, record in _records():
+        if "checkpoint" in record:
+            checkpoints += 1
+            continue
+        runs += 1
+        listing = listings.setdefault(record["source"], {})
+        _apply(listing, record)
+        # What a full snapshot of this source would have cost for this run
+        snapshot_bytes += len(json.dumps(listing, separators=(",", ":")))
+    print(f"{runs} source scrapes, {checkpoints} checkpoints, {size / 1024:.0f} KiB")
+    if snapshot_bytes:
+        print(f"Full snapshots of the same scrapes: {snapshot_bytes / 1024:.0f} KiB "
+              f"(history is {100 * size / snapshot_bytes:.0f}%)")
+
+
+def _date(value: str) -> datetime:
+    dt = _parse(value)
+    # A bare date means the end of that day
+    return dt + timedelta(days=1, seconds=-1) if len(value) == 10 else dt
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the scrape history")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("job", help="Every change to one posting")
+    p.add_argument("url")
+    p = sub.add_parser("time-to-fill", help="How long postings stay up, per source")
+    p.add_argument("--source")
+    p = sub.add_parser("velocity", help="New postings per week, per source")
+    p.add_argument("--weeks", type=int, default=8)
+    p.add_argument("--source")
+    p = sub.add_parser("at", help="What was listed at a point in time")
+    p.add_argument("date", help="YYYY-MM-DD or an ISO timestamp")
+    p.add_argument("--source")
+    sub.add_parser("stats", help="History size against full snapshots")
+    args = parser.parse_args()
+
+    if args.command == "job":
+        show_job(args.url)
+    elif args.command == "time-to-fill":
+        time_to_fill(args.source)
+    elif args.command == "velocity":
+        velocity(args.weeks, args.source)
+    elif args.command == "at":
+        for name, listing in sorted(state_at(_date(args.date), args.source).items()):
+            print(f"{name} ({len(listing)})")
+            for job in sorted(listing.values(), key=lambda j: j.get("title", "")):
+                print(f"  {job.get('title')} — {job.get('location', '')}")
+    else:
+        stats()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Scrape for several Gertrudix users at once, fetching each board only once.
+
+profiles.json lists the users, each with the root of their own Gertrudix
+checkout:
+
+    [
+      {"name": "maria", "root": "/home/maria/Gertrudix"},
+      {"name": "sam", "root": "/home/sam/Gertrudix"}
+    ]
+
+Every user's src/scraping/sources.json is read and the sources are merged by
+board (type, slug and scraper options such as selectors), so a board that
+five users follow is downloaded once, unfiltered. Each user's filters and
+their own scrape_state.json cutoffs are then applied to the shared result,
+and each user gets the files their own update_queue.py run would have
+written, in their checkout: scraped_tmp.json (pre-scored against their
+profile), prescore_dropped.json, latest_scrape.json, history.jsonl and
+scrape_state.json. The descriptions they reference are copied into their
+description store.
+
+Jobs still waiting in a user's scraped_tmp.json are kept, with the new ones
+added, rather than overwritten.
+
+Fetched boards are checkpointed in data/scraped_jobs/run_multi/, so an
+interrupted run resumes without downloading them again.
+
+Usage:
+    python src/scraping/multi_profile.py                         # every user in profiles.json
+    python src/scraping/multi_profile.py --users maria,sam
+    python src/scraping/multi_profile.py --profiles /srv/gertrudix/profiles.json
+    python src/scraping/multi_profile.py --fresh                 # discard an unfinished run
+"""
+import argparse
+import contextlib
+import hashlib
+import json
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+from history import record_run
+from prescore import DROPPED_FILE, LESSONS_FILE, PROFILE_FILE, Profile, prescore_jobs, record_dropped
+from run_scrapers import SCRAPER_MAP, SOURCE_KEYS, make_scraper
+from scrapers.base import Job, JobFilter
+from scrapers.descriptions import BLOB_DIR, REPO_ROOT, export
+from update_queue import LATEST_FILE, SOURCES_FILE, STATE_FILE, TMP_FILE, load_json, parse_dt, posted_since, save_json
+
+PROFILES_FILE = Path("src/scraping/profiles.json")
+RUN_DIR = Path("data/scraped_jobs/run_multi")
+
+
+def board_key(source: dict) -> str:
+    """Sources that fetch the same thing share a key: same type, slug and scraper options."""
+    options = {k: v for k, v in source.items() if k not in SOURCE_KEYS and not k.startswith("_")}
+    return json.dumps([source["type"], source["slug"], options], sort_keys=True)
+
+
+def _checkpoint(name: str) -> Path:
+    return RUN_DIR / f"{hashlib.sha1(name.encode()).hexdigest()[:16]}.json"
+
+
+def load_users(path: Path, requested: set = None) -> list[dict]:
+    users = []
+    for entry in load_json(path, []):
+        if requested and entry["name"] not in requested:
+            continue
+        root = Path(entry["root"]).expanduser()
+        users.append({
+            "name": entry["name"],
+            "root": root,
+            "sources": load_json(root / SOURCES_FILE, []),
+            "state": load_json(root / STATE_FILE, {}),
+        })
+    return users
+
+
+def plan(users: list[dict]) -> dict:
+    """
+    The unique boards to fetch: {key: {"source", "since", "users"}}, where
+    "since" is the earliest cutoff of anyone following the board. Sets each
+    user's "subscriptions" to [(source, board key, cutoff)].
+    """
+    boards = {}
+    for user in users:
+        user["subscriptions"] = []
+        for source in user["sources"]:
+            name = source["name"]
+            last_scrape_str = user["state"].get(name)
+            if last_scrape_str is None:
+                print(f"  WARNING: No scrape date found for '{name}' ({user['name']}) — skipping")
+                continue
+            if source["type"] not in SCRAPER_MAP:
+                print(f"  Unknown type '{source['type']}' for {name} ({user['name']}) — skipping")
+                continue
+            cutoff = parse_dt(last_scrape_str)
+            key = board_key(source)
+            board = boards.setdefault(key, {"source": source, "since": cutoff, "users": 0})
+            board["since"] = min(board["since"], cutoff)
+            board["users"] += 1
+            user["subscriptions"].append((source, key, cutoff))
+    return boards
+
+
+def fetch_boards(boards: dict) -> dict:
+    """
+    Fetch every board once, unfiltered. Descriptions are stored as each board
+    is fetched, so jobs (and their checkpoints) carry only description_refs.
+    Returns {key: (jobs, time fetched)}.
+    """
+    fetched = {}
+    for key, board in boards.items():
+        path = _checkpoint(key)
+        if path.exists():
+            checkpoint = load_json(path, {})
+            fetched[key] = ([Job(**job) for job in checkpoint["jobs"]], checkpoint["t"])
+            continue
+
+        source = board["source"]
+        print(f"Fetching {source['name']} ({source['type']}) for {board['users']} user(s)...")
+        t = datetime.now(timezone.utc).isoformat()
+        jobs = make_scraper(source, since=board["since"]).fetch()
+        print(f"  → {len(jobs)} jobs fetched")
+        save_json(path, {"key": key, "t": t, "jobs": [job.to_dict() for job in jobs]})
+        fetched[key] = (jobs, t)
+    return fetched
+
+
+def write_user(user: dict, fetched: dict, min_prescore: float, no_prescore: bool):
+    """Apply a user's filters and cutoffs to the shared fetch and write their files."""
+    root = user["root"]
+    compiled = {}  # filters shared by several of the user's sources are resolved once
+    new_dicts, full_scrape, by_source = [], [], {}
+
+    for source, key, cutoff in user["subscriptions"]:
+        jobs, t = fetched[key]
+        filters = source.get("filters", {})
+        job_filter = compiled.setdefault(json.dumps(filters, sort_keys=True), JobFilter(filters))
+        kept = job_filter.apply(jobs)
+        # The board was fetched under whichever user's source came first; use this user's name for it
+        as_dicts = [dict(job.to_dict(), company=source["name"]) for job in kept]
+        new_urls = {job.url for job in posted_since(kept, cutoff)}
+
+        full_scrape.extend(as_dicts)
+        new_dicts.extend(job for job in as_dicts if job["url"] in new_urls)
+        by_source[source["name"]] = as_dicts
+        user["state"][source["name"]] = t
+
+    leftover = load_json(root / TMP_FILE, [])
+    if leftover:
+        seen = {job.get("url") for job in leftover}
+        new_dicts = leftover + [job for job in new_dicts if job["url"] not in seen]
+
+    dropped = []
+    if not no_prescore:
+        profile = Profile(root / PROFILE_FILE, root / LESSONS_FILE)
+        new_dicts, dropped = prescore_jobs(new_dicts, min_score=min_prescore, profile=profile)
+
+    export((job.get("description_ref") for job in full_scrape), root / BLOB_DIR.relative_to(REPO_ROOT))
+    save_json(root / TMP_FILE, new_dicts)
+    record_dropped(dropped, root / DROPPED_FILE)
+    save_json(root / LATEST_FILE, full_scrape)
+    with contextlib.chdir(root):
+        record_run(by_source)
+    save_json(root / STATE_FILE, user["state"])
+
+    kept_over = f" (incl. {len(leftover)} left over)" if leftover else ""
+    print(f"  {user['name']:<16} {len(new_dicts):>4} to analyze{kept_over}, {len(dropped)} dropped by pre-scoring")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape for several users, fetching each board once")
+    parser.add_argument("--profiles", type=Path, default=PROFILES_FILE, help=f"Users file (default: {PROFILES_FILE})")
+    parser.add_argument("--users", type=str, default=None, help="Comma-separated user names (default: all)")
+    parser.add_argument(
+        "--min-prescore", type=float, default=0.0,
+        help="Drop new jobs whose profile match score is below this (default: 0, only hard nos are dropped)"
+    )
+    parser.add_argument("--no-prescore", action="store_true", help="Skip pre-scoring against each profile")
+    parser.add_argument("--fresh", action="store_true", help="Discard an unfinished run instead of resuming it")
+    args = parser.parse_args()
+    requested = {u.strip() for u in args.users.split(",")} if args.users else None
+
+    users = load_users(args.profiles, requested)
+    if not users:
+        print(f"No matching users found. Check {args.profiles}.")
+        return
+    if args.fresh and RUN_DIR.exists():
+        shutil.rmtree(RUN_DIR)
+
+    boards = plan(users)
+    subscriptions = sum(len(user["subscriptions"]) for user in users)
+    print(f"{len(users)} users, {subscriptions} sources, {len(boards)} unique boards\n")
+
+    try:
+        fetched = fetch_boards(boards)
+    except KeyboardInterrupt:
+        done = sum(1 for key in boards if _checkpoint(key).exists())
+        print(f"\nInterrupted — {done} of {len(boards)} boards saved. Run again to resume.")
+        raise SystemExit(130)
+
+    print(f"\n{'=' * 45}")
+    for user in users:
+        # A user already written by an interrupted run keeps what it got (their cutoffs have moved on)
+        marker = _checkpoint(f"user:{user['name']}")
+        if marker.exists():
+            continue
+        write_user(user, fetched, args.min_prescore, args.no_prescore)
+        save_json(marker, {"user": user["name"]})
+    shutil.rmtree(RUN_DIR, ignore_errors=True)
+    print(f"Fetched {len(boards)} boards for {subscriptions} sources")
+
+
+if __name__ == "__main__":
+    main()
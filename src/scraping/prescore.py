@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Local pre-scoring of scraped jobs against the user profile.
+
+Runs before categorization so Gertrudix only reviews the plausible part of a
+large scrape. Builds a keyword-weight vector from user_profile.md and the
+Reviewing Roles section of lessons_learned.md, and scores every job with one
+TF-IDF matrix product over title, department, location and description.
+
+Jobs matching a hard no from the profile are dropped. So are jobs scoring
+below --min-score, if one is given. Dropped jobs are added to
+prescore_dropped.json with the reason and the date they were dropped, and
+kept there for DROPPED_KEEP_DAYS, so nothing is lost silently. Kept jobs get a "prescore"
+field: {"score": 0–1, "terms": [profile terms that matched]}.
+
+Hard nos are the bullets under a heading such as "Hard nos", "Not looking
+for" or "Deal-breakers", plus any line of the form "Hard no: ...". A rule
+only drops a job when all of its keywords appear in the job's title,
+department or location, so short rules ("Sales", "Crypto", "Unpaid
+internship") work best.
+
+update_queue.py runs this automatically. To re-score scraped_tmp.json by
+hand and see the ranking:
+    python src/scraping/prescore.py
+    python src/scraping/prescore.py --min-score 0.05
+"""
+import argparse
+import json
+import math
+import os
+import re
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from scrapers.descriptions import job_description
+
+PROFILE_FILE = Path("data/knowledge/profile/user_profile.md")
+LESSONS_FILE = Path("data/knowledge/profile/lessons_learned.md")
+TMP_FILE = Path("data/scraped_jobs/scraped_tmp.json")
+DROPPED_FILE = Path("data/scraped_jobs/prescore_dropped.json")
+DROPPED_KEEP_DAYS = 30
+
+# Only this part of lessons_learned.md is about which roles fit
+LESSONS_SECTION = "reviewing roles"
+
+# How much a keyword counts depending on where in the job it appears
+FIELD_WEIGHTS = {"title": 3.0, "department": 2.0, "location": 1.0, "description": 1.0}
+HARD_NO_FIELDS = ("title", "department", "location")
+MAX_HARD_NO_KEYWORDS = 4
+TOP_TERMS = 5
+
+HEADING_RE = re.compile(r"^#{1,6}\s+(.*)$")
+BULLET_RE = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+(.*)$")
+HARD_NO_HEADING_RE = re.compile(r"hard[\s-]*nos?|not looking|deal[\s-]*breakers?|avoid", re.IGNORECASE)
+HARD_NO_LINE_RE = re.compile(r"^\s*(?:[-*+]\s+)?hard[\s-]*no\s*:\s*(.+)$", re.IGNORECASE)
+COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+STOPWORDS = {
+    "a", "about", "an", "and", "any", "are", "as", "at", "be", "but", "by", "do", "for", "from", "has",
+    "have", "i", "i'm", "if", "in", "into", "is", "it", "its", "me", "my", "of", "on", "or", "our", "so",
+    "that", "the", "their", "them", "there", "they", "this", "to", "was", "we", "were", "what", "where",
+    "which", "who", "will", "with", "would", "you", "your", "want", "like", "looking", "really",
+    "something", "things", "also", "more", "most", "very", "can", "not", "no", "don", "t", "s",
+}
+# Words that say nothing about the role itself; ignored in hard-no rules
+GENERIC = {
+    "role", "roles", "job", "jobs", "position", "positions", "anything", "nothing", "work", "working",
+    "company", "companies", "team", "teams", "based", "type", "kind", "involving", "requiring", "heavy",
+}
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+def terms(text: str) -> list[str]:
+    """Unigrams plus bigrams, so "machine learning" and "product manager" count as phrases."""
+    tokens = tokenize(text)
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+def _sections(text: str):
+    """Yield (heading, line) for every non-empty line of a markdown file."""
+    heading = ""
+    for line in COMMENT_RE.sub("", text).splitlines():
+        match = HEADING_RE.match(line)
+        if match:
+            heading = match.group(1).strip()
+        elif line.strip():
+            yield heading, line
+
+
+class Profile:
+    """Keyword weights and hard-no rules read from the profile files."""
+
+    def __init__(self, profile_path: Path = PROFILE_FILE, lessons_path: Path = LESSONS_FILE):
+        counts = Counter()
+        self.hard_nos = []  # (rule text, keyword set)
+
+        for path, section in ((profile_path, None), (lessons_path, LESSONS_SECTION)):
+            if not path.exists():
+                continue
+            for heading, line in _sections(path.read_text()):
+                if section and heading.lower() != section:
+                    continue
+                rule = HARD_NO_LINE_RE.match(line)
+                if rule:
+                    self._add_hard_no(rule.group(1))
+                elif HARD_NO_HEADING_RE.search(heading):
+                    bullet = BULLET_RE.match(line)
+                    self._add_hard_no(bullet.group(1) if bullet else line)
+                else:
+                    counts.update(terms(line))
+
+        self.vocabulary = sorted(counts)
+        self.index = {term: i for i, term in enumerate(self.vocabulary)}
+        self.weights = np.array([1 + math.log(counts[t]) for t in self.vocabulary], dtype=np.float32)
+
+    def _add_hard_no(self, text: str):
+        # A list like "sales, recruiting or crypto" is one rule per item
+        for part in re.split(r",|;|\bor\b|/", text):
+            keywords = {t for t in tokenize(part) if t not in GENERIC}
+            if keywords and len(keywords) <= MAX_HARD_NO_KEYWORDS:
+                self.hard_nos.append((part.strip(" .").strip(), keywords))
+
+    def __bool__(self):
+        return bool(self.vocabulary or self.hard_nos)
+
+    def hard_no(self, job: dict):
+        """The first hard-no rule the job matches, or None."""
+        words = set(tokenize(" ".join(job.get(f) or "" for f in HARD_NO_FIELDS)))
+        for text, keywords in self.hard_nos:
+            if keywords <= words:
+                return text
+        return None
+
+
+def job_fields(job: dict) -> dict:
+    """The scored text fields of a job, with the description read from the store if needed."""
+    return {field: (job_description(job) if field == "description" else job.get(field)) or ""
+            for field in FIELD_WEIGHTS}
+
+
+def score(jobs: list[dict], profile: Profile) -> np.ndarray:
+    """Cosine similarity between each job's TF-IDF vector and the profile's keyword weights.
+
+    `jobs` are dicts of field texts, as returned by job_fields().
+    """
+    n = len(jobs)
+    if not n or not profile.vocabulary:
+        return np.zeros(n, dtype=np.float32)
+
+    # Weighted term counts per job, as a sparse (row, term id, count) list over all terms seen
+    term_ids = {}
+    rows, cols, vals = [], [], []
+    for row, job in enumerate(jobs):
+        counts = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in terms(job[field]):
+                counts[term] += weight
+        for term, count in counts.items():
+            rows.append(row)
+            cols.append(term_ids.setdefault(term, len(term_ids)))
+            vals.append(count)
+
+    rows = np.array(rows, dtype=np.int64)
+    cols = np.array(cols, dtype=np.int64)
+    tf = np.log1p(np.array(vals, dtype=np.float32))
+
+    # Terms that appear in every posting ("engineer", "london") tell jobs apart less than rare ones
+    df = np.bincount(cols, minlength=len(term_ids))
+    idf = (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+    tfidf = tf * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights=tfidf ** 2, minlength=n)).astype(np.float32)
+
+    # Dense matrix over the profile vocabulary only; everything else just contributes to the norm
+    to_profile = np.full(len(term_ids), -1, dtype=np.int64)
+    for term, i in term_ids.items():
+        to_profile[i] = profile.index.get(term, -1)
+    in_profile = to_profile[cols] >= 0
+    matrix = np.zeros((n, len(profile.vocabulary)), dtype=np.float32)
+    matrix[rows[in_profile], to_profile[cols[in_profile]]] = tfidf[in_profile]
+
+    scores = matrix @ profile.weights
+    denominator = norms * np.linalg.norm(profile.weights)
+    return np.divide(scores, denominator, out=np.zeros(n, dtype=np.float32), where=denominator > 0)
+
+
+def _top_terms(job: dict, profile: Profile) -> list[str]:
+    found = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for term in terms(job[field]):
+            i = profile.index.get(term)
+            if i is not None:
+                found[term] += weight * profile.weights[i]
+    return [term for term, _ in found.most_common(TOP_TERMS)]
+
+
+def prescore_jobs(jobs: list[dict], min_score: float = 0.0, profile: Profile = None):
+    """
+    Score jobs against the profile. Returns (kept, dropped): kept jobs carry a
+    "prescore" field and are sorted best first; dropped jobs carry a
+    "prescore_dropped" reason. With no profile on disk, every job is kept unscored.
+    """
+    profile = profile if profile is not None else Profile()
+    if not profile or not jobs:
+        return list(jobs), []
+
+    fields = [job_fields(job) for job in jobs]
+    scores = score(fields, profile)
+    kept, dropped = [], []
+    for job, text, value in zip(jobs, fields, scores.tolist()):
+        job = dict(job, prescore={"score": round(value, 3), "terms": _top_terms(text, profile)})
+        rule = profile.hard_no(job)
+        if rule:
+            dropped.append(dict(job, prescore_dropped=f"hard no: {rule}"))
+        elif value < min_score:
+            dropped.append(dict(job, prescore_dropped=f"score below {min_score}"))
+        else:
+            kept.append(job)
+
+    kept.sort(key=lambda j: j["prescore"]["score"], reverse=True)
+    return kept, dropped
+
+
+def record_dropped(dropped: list[dict], path: Path = DROPPED_FILE) -> int:
+    """
+    Add newly dropped jobs to the dropped file, dated, and forget entries older
+    than DROPPED_KEEP_DAYS. A job dropped again replaces its earlier entry.
+    Returns how many entries the file holds.
+    """
+    today = date.today().isoformat()
+    cutoff = (date.today() - timedelta(days=DROPPED_KEEP_DAYS)).isoformat()
+    by_url = {}
+    existing = json.loads(path.read_text()) if path.exists() else []
+    for job in existing + [dict(job, dropped_at=today) for job in dropped]:
+        if job.get("dropped_at", today) >= cutoff:
+            by_url[job.get("url") or id(job)] = job
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(list(by_url.values()), indent=2))
+    os.replace(tmp, path)
+    return len(by_url)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-score scraped jobs against the user profile")
+    parser.add_argument("--min-score", type=float, default=0.0, help="Drop jobs scoring below this (default: 0)")
+    parser.add_argument("--write", action="store_true", help=f"Write the result back to {TMP_FILE}")
+    args = parser.parse_args()
+
+    jobs = json.loads(TMP_FILE.read_text()) if TMP_FILE.exists() else []
+    kept, dropped = prescore_jobs(jobs, min_score=args.min_score)
+
+    for job in kept:
+        print(f"  {job.get('prescore', {}).get('score', 0):.3f}  {job['title']} — {job['company']}")
+    for job in dropped:
+        print(f"  DROP   {job['title']} — {job['company']} ({job['prescore_dropped']})")
+    print(f"\nKept {len(kept)}, dropped {len(dropped)} of {len(jobs)}")
+
+    if args.write:
+        TMP_FILE.write_text(json.dumps(kept, indent=2))
+        record_dropped(dropped)
+
+
+if __name__ == "__main__":
+    main()
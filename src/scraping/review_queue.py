@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+The queue of categorized jobs waiting for review with the user.
+
+An append-only log, data/scraped_jobs/review_queue.jsonl, replaces
+rewriting analyzed_jobs.json on every decision. categorize.py appends one
+"add" record per job; each review decision appends one "decide" record:
+
+    {"t": "...", "op": "add", "job": {...}}
+    {"t": "...", "op": "decide", "url": "...", "decision": "skip", "note": "..."}
+
+Decisions are apply, keep (not applying, but something about it is saved:
+a contact, a company to watch), skip, and backlog (not now; stays in the
+queue, listed after everything else). A job is open until it gets a
+decision other than backlog.
+
+Every write appends under a lock (review_queue.lock), so the categorizer
+and the review session can write at the same time. Closed jobs are moved
+to review_archive.jsonl by compaction, which rewrites the log with only the
+open jobs. It runs whenever jobs are added and the log has collected enough
+closed ones, or on demand.
+
+An existing analyzed_jobs.json is imported into the queue the first time
+the queue is used, and renamed to analyzed_jobs.imported.json.
+
+    python src/scraping/review_queue.py summary [--by source]
+    python src/scraping/review_queue.py list [--category Apply] [--source Anthropic] [--json]
+    python src/scraping/review_queue.py decide skip <url> [<url> ...] [--note "why"]
+    python src/scraping/review_queue.py add categorized.json          # jobs categorized by hand
+    python src/scraping/review_queue.py stale [--sources "Anthropic,Mistral"]
+    python src/scraping/review_queue.py done [--since 2026-10-19]
+    python src/scraping/review_queue.py compact
+"""
+import argparse
+import fcntl
+import json
+import os
+import sys
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+QUEUE_FILE = Path("data/scraped_jobs/review_queue.jsonl")
+LOCK_FILE = Path("data/scraped_jobs/review_queue.lock")
+ARCHIVE_FILE = Path("data/scraped_jobs/review_archive.jsonl")
+ANALYZED_FILE = Path("data/scraped_jobs/analyzed_jobs.json")
+LATEST_FILE = Path("data/scraped_jobs/latest_scrape.json")
+
+DECISIONS = ("apply", "keep", "skip", "backlog")
+# Same order as categorize.CATEGORIES, for listing
+CATEGORY_ORDER = ("Apply", "Worth discussing", "Worth knowing about", "Skip")
+# Compact once this many closed jobs (and at least as many as are open) are in the log
+COMPACT_MIN_CLOSED = 50
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _records(path: Path):
+    """Every complete record in a log; a half-written last line is ignored."""
+    if not path.exists():
+        return
+    with open(path, "rb") as f:
+        for line in f:
+            if line.endswith(b"\n"):
+                yield json.loads(line)
+
+
+def _write(path: Path, records: list, mode: str = "ab"):
+    # One write per batch, so a reader never sees part of a record followed by another record
+    data = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records).encode()
+    with open(path, mode) as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+@contextmanager
+def _locked(path: Path = QUEUE_FILE):
+    """Hold the queue's write lock. Reads don't need it: appends are whole lines and compaction is a rename."""
+    lock_file = path.with_suffix(".lock")  # LOCK_FILE for the real queue
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_file, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def load(path: Path = QUEUE_FILE) -> dict:
+    """{url: {"job", "added_at", "decision", "decided_at", "note"}} for every job in the log, in the order added."""
+    items = {}
+    for record in _records(path):
+        if record["op"] == "add":
+            url = record["job"].get("url")
+            if url and url not in items:
+                items[url] = {"job": record["job"], "added_at": record["t"], "decision": None}
+        elif record["op"] == "decide" and record["url"] in items:
+            items[record["url"]].update(decision=record["decision"], decided_at=record["t"], note=record.get("note"))
+    return items
+
+
+def is_open(item: dict) -> bool:
+    return item["decision"] in (None, "backlog")
+
+
+def open_jobs(items: dict = None) -> list[dict]:
+    """Open jobs, best first: by category, backlog last, then by pre-score."""
+    items = load() if items is None else items
+
+    def order(item):
+        category = item["job"].get("category")
+        rank = CATEGORY_ORDER.index(category) if category in CATEGORY_ORDER else len(CATEGORY_ORDER)
+        return item["decision"] == "backlog", rank, -(item["job"].get("prescore") or {}).get("score", 0)
+
+    return [dict(item["job"], backlog=True) if item["decision"] == "backlog" else item["job"]
+            for item in sorted((i for i in items.values() if is_open(i)), key=order)]
+
+
+def _import_analyzed(path: Path = QUEUE_FILE):
+    """Move a pre-queue analyzed_jobs.json into the queue. Call with the lock held."""
+    analyzed = path.with_name(ANALYZED_FILE.name)
+    if not analyzed.exists():
+        return 0
+    jobs = json.loads(analyzed.read_text() or "[]")
+    count = _add(jobs, load(path), path)
+    analyzed.rename(analyzed.with_name("analyzed_jobs.imported.json"))
+    return count
+
+
+def _add(jobs: list[dict], items: dict, path: Path = QUEUE_FILE) -> int:
+    t = _now()
+    records = []
+    for job in jobs:
+        url = job.get("url")
+        if url and url not in items:
+            items[url] = {"job": job, "added_at": t, "decision": None}
+            records.append({"t": t, "op": "add", "job": job})
+    if records:
+        _write(path, records)
+    return len(records)
+
+
+def enqueue(jobs: list[dict], path: Path = QUEUE_FILE) -> int:
+    """Add categorized jobs; any URL already in the queue is left alone. Returns how many were added.
+
+    `path` is the queue log; its lock, archive and analyzed_jobs.json are the files next to it.
+    """
+    with _locked(path):
+        _import_analyzed(path)
+        items = load(path)
+        added = _add(jobs, items, path)
+        closed = sum(1 for item in items.values() if not is_open(item))
+        if closed >= max(COMPACT_MIN_CLOSED, len(items) - closed):
+            _compact(items, path)
+    return added
+
+
+def decide(urls: list[str], decision: str, note: str = None):
+    """Record one decision for each of `urls`. Appending is all it costs, however long the queue."""
+    if decision not in DECISIONS:
+        raise ValueError(f"decision must be one of {', '.join(DECISIONS)}")
+    t = _now()
+    records = [{"t": t, "op": "decide", "url": url, "decision": decision, **({"note": note} if note else {})}
+               for url in urls]
+    with _locked():
+        _write(QUEUE_FILE, records)
+
+
+def _compact(items: dict, path: Path = QUEUE_FILE):
+    closed = [item for item in items.values() if not is_open(item)]
+    if closed:
+        _write(path.with_name(ARCHIVE_FILE.name), [{"t": item["decided_at"], "job": item["job"], "decision": item["decision"],
+                               **({"note": item["note"]} if item.get("note") else {})} for item in closed])
+    records = []
+    for url, item in items.items():
+        if is_open(item):
+            records.append({"t": item["added_at"], "op": "add", "job": item["job"]})
+            if item["decision"] == "backlog":
+                records.append({"t": item["decided_at"], "op": "decide", "url": url, "decision": "backlog",
+                                **({"note": item["note"]} if item.get("note") else {})})
+    tmp = path.with_suffix(".tmp")
+    _write(tmp, records, mode="wb")
+    os.replace(tmp, path)
+    return len(closed)
+
+
+def compact() -> int:
+    """Move closed jobs to the archive and rewrite the log with only open ones. Returns how many moved."""
+    with _locked():
+        return _compact(load())
+
+
+def summary(by: str = "category", items: dict = None):
+    jobs = open_jobs(items)
+    if not jobs:
+        print("The review queue is empty.")
+        return
+    if by == "source":
+        groups = defaultdict(Counter)
+        for job in jobs:
+            groups[job.get("company", "?")][job.get("category", "Uncategorized")] += 1
+        for source, counts in sorted(groups.items(), key=lambda item: -sum(item[1].values())):
+            parts = ", ".join(f"{c} {n}" for c, n in sorted(counts.items(), key=lambda kv: _category_rank(kv[0])))
+            print(f"{source} ({sum(counts.values())}): {parts}")
+        return
+
+    groups = defaultdict(list)
+    for job in jobs:
+        groups[job.get("category", "Uncategorized")].append(job)
+    for category in sorted(groups, key=_category_rank):
+        titles = ", ".join(f"{j.get('title')} at {j.get('company')}" + (" (backlog)" if j.get("backlog") else "")
+                           for j in groups[category])
+        print(f"{category} ({len(groups[category])}): {titles}")
+
+
+def _category_rank(category: str) -> int:
+    return CATEGORY_ORDER.index(category) if category in CATEGORY_ORDER else len(CATEGORY_ORDER)
+
+
+def stale(sources: set = None, items: dict = None) -> list[dict]:
+    """Open jobs from the scraped sources that the latest scrape no longer lists (probably filled)."""
+    if not LATEST_FILE.exists():
+        return []
+    latest = json.loads(LATEST_FILE.read_text())
+    scraped = sources or {job.get("company") for job in latest}
+    listed = {job.get("url") for job in latest}
+    return [job for job in open_jobs(items) if job.get("company") in scraped and job.get("url") not in listed]
+
+
+def done(since: datetime) -> Counter:
+    """Decisions (other than backlog) made since `since`, from the queue and the archive."""
+    counts = Counter()
+    for item in load().values():
+        if item["decision"] not in (None, "backlog") and _parse(item["decided_at"]) >= since:
+            counts[item["decision"]] += 1
+    for record in _records(ARCHIVE_FILE):
+        if record["decision"] != "backlog" and _parse(record["t"]) >= since:
+            counts[record["decision"]] += 1
+    return counts
+
+
+def _parse(t: str) -> datetime:
+    dt = datetime.fromisoformat(t.replace("Z", "+00:00"))
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="The queue of jobs waiting for review")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("summary", help="Open jobs by category or by source")
+    p.add_argument("--by", choices=("category", "source"), default="category")
+    p = sub.add_parser("list", help="Open jobs, best first")
+    p.add_argument("--category")
+    p.add_argument("--source")
+    p.add_argument("--json", action="store_true", help="Print the full job records as JSON")
+    p = sub.add_parser("decide", help="Record a decision for one or more jobs")
+    p.add_argument("decision", choices=DECISIONS)
+    p.add_argument("urls", nargs="+")
+    p.add_argument("--note")
+    p = sub.add_parser("add", help="Add categorized jobs from a JSON file")
+    p.add_argument("file", type=Path)
+    p = sub.add_parser("stale", help="Open jobs no longer listed in the latest scrape")
+    p.add_argument("--sources", help="Comma-separated source names (default: every source in the latest scrape)")
+    p = sub.add_parser("done", help="Decisions made since a date")
+    p.add_argument("--since", help="YYYY-MM-DD (default: today)")
+    sub.add_parser("compact", help="Move closed jobs to the archive")
+    args = parser.parse_args()
+
+    if ANALYZED_FILE.exists():
+        with _locked():
+            print(f"Imported {_import_analyzed()} jobs from {ANALYZED_FILE}")
+
+    if args.command == "summary":
+        summary(args.by)
+    elif args.command == "list":
+        jobs = [j for j in open_jobs()
+                if (not args.category or j.get("category") == args.category)
+                and (not args.source or j.get("company") == args.source)]
+        if args.json:
+            print(json.dumps(jobs, indent=2))
+        else:
+            for job in jobs:
+                backlog = " (backlog)" if job.get("backlog") else ""
+                print(f"[{job.get('category', '?')}] {job.get('title')} — {job.get('company')} — "
+                      f"{job.get('location', '')}{backlog}\n    {job.get('url')}")
+    elif args.command == "decide":
+        items = load()
+        unknown = [url for url in args.urls if url not in items]
+        if unknown:
+            print(f"Not in the review queue: {', '.join(unknown)}")
+            sys.exit(1)
+        decide(args.urls, args.decision, args.note)
+        print(f"{args.decision}: {len(args.urls)} job(s); {sum(1 for i in load().values() if is_open(i))} open")
+    elif args.command == "add":
+        print(f"Added {enqueue(json.loads(args.file.read_text()))} jobs to the review queue")
+    elif args.command == "stale":
+        sources = {s.strip() for s in args.sources.split(",")} if args.sources else None
+        for job in stale(sources):
+            print(f"{job.get('title')} — {job.get('company')}\n    {job.get('url')}")
+    elif args.command == "done":
+        since = _parse(args.since) if args.since else datetime.now().astimezone().replace(
+            hour=0, minute=0, second=0, microsecond=0)
+        counts = done(since)
+        print(", ".join(f"{counts[d]} {d}" for d in DECISIONS if d != "backlog"))
+    else:
+        print(f"Archived {compact()} reviewed jobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,56 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime
 from pathlib import Path
 
+from history import HISTORY_FILE, record_run
 from scrapers.ashby import AshbyScraper
 from scrapers.base import Job
 from scrapers.greenhouse import GreenhouseScraper
+from scrapers.html_page import HtmlScraper
 from scrapers.lever import LeverScraper
 from scrapers.rss import RSSScraper
+from scrapers.sitemap import SitemapScraper
+from scrapers.smartrecruiters import SmartRecruitersScraper
+from scrapers.workable import WorkableScraper
 
 SCRAPER_MAP = {
     "greenhouse": GreenhouseScraper,
     "lever": LeverScraper,
     "ashby": AshbyScraper,
     "rss": RSSScraper,
+    "workable": WorkableScraper,
+    "smartrecruiters": SmartRecruitersScraper,
+    "html": HtmlScraper,
+    "sitemap": SitemapScraper,
 }
 
+# Keys of a sources.json entry that aren't scraper options
+SOURCE_KEYS = {"name", "type", "slug", "filters"}
+
+
+def make_scraper(source: dict, since=None):
+    """Scraper instance for a sources.json entry (None if its type is unknown).
+
+    `since` is the source's last scrape; scrapers that can skip unchanged pages use it.
+    """
+    scraper_class = SCRAPER_MAP.get(source["type"])
+    if not scraper_class:
+        return None
+    options = {k: v for k, v in source.items() if k not in SOURCE_KEYS and not k.startswith("_")}
+    return scraper_class(name=source["name"], slug=source["slug"], filters=source.get("filters", {}),
+                         since=since, **options)
+
+
+def run_all(sources_path: Path | None = None, state: dict | None = None) -> list[Job]:
+    """Every source's filtered jobs. `state` maps source names to their last scrape
+    (default: update_queue.py's scrape_state.json), so sitemaps skip unchanged pages."""
+    from update_queue import STATE_FILE, load_json, parse_dt  # imported here: update_queue imports this module
 
-def run_all(sources_path: Path | None = None) -> list[Job]:
     if sources_path is None:
         sources_path = Path(__file__).parent / "sources.json"
+    if state is None:
+        state = load_json(STATE_FILE, {})
 
     with open(sources_path) as f:
         sources = json.load(f)
@@ -29,16 +59,13 @@ def run_all(sources_path: Path | None = None) -> list[Job]:
     for source in sources:
         name = source["name"]
         source_type = source["type"]
-        slug = source["slug"]
-        filters = source.get("filters", {})
 
-        scraper_class = SCRAPER_MAP.get(source_type)
-        if not scraper_class:
+        scraper = make_scraper(source, since=parse_dt(state[name]) if state.get(name) else None)
+        if not scraper:
             print(f"  Unknown source type '{source_type}' for {name} — skipping")
             continue
 
         print(f"Fetching {name} ({source_type})...")
-        scraper = scraper_class(name=name, slug=slug, filters=filters)
         jobs = scraper.run()
         print(f"  → {len(jobs)} jobs")
         all_jobs.extend(jobs)
@@ -50,16 +77,16 @@ def main():
     print("Running job scrapers...\n")
     jobs = run_all()
 
-    output_dir = Path("data/scraped_jobs")
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = output_dir / f"jobs_{timestamp}.json"
-
-    with open(output_file, "w") as f:
-        json.dump([j.to_dict() for j in jobs], f, indent=2)
+    # Record what changed per source rather than dumping a full snapshot every run
+    by_source = {}
+    for job in jobs:
+        by_source.setdefault(job.company, []).append(job.to_dict())
+    changes = record_run(by_source)
 
-    print(f"\nTotal: {len(jobs)} jobs saved to {output_file}")
+    print(f"\nTotal: {len(jobs)} jobs")
+    for name, (added, changed, removed) in changes.items():
+        print(f"  {name}: +{added} new, {changed} changed, -{removed} gone")
+    print(f"Recorded in {HISTORY_FILE}")
 
 
 if __name__ == "__main__":
@@ -1,27 +1,22 @@
-import requests
 from datetime import datetime
+from typing import Iterator
+
 from .base import BaseScraper, Job
+from .descriptions import html_to_text
 
 
 class AshbyScraper(BaseScraper):
     source_type = "ashby"
 
-    def fetch_jobs(self) -> list[Job]:
+    def iter_jobs(self) -> Iterator[Job]:
         url = f"https://api.ashbyhq.com/posting-api/job-board/{self.slug}"
-        try:
-            response = requests.get(url, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-        except Exception as e:
-            print(f"  Error fetching {self.name} (Ashby): {e}")
-            return []
-
-        jobs = []
-        for item in data.get("jobs", []):
+        # Streamed: with descriptions included the body can be huge, so it's never held whole,
+        # and each job is filtered and its description stored before the next is decoded
+        for item in self.stream_json(url, key="jobs"):
             location = item.get("location", "Unknown")
             dept = item.get("department", "") or item.get("team", "")
 
-            jobs.append(Job(
+            yield Job(
                 title=item.get("title", "Unknown"),
                 company=self.name,
                 url=item.get("jobUrl", f"https://jobs.ashbyhq.com/{self.slug}/{item.get('id', '')}"),
@@ -30,6 +25,8 @@ class AshbyScraper(BaseScraper):
                 posted_at=item.get("publishedAt"),
                 source_type=self.source_type,
                 scraped_at=datetime.now().isoformat(),
-            ))
+                description={k: item.get(k) for k in ("descriptionPlain", "descriptionHtml")},
+            )
 
-        return jobs
+    def description_text(self, raw) -> str:
+        return raw.get("descriptionPlain") or html_to_text(raw.get("descriptionHtml") or "")
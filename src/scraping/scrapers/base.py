@@ -1,6 +1,17 @@
-from dataclasses import dataclass, asdict
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field
 from datetime import datetime
-from typing import Optional
+from typing import Any, Callable, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .descriptions import store
+from .jsonstream import iter_array
+from .locations import filter_keys, parse_location
+
+DESCRIPTION_BATCH = 32  # jobs whose raw descriptions are held at once, waiting to be stored
 
 
 @dataclass
@@ -13,44 +24,180 @@ class Job:
     posted_at: Optional[str]
     source_type: str
     scraped_at: str
+    description_ref: Optional[str] = None  # see descriptions.py; load with descriptions.load()
+    location_info: Optional[dict] = None  # normalized location, see locations.py
+    # The description as the board sent it, until BaseScraper stores it and sets description_ref
+    # (see BaseScraper._collect). Scrapers leave it raw so jobs the filters drop are never converted.
+    description: Any = field(default=None, repr=False)
 
     def to_dict(self):
-        return asdict(self)
+        data = asdict(self)
+        if data["description"] is None:
+            del data["description"]
+        return data
+
+
+def _make_session() -> requests.Session:
+    session = requests.Session()
+    # Enough pooled connections per host for paginated fetches to run in parallel
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = "Mozilla/5.0 (compatible; Gertrudix job scraper)"
+    return session
+
+
+class JobFilter:
+    """A source's "filters" entry, resolved once so it can be applied to any number of jobs."""
+
+    def __init__(self, filters: dict):
+        self.locations = [l.lower() for l in filters.get("locations", [])]
+        self.location_keys = frozenset().union(*(filter_keys(l) for l in filters.get("locations", [])))
+        self.departments = [d.lower() for d in filters.get("departments", [])]
+
+    def __call__(self, job: Job) -> bool:
+        # Location filter: pass if no filter set, or if the normalized location or the raw
+        # string matches (for places the gazetteer doesn't know), or if remote
+        if self.locations:
+            location = parse_location(job.location)
+            job_loc = job.location.lower()
+            if not (location.remote or location.keys & self.location_keys
+                    or any(loc in job_loc for loc in self.locations)):
+                return False
+
+        # Department filter: pass if no filter set, or if job dept matches
+        if self.departments:
+            job_dept = job.department.lower()
+            if not any(dept in job_dept for dept in self.departments):
+                return False
+
+        return True
+
+    def apply(self, jobs: list[Job]) -> list[Job]:
+        return [job for job in jobs if self(job)]
 
 
 class BaseScraper:
     source_type = "base"
 
-    def __init__(self, name: str, slug: str, filters: dict):
+    # Shared by all scrapers so repeated requests to the same host reuse connections
+    session = _make_session()
+    timeout = 15
+    max_in_flight = 4
+
+    def __init__(self, name: str, slug: str, filters: dict, since: Optional[datetime] = None, **options):
+        # options: any other keys of the source's sources.json entry, for scrapers that need them
+        # since: the source's last scrape (timezone-aware), for scrapers that can fetch incrementally
         self.name = name
         self.slug = slug
         self.filters = filters
+        self.since = since
+        self.options = options
 
     def fetch_jobs(self) -> list[Job]:
         raise NotImplementedError
 
+    def iter_jobs(self) -> Iterator[Job]:
+        """
+        The board's jobs, one at a time. Scrapers that stream the board
+        override this and let errors raise (they're reported by fetch/run);
+        the others implement fetch_jobs, which reports its own and returns [].
+        """
+        return iter(self.fetch_jobs())
+
+    def request_json(self, request: dict):
+        """Send one request ({"url", optional "method", "params", "json", "headers"}) and return the JSON body."""
+        request = dict(request)
+        method = request.pop("method", "GET")
+        response = self.session.request(method, timeout=self.timeout, **request)
+        response.raise_for_status()
+        return response.json()
+
+    def stream_json(self, url: str, key: str = None) -> Iterator:
+        """
+        Yield the elements of the JSON array in a response body as they arrive,
+        instead of loading the whole body (see jsonstream.py). `key` names the
+        array inside a top-level object; without it the body is the array.
+        """
+        with self.session.get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            yield from iter_array(response.iter_content(chunk_size=64 * 1024), key)
+
+    def paginate(self, first_request: dict, next_requests: Callable[[dict], list],
+                 max_in_flight: int = None) -> Iterator[dict]:
+        """
+        Yield the JSON body of every page, in order, prefetching ahead.
+
+        `next_requests(page)` is called as soon as a page arrives and returns the
+        requests to send next: for offset pagination with a known total, every
+        remaining page after the first one; for cursor pagination, the single
+        next page (or nothing when done). Those requests start right away, up to
+        `max_in_flight` at a time, while the caller is still parsing the page.
+        Any failed request raises.
+        """
+        with ThreadPoolExecutor(max_workers=max_in_flight or self.max_in_flight) as pool:
+            pending = deque([pool.submit(self.request_json, first_request)])
+            try:
+                while pending:
+                    page = pending.popleft().result()
+                    for request in next_requests(page) or []:
+                        pending.append(pool.submit(self.request_json, request))
+                    yield page
+            finally:
+                for future in pending:
+                    future.cancel()
+
     def apply_filters(self, jobs: list[Job]) -> list[Job]:
-        location_filter = [l.lower() for l in self.filters.get("locations", [])]
-        dept_filter = [d.lower() for d in self.filters.get("departments", [])]
+        return JobFilter(self.filters).apply(jobs)
 
-        filtered = []
-        for job in jobs:
-            # Location filter: pass if no filter set, or if job location matches, or if remote
-            if location_filter:
-                job_loc = job.location.lower()
-                if not any(loc in job_loc for loc in location_filter) and "remote" not in job_loc:
-                    continue
+    def description_text(self, raw) -> str:
+        """Plain text from the raw description a scraper put on a Job (plain text already, by default)."""
+        return raw or ""
 
-            # Department filter: pass if no filter set, or if job dept matches
-            if dept_filter:
-                job_dept = job.department.lower()
-                if not any(dept in job_dept for dept in dept_filter):
-                    continue
+    def _store_description(self, job: Job) -> bool:
+        try:
+            job.description_ref = store(self.description_text(job.description))
+            return True
+        except Exception:
+            return False
+        finally:
+            job.description = None
 
-            filtered.append(job)
+    def _collect(self, keep: Callable[[Job], bool] = None) -> list[Job]:
+        """
+        The jobs from iter_jobs() that `keep` accepts (all of them by default),
+        with normalized locations and their descriptions stored (see
+        descriptions.py). Each raw description is stored, or dropped with its
+        job, within DESCRIPTION_BATCH jobs of being parsed, so memory doesn't
+        grow with the size of the board. Any error loses the whole source, as
+        a failed fetch always has.
+        """
+        jobs, batch, failed = [], [], 0
+        # description_text may have to fetch the posting (boards whose listings have no descriptions)
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            try:
+                for job in self.iter_jobs():
+                    job.location_info = parse_location(job.location).to_dict()
+                    if keep is not None and not keep(job):
+                        continue
+                    jobs.append(job)
+                    if job.description is not None:
+                        batch.append(job)
+                    if len(batch) >= DESCRIPTION_BATCH:
+                        failed += sum(not ok for ok in pool.map(self._store_description, batch))
+                        batch = []
+            except Exception as e:
+                print(f"  Error fetching {self.name} ({self.source_type}): {e}")
+                return []
+            failed += sum(not ok for ok in pool.map(self._store_description, batch))
+        if failed:
+            print(f"  {failed} descriptions of {self.name} failed to load — those jobs have none")
+        return jobs
 
-        return filtered
+    def fetch(self) -> list[Job]:
+        """Every job on the board, unfiltered, with normalized locations and stored descriptions."""
+        return self._collect()
 
     def run(self) -> list[Job]:
-        jobs = self.fetch_jobs()
-        return self.apply_filters(jobs)
+        """The jobs that pass the source's filters; only their descriptions are stored."""
+        return self._collect(JobFilter(self.filters))
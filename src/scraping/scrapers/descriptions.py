@@ -0,0 +1,189 @@
+"""
+Content-addressed, compressed store for job descriptions.
+
+Scrapers keep each job's description raw until the job has passed the
+source's filters (see BaseScraper._collect); then its plain text is stored
+under the SHA-256 of the text, and that hash goes on the Job as
+`description_ref`. The same text from a later run or another source maps to
+the same blob, so it's stored once.
+Snapshots and queues carry only the 64-character ref; the text is read (and
+decompressed) only when something asks for it.
+
+Blobs live in data/scraped_jobs/blobs/<first 2 hex>/<hash>.z, zlib-compressed.
+
+    python -m src.scraping.scrapers.descriptions show <description_ref or job URL>
+    python -m src.scraping.scrapers.descriptions stats
+    python -m src.scraping.scrapers.descriptions gc     # drop blobs nothing (queues, snapshots, history) refers to
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import zlib
+from html import unescape
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+SCRAPED_DIR = REPO_ROOT / "data" / "scraped_jobs"
+BLOB_DIR = SCRAPED_DIR / "blobs"
+
+BLOCK_TAGS = ["p", "div", "li", "br", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "ul", "ol"]
+
+# Files whose jobs keep their descriptions alive during gc
+REFERENCING_FILES = ["scraped_tmp.json", "analyzed_jobs.json", "latest_scrape.json", "prescore_dropped.json"]
+
+
+def html_to_text(html: str) -> str:
+    """Plain text from an HTML fragment (Greenhouse content is HTML-escaped HTML)."""
+    if not html:
+        return ""
+    soup = BeautifulSoup(unescape(html), "html.parser")
+    # Line breaks only between block elements, so inline tags (<b>, <a>) don't split sentences
+    for tag in soup.find_all(BLOCK_TAGS):
+        tag.append("\n")
+    text = soup.get_text()
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _blob_path(ref: str) -> Path:
+    return BLOB_DIR / ref[:2] / f"{ref}.z"
+
+
+def text_ref(text: str):
+    """The ref `text` is (or would be) stored under, without storing it; None for an empty description."""
+    text = (text or "").strip()
+    return hashlib.sha256(text.encode("utf-8")).hexdigest() if text else None
+
+
+def store(text: str):
+    """Store a description and return its ref, or None for an empty description."""
+    ref = text_ref(text)
+    if ref is None:
+        return None
+    data = text.strip().encode("utf-8")
+    path = _blob_path(ref)
+    if path.exists():
+        return ref
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_bytes(zlib.compress(data, 9))
+    os.replace(tmp, path)
+    return ref
+
+
+def load(ref: str) -> str:
+    """The description stored under `ref` ("" if it's missing)."""
+    if not ref:
+        return ""
+    try:
+        return zlib.decompress(_blob_path(ref).read_bytes()).decode("utf-8")
+    except FileNotFoundError:
+        return ""
+
+
+def export(refs, blob_dir: Path) -> int:
+    """Copy the blobs for `refs` into another store (e.g. another checkout's). Returns how many were copied."""
+    copied = missing = 0
+    for ref in set(filter(None, refs)):
+        source, target = _blob_path(ref), blob_dir / ref[:2] / f"{ref}.z"
+        if target.exists():
+            continue
+        if not source.exists():
+            missing += 1
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(f".{os.getpid()}.tmp")
+        shutil.copyfile(source, tmp)
+        os.replace(tmp, target)
+        copied += 1
+    if missing:
+        print(f"  WARNING: {missing} descriptions missing from {BLOB_DIR} — not exported")
+    return copied
+
+
+def job_description(job: dict) -> str:
+    """A job dict's description: inline if it has one, otherwise read from the store."""
+    return job.get("description") or load(job.get("description_ref"))
+
+
+def _referenced_jobs():
+    for name in REFERENCING_FILES:
+        path = SCRAPED_DIR / name
+        if path.exists():
+            yield from json.loads(path.read_text())
+    # Checkpoints of an unfinished update_queue run
+    for path in (SCRAPED_DIR / "run").glob("*.json"):
+        yield from json.loads(path.read_text()).get("fetched", [])
+    # Boards fetched by an unfinished multi_profile.py run, not yet exported to each user
+    for path in (SCRAPED_DIR / "run_multi").glob("*.json"):
+        yield from json.loads(path.read_text()).get("jobs", [])
+    # Jobs waiting for review
+    path = SCRAPED_DIR / "review_queue.jsonl"
+    if path.exists():
+        with open(path, "rb") as f:
+            for line in f:
+                if line.endswith(b"\n"):
+                    yield json.loads(line).get("job", {})
+    # Every listing in the scrape history (history.py records each job's description_ref)
+    path = SCRAPED_DIR / "history.jsonl"
+    if path.exists():
+        with open(path, "rb") as f:
+            for line in f:
+                if line.endswith(b"\n"):
+                    record = json.loads(line)
+                    for key in ("added", "changed", "checkpoint"):
+                        for url, job in record.get(key, {}).items():
+                            yield dict(job, url=url)
+    # Job pages cached by sitemap sources, reused on their next scrape
+    for path in (SCRAPED_DIR / "sitemaps").glob("*.json"):
+        for url, page in json.loads(path.read_text()).get("pages", {}).items():
+            yield dict(page, url=url)
+
+
+def _find_ref(key: str):
+    if not key.startswith("http"):
+        return key
+    for job in _referenced_jobs():
+        if job.get("url") == key:
+            return job.get("description_ref")
+    return None
+
+
+def gc() -> int:
+    """Delete blobs that no queue, snapshot or history record refers to. Returns how many were deleted."""
+    keep = {job.get("description_ref") for job in _referenced_jobs()}
+    removed = 0
+    for path in BLOB_DIR.glob("*/*.z"):
+        if path.stem not in keep:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command == "show" and len(sys.argv) > 2:
+        ref = _find_ref(sys.argv[2])
+        text = load(ref)
+        if not text:
+            print(f"No stored description for {sys.argv[2]}")
+            sys.exit(1)
+        print(text)
+    elif command == "stats":
+        blobs = list(BLOB_DIR.glob("*/*.z"))
+        stored = sum(p.stat().st_size for p in blobs)
+        print(f"{len(blobs)} descriptions, {stored / 1024:.0f} KiB on disk")
+    elif command == "gc":
+        print(f"Removed {gc()} unreferenced descriptions")
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
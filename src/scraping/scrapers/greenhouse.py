@@ -1,28 +1,23 @@
-import requests
 from datetime import datetime
+from typing import Iterator
+
 from .base import BaseScraper, Job
+from .descriptions import html_to_text
 
 
 class GreenhouseScraper(BaseScraper):
     source_type = "greenhouse"
 
-    def fetch_jobs(self) -> list[Job]:
+    def iter_jobs(self) -> Iterator[Job]:
         url = f"https://boards-api.greenhouse.io/v1/boards/{self.slug}/jobs?content=true"
-        try:
-            response = requests.get(url, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-        except Exception as e:
-            print(f"  Error fetching {self.name} (Greenhouse): {e}")
-            return []
-
-        jobs = []
-        for item in data.get("jobs", []):
+        # Streamed: with descriptions included the body can be huge, so it's never held whole,
+        # and each job is filtered and its description stored before the next is decoded
+        for item in self.stream_json(url, key="jobs"):
             location = item.get("location", {}).get("name", "Unknown")
             departments = item.get("departments", [])
             dept = departments[0]["name"] if departments else ""
 
-            jobs.append(Job(
+            yield Job(
                 title=item.get("title", "Unknown"),
                 company=self.name,
                 url=item.get("absolute_url", ""),
@@ -31,6 +26,8 @@ class GreenhouseScraper(BaseScraper):
                 posted_at=item.get("updated_at"),
                 source_type=self.source_type,
                 scraped_at=datetime.now().isoformat(),
-            ))
+                description=item.get("content", ""),
+            )
 
-        return jobs
+    def description_text(self, raw) -> str:
+        return html_to_text(raw)
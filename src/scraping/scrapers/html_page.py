@@ -0,0 +1,180 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from urllib.parse import urlencode, urljoin, urlparse, parse_qsl, urlunparse
+
+import soupsieve
+from bs4 import BeautifulSoup
+
+from .base import BaseScraper, Job
+
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"  # several times faster than the stdlib parser on large pages
+except ImportError:
+    PARSER = "html.parser"
+
+DATE_FORMATS = ["%Y-%m-%d", "%B %d, %Y", "%b %d, %Y", "%d %B %Y", "%d %b %Y", "%d/%m/%Y", "%m/%d/%Y"]
+
+
+@lru_cache(maxsize=None)
+def compile_selector(selector: str):
+    """Compile a CSS selector once; every page of every source using it reuses the result."""
+    return soupsieve.compile(selector)
+
+
+def _field(spec: str):
+    """Split "css selector@attribute" into (compiled selector or None, attribute or None)."""
+    selector, _, attribute = spec.partition("@")
+    selector = selector.strip()
+    return (compile_selector(selector) if selector else None), (attribute.strip() or None)
+
+
+def parse_date(value: str):
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).isoformat()
+    except ValueError:
+        pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+class HtmlScraper(BaseScraper):
+    """
+    Careers page scraper configured entirely in sources.json. Set slug to the
+    listing page URL and describe the page with CSS selectors:
+
+        "type": "html",
+        "slug": "https://example.com/careers",
+        "selectors": {
+            "item": "li.job",            # one element per job (required)
+            "title": "h3",               # relative to the item; default: the item's text
+            "link": "a@href",            # "selector@attribute"; default: first link in the item
+            "location": ".location",
+            "department": ".team",
+            "date": "time@datetime"
+        },
+        "pages": {"param": "page", "start": 1, "max": 5}   # optional: ?page=1..5
+
+    Listing pages are fetched concurrently; pagination ends at the first page
+    that has no items or can't be fetched (e.g. a 404 past the last page).
+    Only the first page failing is an error.
+    """
+    source_type = "html"
+
+    def __init__(self, name: str, slug: str, filters: dict, selectors: dict = None, pages: dict = None, **options):
+        super().__init__(name, slug, filters, **options)
+        selectors = selectors or {}
+        self.pages = pages or {}
+        # A bad selector is reported by fetch_jobs like a fetch error, so it only skips this source
+        self.config_error = None
+        try:
+            self.item = compile_selector(selectors["item"]) if selectors.get("item") else None
+            self.fields = {
+                field: _field(selectors[field])
+                for field in ("title", "link", "location", "department", "date") if selectors.get(field)
+            }
+        except soupsieve.SelectorSyntaxError as e:
+            self.item, self.fields, self.config_error = None, {}, e
+
+    def page_urls(self) -> list[str]:
+        param = self.pages.get("param")
+        if not param:
+            return [self.slug]
+        start = int(self.pages.get("start", 1))
+        parts = urlparse(self.slug)
+        query = dict(parse_qsl(parts.query))
+        urls = []
+        for number in range(start, start + int(self.pages.get("max", 1))):
+            query[param] = str(number)
+            urls.append(urlunparse(parts._replace(query=urlencode(query))))
+        return urls
+
+    def _fetch_page(self, url: str) -> str:
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def _try_fetch_page(self, url: str):
+        """(html, None) or (None, error), so one failed page doesn't lose the others."""
+        try:
+            return self._fetch_page(url), None
+        except Exception as e:
+            return None, e
+
+    def fetch_jobs(self) -> list[Job]:
+        if self.config_error is not None:
+            print(f"  Error fetching {self.name} (HTML): invalid selector: {self.config_error}")
+            return []
+        if self.item is None:
+            print(f"  Error: {self.name} (HTML) has no selectors.item in sources.json")
+            return []
+        urls = self.page_urls()
+        with ThreadPoolExecutor(max_workers=min(self.max_in_flight, len(urls))) as pool:
+            pages = list(pool.map(self._try_fetch_page, urls))
+
+        jobs = []
+        seen = set()
+        for number, (url, (html, error)) in enumerate(zip(urls, pages)):
+            if error is not None:
+                if number == 0:
+                    print(f"  Error fetching {self.name} (HTML): {error}")
+                    return []
+                status = getattr(getattr(error, "response", None), "status_code", None)
+                if status != 404:
+                    print(f"  {self.name} (HTML): stopped at {url} ({error}); keeping the pages before it")
+                break
+            page_jobs = self.parse(html, url)
+            if not page_jobs:
+                break
+            for job in page_jobs:
+                if job.url not in seen:
+                    seen.add(job.url)
+                    jobs.append(job)
+        return jobs
+
+    def _value(self, item, field: str) -> str:
+        if field not in self.fields:
+            return ""
+        selector, attribute = self.fields[field]
+        element = selector.select_one(item) if selector else item
+        if element is None:
+            return ""
+        if attribute:
+            return (element.get(attribute) or "").strip()
+        return " ".join(element.get_text(" ").split())
+
+    def parse(self, html: str, page_url: str) -> list[Job]:
+        soup = BeautifulSoup(html, PARSER)
+        jobs = []
+        for item in self.item.select(soup):
+            title = self._value(item, "title") if "title" in self.fields else " ".join(item.get_text(" ").split())
+
+            if "link" in self.fields:
+                selector, attribute = self.fields["link"]
+                anchor = selector.select_one(item) if selector else item
+            else:
+                attribute = None
+                anchor = item if item.name == "a" else item.find("a", href=True)
+            link = (anchor.get(attribute or "href") or "").strip() if anchor is not None else ""
+
+            if not title or not link:
+                continue
+            jobs.append(Job(
+                title=title,
+                company=self.name,
+                url=urljoin(page_url, link),
+                location=self._value(item, "location") or "Unknown",
+                department=self._value(item, "department"),
+                posted_at=parse_date(self._value(item, "date")),
+                source_type=self.source_type,
+                scraped_at=datetime.now().isoformat(),
+            ))
+        return jobs
@@ -0,0 +1,105 @@
+"""
+Incremental decoding of one JSON array out of a byte stream.
+
+Job boards return every posting in one JSON body ({"jobs": [...]} or a bare
+array), and with descriptions included that body can run to hundreds of MB.
+iter_array() yields the array's elements one at a time as the bytes arrive,
+so only the element being decoded (plus one network chunk) is ever held in
+memory. Values of the enclosing object other than the array are skipped.
+"""
+import codecs
+import json
+from typing import Iterable, Iterator
+
+WHITESPACE = " \t\n\r"
+
+_decoder = json.JSONDecoder()
+
+
+class _Buffer:
+    """Decoded text from a chunk iterator, read on demand."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = iter(chunks)
+        self.utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def more(self, at_least: int = 1) -> bool:
+        """Read at least `at_least` more characters (fewer at end of input). False at end of input."""
+        if self.eof:
+            return False
+        self.text = self.text[self.pos:]
+        self.pos = 0
+        target = len(self.text) + at_least
+        while len(self.text) < target:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                self.text += self.utf8.decode(b"", final=True)
+                self.eof = True
+                break
+            self.text += self.utf8.decode(chunk)
+        return True
+
+    def peek(self) -> str:
+        """The next non-whitespace character ("" at end of input), without consuming it."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.more():
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}", found or "", 0)
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self.text) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Incomplete: read at least as much again, so a large value costs linear time overall
+            self.more(max(len(self.text) - self.pos, 1))
+
+
+def iter_array(chunks: Iterable[bytes], key: str = None) -> Iterator:
+    """
+    Yield the elements of a JSON array from `chunks` (e.g. response.iter_content()).
+    With `key`, the body is an object and the array is its `key` member;
+    without, the body is the array itself. A missing key yields nothing.
+    """
+    buffer = _Buffer(chunks)
+    if key is not None:
+        buffer.expect("{")
+        while buffer.peek() != "}":
+            name = buffer.value()
+            buffer.expect(":")
+            if name == key:
+                break
+            buffer.value()  # some other member: decode and drop
+            if buffer.peek() == ",":
+                buffer.pos += 1
+        else:
+            return
+
+    buffer.expect("[")
+    if buffer.peek() == "]":
+        return
+    while True:
+        yield buffer.value()
+        if buffer.peek() == "]":
+            return
+        buffer.expect(",")
@@ -1,23 +1,18 @@
-import requests
 from datetime import datetime
+from typing import Iterator
+
 from .base import BaseScraper, Job
+from .descriptions import html_to_text
 
 
 class LeverScraper(BaseScraper):
     source_type = "lever"
 
-    def fetch_jobs(self) -> list[Job]:
+    def iter_jobs(self) -> Iterator[Job]:
         url = f"https://api.lever.co/v0/postings/{self.slug}?mode=json"
-        try:
-            response = requests.get(url, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-        except Exception as e:
-            print(f"  Error fetching {self.name} (Lever): {e}")
-            return []
-
-        jobs = []
-        for item in data:
+        # Streamed: with descriptions included the body can be huge, so it's never held whole,
+        # and each job is filtered and its description stored before the next is decoded
+        for item in self.stream_json(url):
             categories = item.get("categories", {})
 
             # Location: try categories.location, then allLocations list
@@ -37,7 +32,7 @@ class LeverScraper(BaseScraper):
                 except (ValueError, TypeError):
                     pass
 
-            jobs.append(Job(
+            yield Job(
                 title=item.get("text", "Unknown"),
                 company=self.name,
                 url=item.get("hostedUrl", ""),
@@ -46,6 +41,14 @@ class LeverScraper(BaseScraper):
                 posted_at=posted_at,
                 source_type=self.source_type,
                 scraped_at=datetime.now().isoformat(),
-            ))
-
-        return jobs
+                description={k: item.get(k) for k in ("descriptionPlain", "lists", "additionalPlain")},
+            )
+
+    def description_text(self, raw) -> str:
+        # Lever splits the posting into a description, titled lists (requirements etc.) and a closing part
+        parts = [raw.get("descriptionPlain") or ""]
+        for section in raw.get("lists") or []:
+            parts.append(section.get("text", ""))
+            parts.append(html_to_text(section.get("content", "")))
+        parts.append(raw.get("additionalPlain") or "")
+        return "\n\n".join(p.strip() for p in parts if p and p.strip())
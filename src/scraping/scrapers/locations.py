@@ -0,0 +1,289 @@
+"""
+Normalized job locations.
+
+Job boards write the same place many ways ("SF", "San Francisco, CA",
+"Remote - US", "Hybrid; London"). parse_location() maps a raw location
+string to canonical places (city, state, country, region) plus remote and
+hybrid flags, using the offline gazetteer in gazetteer.json. Results are
+memoized: the same few hundred strings come back on every scrape.
+
+Every parsed location has a set of exact keys: "city:london", "state:us-ca",
+"country:gb", "region:europe", "remote", "hybrid". A city carries its state,
+country and region keys too. Location filters are resolved to keys the same
+way (filter_keys), so a "UK" filter matches "London" and "Bay Area" matches
+"San Francisco, CA".
+
+    python -m src.scraping.scrapers.locations parse "SF" "Remote - US" "Hybrid; London"
+    python -m src.scraping.scrapers.locations group     # latest_scrape.json by country and city
+"""
+import json
+import re
+import sys
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass
+from functools import cached_property, lru_cache
+from pathlib import Path
+
+GAZETTEER_FILE = Path(__file__).with_name("gazetteer.json")
+LATEST_FILE = Path(__file__).resolve().parents[3] / "data" / "scraped_jobs" / "latest_scrape.json"
+
+REMOTE_RE = re.compile(r"\b(remote|anywhere|work from home|wfh|distributed)\b")
+HYBRID_RE = re.compile(r"\bhybrid\b")
+TOKEN_RE = re.compile(r"[A-Za-z0-9]+|[;/|()+&\n]")
+SEPARATORS = set(";/|()+&\n")
+MAX_WORDS = 5  # longest alias in the gazetteer, in words
+
+
+def _fold(text: str) -> str:
+    """ASCII with accents removed ("Zürich" → "Zurich"), case kept."""
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+
+
+def _alias(text: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", _fold(text).lower()))
+
+
+@dataclass(frozen=True)
+class Place:
+    city: str = None
+    state: str = None    # "US-CA"
+    country: str = None  # ISO code
+    region: str = None   # gazetteer region id
+
+    @property
+    def key(self) -> str:
+        """The most specific key: what a filter naming this place matches."""
+        if self.city:
+            return f"city:{_alias(self.city).replace(' ', '-')}"
+        if self.state:
+            return f"state:{self.state.lower()}"
+        if self.country:
+            return f"country:{self.country.lower()}"
+        return f"region:{self.region}"
+
+    def keys(self) -> set:
+        keys = {self.key}
+        if self.state:
+            keys.add(f"state:{self.state.lower()}")
+        if self.country:
+            keys.add(f"country:{self.country.lower()}")
+        if self.region:
+            keys.add(f"region:{self.region}")
+        return keys
+
+    def covers(self, other: "Place") -> bool:
+        """True if `other` is a less specific mention of the same place ("London" covers "UK")."""
+        if other == self or other.city:
+            return False
+        if other.state:
+            return self.state == other.state
+        if other.country:
+            return self.country == other.country
+        return self.region == other.region
+
+
+@dataclass(frozen=True)
+class Location:
+    places: tuple = ()
+    remote: bool = False
+    hybrid: bool = False
+
+    @cached_property
+    def keys(self) -> frozenset:
+        keys = set().union(*(place.keys() for place in self.places))
+        if self.remote:
+            keys.add("remote")
+        if self.hybrid:
+            keys.add("hybrid")
+        return frozenset(keys)
+
+    def to_dict(self) -> dict:
+        return {
+            "places": [{k: v for k, v in asdict(place).items() if v} for place in self.places],
+            "remote": self.remote,
+            "hybrid": self.hybrid,
+            "keys": sorted(self.keys),
+        }
+
+
+def _rank(candidate: tuple) -> int:
+    place = candidate[0]
+    if place.city:
+        return 0
+    if place.state:
+        return 3
+    return 1 if place.country else 2
+
+
+@lru_cache(maxsize=None)
+def _gazetteer():
+    """(alias index, capitalised-code index, raw data), built from gazetteer.json once per process.
+
+    Both indexes map to candidate readings, best first; a candidate is a tuple
+    of places (more than one for "EMEA" and the like).
+    """
+    data = json.loads(GAZETTEER_FILE.read_text())
+    countries = data["countries"]
+    aliases = defaultdict(list)
+    codes = defaultdict(list)
+
+    for name, country, state, extra in data["cities"]:
+        place = Place(city=name, state=f"{country}-{state}" if state else None,
+                      country=country, region=countries[country]["region"])
+        for alias in {_alias(name), *extra}:
+            aliases[alias].append((place,))
+    for code, country in countries.items():
+        place = Place(country=code, region=country["region"])
+        for alias in {_alias(country["name"]), *country["aliases"]}:
+            aliases[alias].append((place,))
+        codes[code].append((place,))
+    for country, states in data["states"].items():
+        for code, name in states.items():
+            place = Place(state=f"{country}-{code}", country=country, region=countries[country]["region"])
+            aliases[_alias(name)].append((place,))
+            codes[code].append((place,))
+    for region_id, region in data["regions"].items():
+        for alias in {_alias(region["name"]), *region["aliases"]}:
+            aliases[alias].append((Place(region=region_id),))
+    for alias, region_ids in data["region_groups"].items():
+        aliases[alias].append(tuple(Place(region=r) for r in region_ids))
+
+    for index in (aliases, codes):
+        for candidates in index.values():
+            candidates.sort(key=_rank)
+    return dict(aliases), dict(codes), data
+
+
+def _match(tokens: list, i: int):
+    """Longest gazetteer phrase starting at tokens[i]: (candidates, number of tokens) or (None, 1)."""
+    aliases, codes, _ = _gazetteer()
+    for n in range(min(MAX_WORDS, len(tokens) - i), 0, -1):
+        words = tokens[i:i + n]
+        if any(word in SEPARATORS for word in words):
+            continue
+        candidates = aliases.get(" ".join(words).lower(), [])
+        # "CA", "DE", "IN": codes only count in capitals, so "in" and "or" stay words
+        if n == 1 and len(words[0]) == 2 and words[0].isupper():
+            candidates = codes.get(words[0], []) + candidates
+        if candidates:
+            return candidates, n
+    return None, 1
+
+
+def _consistent(place: Place, candidate: tuple) -> bool:
+    """True if a single-place candidate just narrows down `place` ("San Francisco" then "CA")."""
+    if len(candidate) != 1 or candidate[0].city:
+        return False
+    return candidate[0].covers(place) or candidate[0] == place or place.covers(candidate[0])
+
+
+@lru_cache(maxsize=4096)
+def parse_location(raw: str) -> Location:
+    """Canonical places and remote/hybrid flags for a raw location string."""
+    text = _fold(raw or "")
+    lower = text.lower()
+    tokens = TOKEN_RE.findall(text)
+
+    places = []
+    # The place just read and its other readings (same name), so "Cambridge, MA" can pick the right one
+    current, readings = None, []
+    i = 0
+    while i < len(tokens):
+        if tokens[i] in SEPARATORS:
+            current, readings = None, []
+            i += 1
+            continue
+        candidates, length = _match(tokens, i)
+        i += length
+        if not candidates:
+            continue
+
+        if current is not None:
+            narrowed = next((r for r in readings for c in candidates if _consistent(r, c)), None)
+            if narrowed:
+                places[current] = narrowed
+                readings = [narrowed]
+                continue
+            first = candidates[0]
+            if places[current].city and len(first) == 1 and (first[0].state or first[0].country) \
+                    and not any(c[0].city for c in candidates):
+                # "London, ON": a same-named city the gazetteer doesn't have; keep the province
+                places[current] = first[0]
+                readings = [first[0]]
+                continue
+
+        chosen = candidates[0]
+        places.extend(chosen)
+        if len(chosen) == 1:
+            current = len(places) - 1
+            readings = [c[0] for c in candidates if len(c) == 1 and _rank(c) == _rank(chosen)]
+        else:
+            current, readings = None, []
+
+    unique = []
+    for place in places:
+        if place not in unique and not any(other.covers(place) for other in places):
+            unique.append(place)
+    return Location(places=tuple(unique), remote=bool(REMOTE_RE.search(lower)), hybrid=bool(HYBRID_RE.search(lower)))
+
+
+@lru_cache(maxsize=None)
+def filter_keys(term: str) -> frozenset:
+    """The keys a location filter stands for: the most specific key of each place it names."""
+    location = parse_location(term)
+    keys = {place.key for place in location.places}
+    if not keys:
+        keys = {flag for flag in ("remote", "hybrid") if getattr(location, flag)}
+    return frozenset(keys)
+
+
+def country_name(code: str) -> str:
+    return _gazetteer()[2]["countries"].get(code, {}).get("name", code)
+
+
+def group(jobs: list[dict]):
+    """Print job counts by country and city."""
+    by_country = defaultdict(Counter)
+    remote_only = unknown = 0
+    for job in jobs:
+        info = job.get("location_info") or parse_location(job.get("location", "")).to_dict()
+        if not info["places"]:
+            if info["remote"]:
+                remote_only += 1
+            else:
+                unknown += 1
+            continue
+        for place in info["places"]:
+            country = country_name(place["country"]) if place.get("country") else "(region only)"
+            by_country[country][place.get("city") or "—"] += 1
+
+    for country, cities in sorted(by_country.items(), key=lambda item: -sum(item[1].values())):
+        listed = ", ".join(f"{city} {n}" for city, n in cities.most_common())
+        print(f"{country:<24} {sum(cities.values()):>4}   {listed}")
+    print(f"{'Remote, no place':<24} {remote_only:>4}")
+    print(f"{'Not recognised':<24} {unknown:>4}")
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command == "parse" and len(sys.argv) > 2:
+        for raw in sys.argv[2:]:
+            location = parse_location(raw)
+            flags = [flag for flag in ("remote", "hybrid") if getattr(location, flag)]
+            places = "; ".join(
+                ", ".join(p for p in (place.city, place.state, place.country, place.region) if p)
+                for place in location.places
+            ) or "—"
+            print(f"{raw!r}: {places}{' [' + ', '.join(flags) + ']' if flags else ''}")
+            print(f"    {' '.join(sorted(location.keys))}")
+    elif command == "group":
+        path = Path(sys.argv[2]) if len(sys.argv) > 2 else LATEST_FILE
+        group(json.loads(path.read_text()) if path.exists() else [])
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
-import requests
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from email.utils import parsedate_to_datetime
 from .base import BaseScraper, Job
+from .descriptions import html_to_text
 
 
 class RSSScraper(BaseScraper):
@@ -12,7 +12,7 @@ class RSSScraper(BaseScraper):
     def fetch_jobs(self) -> list[Job]:
         url = self.slug  # For RSS, slug is the full feed URL
         try:
-            response = requests.get(url, timeout=15, headers={"User-Agent": "Mozilla/5.0"})
+            response = self.session.get(url, timeout=15, headers={"User-Agent": "Mozilla/5.0"})
             response.raise_for_status()
             root = ET.fromstring(response.content)
         except Exception as e:
@@ -48,6 +48,8 @@ class RSSScraper(BaseScraper):
                     except Exception:
                         pass
 
+            summary = self._text(item, ["description", "atom:summary", "atom:content"], ns)
+
             # RSS feeds rarely include structured location/dept — leave as Unknown/empty
             jobs.append(Job(
                 title=title,
@@ -58,10 +60,14 @@ class RSSScraper(BaseScraper):
                 posted_at=posted_at,
                 source_type=self.source_type,
                 scraped_at=datetime.now().isoformat(),
+                description=summary,
             ))
 
         return jobs
 
+    def description_text(self, raw) -> str:
+        return html_to_text(raw)
+
     @staticmethod
     def _text(element, tags: list, ns: dict) -> str:
         for tag in tags:
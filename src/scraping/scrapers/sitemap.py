@@ -0,0 +1,271 @@
+import gzip
+import json
+import os
+import queue
+import re
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import soupsieve
+from bs4 import BeautifulSoup
+
+from .base import BaseScraper, Job
+from .descriptions import SCRAPED_DIR, html_to_text, text_ref
+from .html_page import PARSER, _field, parse_date
+
+CACHE_DIR = SCRAPED_DIR / "sitemaps"
+PAGE_FIELDS = ("title", "location", "department", "date", "description")
+ENTRY_BUFFER = 1000  # sitemap entries parsed ahead of the one being handled
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _put(entries: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put `item` on the bounded queue, waiting for room; False if the reader has stopped."""
+    while not stop.is_set():
+        try:
+            entries.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _parse_lastmod(value: str):
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+class SitemapScraper(BaseScraper):
+    """
+    Careers site scraper driven by its sitemap. Set slug to the sitemap (or
+    sitemap index) URL, "match" to a regex that job page URLs match, and
+    selectors for the job page:
+
+        "type": "sitemap",
+        "slug": "https://example.com/sitemap.xml",
+        "match": "/careers/jobs/",
+        "selectors": {"title": "h1", "location": ".location", "department": ".team",
+                      "date": "time@datetime", "description": ".job-description"}
+
+    Sitemaps are parsed as a stream and their entries handled as they arrive,
+    with at most max_in_flight sitemaps downloading at once, so large ones
+    never sit in memory whole.
+    Only pages whose <lastmod> is after the source's last scrape date (or that
+    haven't been seen before) are fetched; the rest are served from
+    data/scraped_jobs/sitemaps/, so the full listing is still returned. Child
+    sitemaps of an index are skipped entirely when their own <lastmod> is old.
+    """
+    source_type = "sitemap"
+
+    def __init__(self, name: str, slug: str, filters: dict, match: str = "", selectors: dict = None, **options):
+        super().__init__(name, slug, filters, **options)
+        # A bad pattern or selector is reported by fetch_jobs like a fetch error, so it only skips this source
+        self.config_error = None
+        try:
+            self.match = re.compile(match) if match else None
+            self.fields = {f: _field(spec) for f, spec in (selectors or {}).items() if f in PAGE_FIELDS and spec}
+        except (re.error, soupsieve.SelectorSyntaxError) as e:
+            self.match, self.fields, self.config_error = None, {}, e
+        safe = re.sub(r"[^\w-]+", "_", name).strip("_")
+        self.cache_path = CACHE_DIR / f"{safe}.json"
+
+    def _changed(self, lastmod) -> bool:
+        return self.since is None or lastmod is None or lastmod > self.since
+
+    def _stream(self, url: str):
+        """Yield ("sitemap" | "url", loc, lastmod) from one sitemap file, parsing as it downloads."""
+        response = self.session.get(url, timeout=self.timeout, stream=True)
+        response.raise_for_status()
+        response.raw.decode_content = True
+        source = gzip.GzipFile(fileobj=response.raw) if url.endswith(".gz") else response.raw
+        try:
+            root = None
+            loc = lastmod = None
+            for event, element in ET.iterparse(source, events=("start", "end")):
+                if event == "start":
+                    if root is None:
+                        root = element
+                    continue
+                tag = _local(element.tag)
+                if tag == "loc":
+                    loc = (element.text or "").strip()
+                elif tag == "lastmod":
+                    lastmod = _parse_lastmod(element.text)
+                elif tag in ("url", "sitemap"):
+                    if loc:
+                        yield tag, loc, lastmod
+                    loc = lastmod = None
+                    # Keep memory flat on sitemaps with tens of thousands of URLs: the root
+                    # would otherwise hold on to every (cleared) entry
+                    element.clear()
+                    root.clear()
+        finally:
+            response.close()
+
+    def _page_changed(self, lastmod: str, previous: dict) -> bool:
+        if previous is None:
+            return True  # never fetched
+        if lastmod is None:
+            return False  # no way to tell; keep what we have
+        return lastmod != previous.get("lastmod") or self._changed(_parse_lastmod(lastmod))
+
+    def _job_urls(self, cache: dict):
+        """
+        Every job page listed, following sitemap indexes. Returns
+        ({page URL: lastmod or None}, {child sitemap URL: {"lastmod", "pages"}}).
+        """
+        cached_sitemaps = cache.get("sitemaps", {})
+        cached_pages = cache.get("pages", {})
+        pages, sitemaps = {}, {}
+        seen = {self.slug}
+
+        # Each sitemap is streamed by a worker onto one bounded queue, ending with (url, None),
+        # or (url, error) if it fails; child sitemaps are queued for a worker as they're found
+        entries = queue.Queue(maxsize=ENTRY_BUFFER)
+        stop = threading.Event()
+
+        def stream(sitemap_url):
+            if stop.is_set():
+                return
+            try:
+                for entry in self._stream(sitemap_url):
+                    if not _put(entries, (sitemap_url, entry), stop):
+                        return
+                _put(entries, (sitemap_url, None), stop)
+            except Exception as e:
+                _put(entries, (sitemap_url, e), stop)
+
+        pool = ThreadPoolExecutor(max_workers=self.max_in_flight)
+        try:
+            pool.submit(stream, self.slug)
+            streaming = 1
+            while streaming:
+                sitemap_url, entry = entries.get()
+                if entry is None:
+                    streaming -= 1
+                    continue
+                if isinstance(entry, Exception):
+                    raise entry
+
+                kind, loc, lastmod = entry
+                lastmod = lastmod.isoformat() if lastmod else None
+                if kind == "sitemap":
+                    if loc in seen:
+                        continue
+                    seen.add(loc)
+                    previous = cached_sitemaps.get(loc)
+                    # An unchanged child sitemap lists the same pages as last time: don't download it
+                    if previous and lastmod and not self._page_changed(lastmod, previous):
+                        sitemaps[loc] = previous
+                        for url in previous["pages"]:
+                            pages[url] = cached_pages.get(url, {}).get("lastmod")
+                    else:
+                        sitemaps[loc] = {"lastmod": lastmod, "pages": []}
+                        pool.submit(stream, loc)
+                        streaming += 1
+                elif self.match is None or self.match.search(loc):
+                    pages[loc] = lastmod
+                    if sitemap_url in sitemaps:
+                        sitemaps[sitemap_url]["pages"].append(loc)
+        finally:
+            stop.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        return pages, sitemaps
+
+    def _fetch_page(self, url: str):
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        soup = BeautifulSoup(response.text, PARSER)
+
+        values = {}
+        for field, (selector, attribute) in self.fields.items():
+            element = selector.select_one(soup) if selector else soup
+            if element is None:
+                values[field] = ""
+            elif attribute:
+                values[field] = (element.get(attribute) or "").strip()
+            elif field == "description":
+                values[field] = html_to_text(str(element))
+            else:
+                values[field] = " ".join(element.get_text(" ").split())
+
+        if not values.get("title"):
+            heading = soup.find("h1") or soup.find("title")
+            values["title"] = " ".join(heading.get_text(" ").split()) if heading else ""
+        return values
+
+    def fetch_jobs(self) -> list[Job]:
+        if self.config_error is not None:
+            print(f"  Error fetching {self.name} (sitemap): invalid match or selector: {self.config_error}")
+            return []
+        cache = json.loads(self.cache_path.read_text()) if self.cache_path.exists() else {}
+        cached_pages = cache.get("pages", {})
+        try:
+            listed, sitemaps = self._job_urls(cache)
+        except Exception as e:
+            print(f"  Error fetching {self.name} (sitemap): {e}")
+            return []
+
+        to_fetch = [url for url, lastmod in listed.items() if self._page_changed(lastmod, cached_pages.get(url))]
+        print(f"  → {len(listed)} job pages in sitemap, {len(to_fetch)} new or changed")
+
+        fetched = {}
+        failed = 0
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            futures = {url: pool.submit(self._fetch_page, url) for url in to_fetch}
+            for url, future in futures.items():
+                try:
+                    fetched[url] = future.result()
+                except Exception:
+                    failed += 1
+        if failed:
+            print(f"  {failed} job pages failed to load — using the previous copy where there is one")
+
+        pages, descriptions = {}, {}
+        for url, lastmod in listed.items():
+            previous = cached_pages.get(url)
+            values = fetched.get(url)
+            if values and values["title"]:
+                descriptions[url] = values.get("description") or None
+                pages[url] = {
+                    "lastmod": lastmod,
+                    "title": values["title"],
+                    "location": values.get("location") or "Unknown",
+                    "department": values.get("department", ""),
+                    # No date on the page: the first time we saw it is the closest thing to a posting date
+                    "posted_at": parse_date(values.get("date")) or (previous or {}).get("posted_at")
+                                 or lastmod or datetime.now(timezone.utc).isoformat(),
+                    # Only the ref goes in the cache; the text is stored by run() if the job passes the filters.
+                    # A page a filter dropped keeps a ref without a blob until it changes and is fetched again.
+                    "description_ref": text_ref(values.get("description")),
+                }
+            elif previous:
+                pages[url] = previous  # unchanged, or failed to load this time (retried next run)
+
+        self._save_cache({"sitemaps": sitemaps, "pages": pages})
+        return [
+            Job(
+                title=page["title"], company=self.name, url=url, location=page["location"],
+                department=page["department"], posted_at=page["posted_at"], source_type=self.source_type,
+                scraped_at=datetime.now().isoformat(), description_ref=page["description_ref"],
+                description=descriptions.get(url),
+            )
+            for url, page in pages.items()
+        ]
+
+    def _save_cache(self, cache: dict):
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(cache))
+        os.replace(tmp, self.cache_path)
@@ -0,0 +1,65 @@
+from datetime import datetime
+from .base import BaseScraper, Job
+from .descriptions import html_to_text
+
+POSTINGS_URL = "https://api.smartrecruiters.com/v1/companies/{slug}/postings"
+PAGE_SIZE = 100  # the API's maximum
+DESCRIPTION_SECTIONS = ("companyDescription", "jobDescription", "qualifications", "additionalInformation")
+
+
+class SmartRecruitersScraper(BaseScraper):
+    source_type = "smartrecruiters"
+
+    def fetch_jobs(self) -> list[Job]:
+        url = POSTINGS_URL.format(slug=self.slug)
+
+        def request(offset):
+            return {"url": url, "params": {"limit": PAGE_SIZE, "offset": offset}}
+
+        # The first page reports the total, so every other page can be requested at once
+        def next_requests(page):
+            if page.get("offset", 0) != 0:
+                return []
+            return [request(offset) for offset in range(PAGE_SIZE, page.get("totalFound", 0), PAGE_SIZE)]
+
+        jobs = []
+        try:
+            for page in self.paginate(request(0), next_requests):
+                jobs.extend(self._job(item) for item in page.get("content", []))
+        except Exception as e:
+            print(f"  Error fetching {self.name} (SmartRecruiters): {e}")
+            return []
+
+        return jobs
+
+    def _job(self, item: dict) -> Job:
+        loc = item.get("location") or {}
+        location = loc.get("fullLocation") or \
+            ", ".join(p for p in (loc.get("city"), loc.get("region"), loc.get("country")) if p) or "Unknown"
+        if loc.get("remote") and "remote" not in location.lower():
+            location = f"{location} (Remote)" if location != "Unknown" else "Remote"
+
+        department = (item.get("department") or {}).get("label") or (item.get("function") or {}).get("label", "")
+
+        return Job(
+            title=item.get("name", "Unknown"),
+            company=self.name,
+            url=f"https://jobs.smartrecruiters.com/{self.slug}/{item.get('id', '')}",
+            location=location,
+            department=department,
+            posted_at=item.get("releasedDate"),
+            source_type=self.source_type,
+            scraped_at=datetime.now().isoformat(),
+            # The listing has no descriptions: this is the request for the posting, made only if the job is kept
+            description={"url": f"{POSTINGS_URL.format(slug=self.slug)}/{item.get('id', '')}"},
+        )
+
+    def description_text(self, raw) -> str:
+        sections = (self.request_json(raw).get("jobAd") or {}).get("sections") or {}
+        parts = []
+        for name in DESCRIPTION_SECTIONS:
+            section = sections.get(name) or {}
+            text = html_to_text(section.get("text") or "")
+            if text:
+                parts.append(f"{section['title']}\n{text}" if section.get("title") else text)
+        return "\n\n".join(parts)
@@ -0,0 +1,61 @@
+from datetime import datetime
+from .base import BaseScraper, Job
+from .descriptions import html_to_text
+
+POSTING_URL = "https://apply.workable.com/api/v2/accounts/{slug}/jobs"
+DESCRIPTION_PARTS = ("description", "requirements", "benefits")
+
+
+class WorkableScraper(BaseScraper):
+    source_type = "workable"
+
+    def fetch_jobs(self) -> list[Job]:
+        url = f"https://apply.workable.com/api/v3/accounts/{self.slug}/jobs"
+
+        def request(token=None):
+            body = {"query": "", "location": [], "department": [], "worktype": [], "remote": []}
+            if token:
+                body["token"] = token
+            return {"method": "POST", "url": url, "json": body}
+
+        # Workable pages with a cursor: each page names the next one, so prefetch one page ahead
+        def next_requests(page):
+            return [request(page["nextPage"])] if page.get("nextPage") and page.get("results") else []
+
+        jobs = []
+        try:
+            for page in self.paginate(request(), next_requests):
+                jobs.extend(self._job(item) for item in page.get("results", []))
+        except Exception as e:
+            print(f"  Error fetching {self.name} (Workable): {e}")
+            return []
+
+        return jobs
+
+    def _job(self, item: dict) -> Job:
+        loc = item.get("location") or {}
+        location = ", ".join(p for p in (loc.get("city"), loc.get("region"), loc.get("country")) if p) or "Unknown"
+        if item.get("remote") and "remote" not in location.lower():
+            location = f"{location} (Remote)" if location != "Unknown" else "Remote"
+
+        department = item.get("department") or ""
+        if isinstance(department, list):
+            department = department[0] if department else ""
+
+        return Job(
+            title=item.get("title", "Unknown"),
+            company=self.name,
+            url=f"https://apply.workable.com/{self.slug}/j/{item.get('shortcode', '')}/",
+            location=location,
+            department=department,
+            posted_at=item.get("published"),
+            source_type=self.source_type,
+            scraped_at=datetime.now().isoformat(),
+            # The listing has no descriptions: this is the request for the posting, made only if the job is kept
+            description={"url": f"{POSTING_URL.format(slug=self.slug)}/{item.get('shortcode', '')}"},
+        )
+
+    def description_text(self, raw) -> str:
+        posting = self.request_json(raw)
+        texts = (html_to_text(posting.get(part) or "") for part in DESCRIPTION_PARTS)
+        return "\n\n".join(text for text in texts if text)
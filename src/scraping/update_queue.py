@@ -6,29 +6,55 @@ Reads per-source last-scrape dates from scrape_state.json and only includes jobs
 posted after that date. New sources must be pre-populated in scrape_state.json
 before running this script (the Run Scrapers skill handles that step).
 
+New jobs are pre-scored against the user profile (see prescore.py) before being
+written: hard-no matches are dropped and the rest are sorted best first.
+
+Progress is checkpointed per source: once a source is scraped, its jobs and its
+new last-scrape date are written atomically to data/scraped_jobs/run/. If the
+script crashes or is interrupted, running it again resumes from the first
+unfinished source. scrape_state.json and the outputs below are only written
+once every source is done, and then that run's checkpoints are cleared (an
+unfinished run over other sources keeps its own). A checkpoint no newer than
+its source's last scrape is stale and discarded; one older than a day is
+resumed with a warning.
+
 Outputs:
   data/scraped_jobs/scraped_tmp.json    — new jobs from this scrape, for Gertrudix to analyze
-                                           (Gertrudix writes to analyzed_jobs.json in Phase 2)
+                                           (categorize.py moves them to the review queue in Phase 3);
+                                           jobs still in it from before are kept, not overwritten
+  data/scraped_jobs/prescore_dropped.json — jobs dropped by pre-scoring in the last 30 days, with the
+                                           reason and date (appended to on every run)
   data/scraped_jobs/latest_scrape.json  — full results of this scrape, used by the skill
-                                           for stale detection against analyzed_jobs.json
+                                           for stale detection against the review queue
   data/scraped_jobs/scrape_state.json   — updated last-scrape date per source
+  data/scraped_jobs/history.jsonl       — what changed per source since its last scrape (see history.py)
 
 Usage:
     python src/scraping/update_queue.py                            # all sources
     python src/scraping/update_queue.py --sources "Anthropic"      # one source
     python src/scraping/update_queue.py --sources "Anthropic,Mistral"  # multiple
+    python src/scraping/update_queue.py --min-prescore 0.05         # also drop weak matches
+    python src/scraping/update_queue.py --no-prescore               # keep everything
+    python src/scraping/update_queue.py --fresh                     # discard the sources' unfinished checkpoints
 """
 import argparse
+import hashlib
 import json
-from datetime import datetime, timezone
+import os
+import re
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from run_scrapers import SCRAPER_MAP
+from history import record_run
+from prescore import DROPPED_FILE, prescore_jobs, record_dropped
+from run_scrapers import SCRAPER_MAP, make_scraper
 
 SOURCES_FILE = Path("src/scraping/sources.json")
 STATE_FILE = Path("data/scraped_jobs/scrape_state.json")
 TMP_FILE = Path("data/scraped_jobs/scraped_tmp.json")
 LATEST_FILE = Path("data/scraped_jobs/latest_scrape.json")
+RUN_DIR = Path("data/scraped_jobs/run")
+CHECKPOINT_MAX_AGE = timedelta(days=1)  # resuming from older checkpoints prints a warning
 
 
 def load_json(path: Path, default):
@@ -36,8 +62,14 @@ def load_json(path: Path, default):
 
 
 def save_json(path: Path, data):
+    """Write atomically: a crash leaves either the old file or the new one, never half of it."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, indent=2))
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
 
 
 def parse_dt(s: str) -> datetime:
@@ -45,12 +77,91 @@ def parse_dt(s: str) -> datetime:
     return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
 
 
+def checkpoint_path(name: str) -> Path:
+    safe = re.sub(r"[^\w-]+", "_", name).strip("_")[:40]
+    return RUN_DIR / f"{safe}-{hashlib.sha1(name.encode()).hexdigest()[:8]}.json"
+
+
+def load_checkpoints(state: dict) -> dict:
+    """
+    Completed sources from an unfinished run: {name: {"state", "fetched", "new"}}.
+    A checkpoint no newer than its source's last-scrape date in `state` is left
+    over from a run that a later scrape has already superseded; it is deleted.
+    """
+    checkpoints = {}
+    now = datetime.now(timezone.utc)
+    for path in sorted(RUN_DIR.glob("*.json")) if RUN_DIR.exists() else []:
+        try:
+            checkpoint = json.loads(path.read_text())
+        except json.JSONDecodeError:
+            continue  # can't happen with atomic writes, but never trust a partial file
+        name, taken = checkpoint["name"], parse_dt(checkpoint["state"])
+        last_scrape = state.get(name)
+        if last_scrape and taken <= parse_dt(last_scrape):
+            print(f"  Discarding checkpoint for '{name}' from {taken:%Y-%m-%d %H:%M}: "
+                  f"the source was scraped since")
+            path.unlink()
+            continue
+        if now - taken > CHECKPOINT_MAX_AGE:
+            print(f"  WARNING: resuming '{name}' from a checkpoint taken {(now - taken).days} days ago "
+                  f"(use --fresh to scrape it again)")
+        checkpoints[name] = checkpoint
+    return checkpoints
+
+
+def clear_checkpoints(names) -> None:
+    """Delete the checkpoints of these sources, leaving other sources' unfinished ones."""
+    for name in names:
+        checkpoint_path(name).unlink(missing_ok=True)
+    if RUN_DIR.exists() and not any(RUN_DIR.iterdir()):
+        RUN_DIR.rmdir()
+
+
+def posted_since(jobs: list, last_scrape_dt: datetime) -> list:
+    """The jobs posted after the last scrape date."""
+    # TODO: Jobs with no posted_at are included on every scrape since we can't
+    # date-filter them. In practice Greenhouse/Lever/Ashby/80k all provide dates
+    # reliably, so this is rare — revisit if it becomes an issue.
+    filtered = []
+    for j in jobs:
+        if not j.posted_at:
+            filtered.append(j)  # no date — include, can't filter
+            continue
+        try:
+            if parse_dt(j.posted_at) > last_scrape_dt:
+                filtered.append(j)
+        except Exception:
+            filtered.append(j)  # unparseable date — include to be safe
+    return filtered
+
+
+def scrape_source(source: dict, last_scrape_dt: datetime):
+    """Fetch one source. Returns (all fetched job dicts, job dicts posted since the last scrape)."""
+    name = source["name"]
+    source_type = source["type"]
+
+    print(f"Fetching {name} ({source_type})...")
+    scraper = make_scraper(source, since=last_scrape_dt)
+    jobs = scraper.run()
+    print(f"  → {len(jobs)} jobs fetched")
+
+    filtered = posted_since(jobs, last_scrape_dt)
+    print(f"  → {len(filtered)} posted since last scrape (filtered from {len(jobs)})")
+    return [j.to_dict() for j in jobs], [j.to_dict() for j in filtered]
+
+
 def main():
     parser = argparse.ArgumentParser(description="Scrape sources and write new jobs to scraped_tmp.json")
     parser.add_argument(
         "--sources", type=str, default=None,
         help="Comma-separated source names to scrape (default: all)"
     )
+    parser.add_argument(
+        "--min-prescore", type=float, default=0.0,
+        help="Drop new jobs whose profile match score is below this (default: 0, only hard nos are dropped)"
+    )
+    parser.add_argument("--no-prescore", action="store_true", help="Skip pre-scoring against the profile")
+    parser.add_argument("--fresh", action="store_true", help="Discard the selected sources' checkpoints instead of resuming them")
     args = parser.parse_args()
     requested = {s.strip() for s in args.sources.split(",")} if args.sources else None
 
@@ -65,68 +176,77 @@ def main():
         print("No matching sources found. Check source names in src/scraping/sources.json.")
         return
 
-    now = datetime.now(timezone.utc)
-    new_jobs = []
-    full_scrape = []  # all fetched jobs across sources (for latest_scrape.json)
-
-    for source in sources_to_run:
-        name = source["name"]
-        source_type = source["type"]
-        slug = source["slug"]
-        filters = source.get("filters", {})
-
-        last_scrape_str = state.get(name)
-        if last_scrape_str is None:
-            # Should not happen — skill pre-populates scrape_state.json before running
-            print(f"  WARNING: No scrape date found for '{name}'. Run via the skill to set one first.")
-            continue
-
-        last_scrape_dt = parse_dt(last_scrape_str)
+    if args.fresh:
+        clear_checkpoints(s["name"] for s in sources_to_run)
+    checkpoints = load_checkpoints(state)
+    resumed = [s["name"] for s in sources_to_run if s["name"] in checkpoints]
+    if resumed:
+        print(f"Resuming unfinished run — {len(resumed)} of {len(sources_to_run)} sources already done "
+              f"(use --fresh to start over)\n")
 
-        scraper_class = SCRAPER_MAP.get(source_type)
-        if not scraper_class:
-            print(f"  Unknown type '{source_type}' for {name} — skipping")
-            continue
+    now = datetime.now(timezone.utc)
 
-        print(f"Fetching {name} ({source_type})...")
-        scraper = scraper_class(name=name, slug=slug, filters=filters)
-        jobs = scraper.run()
-        print(f"  → {len(jobs)} jobs fetched")
-
-        full_scrape.extend(j.to_dict() for j in jobs)
-
-        # Filter to jobs posted after the last scrape date.
-        # TODO: Jobs with no posted_at are included on every scrape since we can't
-        # date-filter them. In practice Greenhouse/Lever/Ashby/80k all provide dates
-        # reliably, so this is rare — revisit if it becomes an issue.
-        before = len(jobs)
-        filtered = []
-        for j in jobs:
-            if not j.posted_at:
-                filtered.append(j)  # no date — include, can't filter
+    try:
+        for source in sources_to_run:
+            name = source["name"]
+            if name in checkpoints:
                 continue
-            try:
-                if parse_dt(j.posted_at) > last_scrape_dt:
-                    filtered.append(j)
-            except Exception:
-                filtered.append(j)  # unparseable date — include to be safe
 
-        jobs = filtered
-        print(f"  → {len(jobs)} posted since last scrape (filtered from {before})")
+            last_scrape_str = state.get(name)
+            if last_scrape_str is None:
+                # Should not happen — skill pre-populates scrape_state.json before running
+                print(f"  WARNING: No scrape date found for '{name}'. Run via the skill to set one first.")
+                continue
 
-        new_jobs.extend(jobs)
+            if source["type"] not in SCRAPER_MAP:
+                print(f"  Unknown type '{source['type']}' for {name} — skipping")
+                continue
 
-        # Update this source's last-scrape date
-        state[name] = now.isoformat()
+            fetched, new = scrape_source(source, parse_dt(last_scrape_str))
 
-    new_dicts = [j.to_dict() for j in new_jobs]
+            # Jobs and the source's new last-scrape date are committed together, in one file
+            checkpoint = {"name": name, "state": now.isoformat(), "fetched": fetched, "new": new}
+            save_json(checkpoint_path(name), checkpoint)
+            checkpoints[name] = checkpoint
+    except KeyboardInterrupt:
+        done = sum(1 for s in sources_to_run if s["name"] in checkpoints)
+        print(f"\nInterrupted — {done} of {len(sources_to_run)} sources saved. Run again to resume.")
+        raise SystemExit(130)
 
+    new_dicts = []
+    full_scrape = []  # all fetched jobs across sources (for latest_scrape.json)
+    for source in sources_to_run:
+        checkpoint = checkpoints.get(source["name"])
+        if checkpoint:
+            new_dicts.extend(checkpoint["new"])
+            full_scrape.extend(checkpoint["fetched"])
+            state[source["name"]] = checkpoint["state"]
+
+    # Jobs categorize.py hasn't managed to categorize yet stay, with the new ones added
+    leftover = load_json(TMP_FILE, [])
+    if leftover:
+        seen = {job.get("url") for job in leftover}
+        new_dicts = leftover + [job for job in new_dicts if job["url"] not in seen]
+
+    dropped = []
+    if not args.no_prescore:
+        new_dicts, dropped = prescore_jobs(new_dicts, min_score=args.min_prescore)
+
+    # State last: if this is interrupted, the checkpoints are still there and the next run redoes only this step
     save_json(TMP_FILE, new_dicts)
+    record_dropped(dropped)
     save_json(LATEST_FILE, full_scrape)
+    record_run({
+        s["name"]: checkpoints[s["name"]]["fetched"] for s in sources_to_run if s["name"] in checkpoints
+    })
     save_json(STATE_FILE, state)
+    # Only this run's sources: an unfinished run over other sources keeps its checkpoints
+    clear_checkpoints(s["name"] for s in sources_to_run)
 
     print(f"\n{'=' * 45}")
-    print(f"New jobs to analyze     : {len(new_dicts)}")
+    print(f"New jobs to analyze     : {len(new_dicts)}" + (f" (incl. {len(leftover)} left over)" if leftover else ""))
+    if dropped:
+        print(f"Dropped by pre-scoring  : {len(dropped)} (see {DROPPED_FILE})")
     print(f"Saved to                : {TMP_FILE}")
     print(f"Full scrape saved to    : {LATEST_FILE}")
 
@@ -1,11 +1,14 @@
+import asyncio
 import os
 import logging
 from datetime import datetime
-from pathlib import Path
 from dotenv import load_dotenv
 from telegram import Update
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
 
+from inbox import InboxLog, inbox_dir
+from triage import Triage
+
 load_dotenv()
 
 # Enable logging
@@ -15,12 +18,90 @@ logging.basicConfig(
 )
 
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
-INBOX_DIR = Path(__file__).parent.parent.parent / "data" / "telegram_inbox"
-
-
-def ensure_inbox_exists():
-    """Create inbox directory if it doesn't exist."""
-    INBOX_DIR.mkdir(parents=True, exist_ok=True)
+# Bot API server; override only to point the bot at a local stand-in
+TELEGRAM_API_BASE_URL = os.getenv("TELEGRAM_API_BASE_URL")
+
+# Webhook mode (see run_webhook)
+WEBHOOK_URL = os.getenv("TELEGRAM_WEBHOOK_URL")
+WEBHOOK_SECRET = os.getenv("TELEGRAM_WEBHOOK_SECRET")
+WEBHOOK_LISTEN = os.getenv("TELEGRAM_WEBHOOK_LISTEN", "127.0.0.1")
+WEBHOOK_PORT = int(os.getenv("TELEGRAM_WEBHOOK_PORT", "8443"))
+WEBHOOK_PATH = os.getenv("TELEGRAM_WEBHOOK_PATH", "telegram")
+WEBHOOK_MAX_CONNECTIONS = int(os.getenv("TELEGRAM_WEBHOOK_MAX_CONNECTIONS", "40"))
+
+# Most captures a single disk flush may cover during a burst
+MAX_BATCH = 100
+
+
+class InboxWriter:
+    """Persists captures on a dedicated task so handlers never block on disk.
+
+    Handlers enqueue a capture and wait for its future. The writer takes
+    everything queued so far, appends it with one write + fsync (in a worker
+    thread), then resolves the futures. Messages that arrive while a flush
+    is in progress are committed together in the next one.
+    """
+
+    def __init__(self, inbox: InboxLog, max_batch: int = MAX_BATCH):
+        self.inbox = inbox
+        self.max_batch = max_batch
+        self.queue = asyncio.Queue()
+        self.task = None
+
+    async def save(self, text: str, date: datetime, **fields) -> dict:
+        """Queue a capture; returns its entry once it is durable on disk."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put(({"text": text, "date": date, **fields}, future))
+        return await future
+
+    async def run(self):
+        stopping = False
+        while not stopping:
+            item = await self.queue.get()
+            if item is None:
+                break
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    item = self.queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                await self._commit(batch)
+            except Exception:
+                # Whatever went wrong, keep writing: later saves would otherwise wait forever
+                logging.exception("Inbox writer failed on a batch")
+
+    async def _commit(self, batch):
+        try:
+            entries = await asyncio.to_thread(self.inbox.append_many, [capture for capture, _ in batch])
+        except Exception as e:
+            logging.exception("Failed to write inbox batch")
+            for _, future in batch:
+                if not future.done():  # the handler may have been cancelled (timeout, shutdown)
+                    future.set_exception(e)
+        else:
+            for entry, (_, future) in zip(entries, batch):
+                if not future.done():
+                    future.set_result(entry)
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Flush whatever is still queued, then stop."""
+        if self.task:
+            await self.queue.put(None)
+            await self.task
+
+
+writer = InboxWriter(InboxLog(inbox_dir()))
+triage = Triage()
 
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -35,33 +116,28 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def save_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Save any text message to inbox."""
     logging.info(f"Received message from {update.effective_user.id}: {update.message.text[:50]}...")
-    ensure_inbox_exists()
-
-    now = datetime.now()
-    timestamp = now.strftime("%Y-%m-%d_%H-%M")
-    filename = f"{timestamp}_message.md"
+    try:
+        # classify() may re-read the vocabulary file, so keep it off the event loop
+        suggestion = await asyncio.to_thread(triage.classify, update.message.text)
+    except Exception:
+        logging.exception("Pre-triage failed")
+        suggestion = None
+
+    try:
+        await writer.save(update.message.text, datetime.now(), triage=suggestion)
+    except Exception:
+        await update.message.reply_text("✗ Couldn't save that — please send it again")
+        return
 
-    # Handle duplicate filenames within same minute
-    filepath = INBOX_DIR / filename
-    counter = 1
-    while filepath.exists():
-        filename = f"{timestamp}_message_{counter}.md"
-        filepath = INBOX_DIR / filename
-        counter += 1
-
-    # Create markdown content
-    content = f"""# Quick Capture
-
-**Date:** {now.strftime("%Y-%m-%d %H:%M")}
+    await update.message.reply_text("✓ Saved for morning review")
 
----
 
-{update.message.text}
-"""
+async def _start_writer(app: Application):
+    writer.start()
 
-    filepath.write_text(content, encoding='utf-8')
 
-    await update.message.reply_text("✓ Saved for morning review")
+async def _stop_writer(app: Application):
+    await writer.stop()
 
 
 def create_bot() -> Application:
@@ -69,7 +145,18 @@ def create_bot() -> Application:
     if not TELEGRAM_BOT_TOKEN:
         raise ValueError("TELEGRAM_BOT_TOKEN not set in .env")
 
-    app = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+    # Handle updates concurrently so a burst of messages is committed in a
+    # few group writes instead of one fsync per message
+    builder = (
+        Application.builder()
+        .token(TELEGRAM_BOT_TOKEN)
+        .concurrent_updates(True)
+        .post_init(_start_writer)
+        .post_shutdown(_stop_writer)
+    )
+    if TELEGRAM_API_BASE_URL:
+        builder = builder.base_url(f"{TELEGRAM_API_BASE_URL}/bot").base_file_url(f"{TELEGRAM_API_BASE_URL}/file/bot")
+    app = builder.build()
 
     # Add handlers
     app.add_handler(CommandHandler("start", start))
@@ -79,7 +166,33 @@ def create_bot() -> Application:
 
 
 def run():
-    """Run the bot."""
+    """Run the bot (long polling)."""
     print("Starting Gertrudix Telegram bot...")
     app = create_bot()
     app.run_polling(allowed_updates=Update.ALL_TYPES)
+
+
+def run_webhook():
+    """Run the bot in webhook mode.
+
+    Telegram pushes updates to TELEGRAM_WEBHOOK_URL, which must reach the
+    local listener on TELEGRAM_WEBHOOK_LISTEN:TELEGRAM_WEBHOOK_PORT (usually
+    through a reverse proxy that terminates HTTPS). Requests without the
+    matching TELEGRAM_WEBHOOK_SECRET header are rejected.
+    """
+    if not WEBHOOK_URL:
+        raise ValueError("TELEGRAM_WEBHOOK_URL not set in .env")
+    if not WEBHOOK_SECRET:
+        raise ValueError("TELEGRAM_WEBHOOK_SECRET not set in .env")
+
+    print(f"Starting Gertrudix Telegram bot (webhook on {WEBHOOK_LISTEN}:{WEBHOOK_PORT}/{WEBHOOK_PATH})...")
+    app = create_bot()
+    app.run_webhook(
+        listen=WEBHOOK_LISTEN,
+        port=WEBHOOK_PORT,
+        url_path=WEBHOOK_PATH,
+        webhook_url=f"{WEBHOOK_URL.rstrip('/')}/{WEBHOOK_PATH}",
+        secret_token=WEBHOOK_SECRET,
+        max_connections=WEBHOOK_MAX_CONNECTIONS,
+        allowed_updates=Update.ALL_TYPES,
+    )
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Append-only inbox log for Telegram captures.
+
+Every message is one JSON line in data/telegram_inbox/inbox.jsonl with a
+monotonically increasing id. Reading is driven by a processed cursor
+(inbox_cursor.json: last processed id + byte offset), so listing what's left
+is a single sequential read from the cursor to the end of the file.
+
+Readers never modify the log; an incomplete last line (a capture still
+being written) is skipped. Writers append under an exclusive flock and
+number their entries from the last id in the file, so the bot and
+`import-markdown` can run at the same time. A torn line left by a writer
+that crashed mid-append is cut off by the next writer.
+
+With TELEGRAM_INBOX_MARKDOWN=1 each capture is also exported as a markdown
+file (the old one-file-per-message format). TELEGRAM_INBOX_DIR points the
+log somewhere other than data/telegram_inbox/ (e.g. a scratch directory for
+the webhook stand-in).
+
+Usage:
+    python src/telegram/inbox.py list            # unprocessed messages as JSON
+    python src/telegram/inbox.py done ID         # mark everything up to ID as processed
+    python src/telegram/inbox.py import-markdown # move legacy .md captures into the log
+"""
+import fcntl
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+INBOX_DIR = Path(__file__).parent.parent.parent / "data" / "telegram_inbox"
+LOG_NAME = "inbox.jsonl"
+CURSOR_NAME = "inbox_cursor.json"
+
+MARKDOWN_TEMPLATE = """# Quick Capture
+
+**Date:** {date}
+
+---
+
+{text}
+"""
+
+
+def inbox_dir() -> Path:
+    """The inbox directory: TELEGRAM_INBOX_DIR if set, otherwise data/telegram_inbox/."""
+    override = os.getenv("TELEGRAM_INBOX_DIR")
+    return Path(override).expanduser() if override else INBOX_DIR
+
+
+class InboxLog:
+    def __init__(self, directory: Path = None, markdown_export: bool = None):
+        if directory is None:
+            directory = inbox_dir()
+        self.directory = directory
+        self.log_path = directory / LOG_NAME
+        self.cursor_path = directory / CURSOR_NAME
+        if markdown_export is None:
+            markdown_export = os.getenv("TELEGRAM_INBOX_MARKDOWN", "") == "1"
+        self.markdown_export = markdown_export
+
+        directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _last_line(f) -> tuple[int, bytes]:
+        """(end of the last complete line, that line) for an open log; (0, b"") if there is none."""
+        size = f.seek(0, os.SEEK_END)
+        # Read backwards just far enough to find the last complete line
+        block = 4096
+        tail = b""
+        pos = size
+        while pos > 0 and tail.count(b"\n") < 2:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+
+        cut = tail.rfind(b"\n") + 1  # 0 if there is no complete line in the tail
+        lines = tail[:cut].splitlines()
+        return pos + cut, (lines[-1] if lines else b"")
+
+    def _read_cursor(self) -> dict:
+        if self.cursor_path.exists():
+            return json.loads(self.cursor_path.read_text())
+        return {"processed_id": 0, "offset": 0}
+
+    def _write_cursor(self, cursor: dict):
+        tmp = self.cursor_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(cursor))
+        tmp.replace(self.cursor_path)
+
+    def _export_markdown(self, entry: dict):
+        date = datetime.fromisoformat(entry["date"])
+        filename = f"{date.strftime('%Y-%m-%d_%H-%M')}_message_{entry['id']}.md"
+        content = MARKDOWN_TEMPLATE.format(date=date.strftime("%Y-%m-%d %H:%M"), text=entry["text"])
+        (self.directory / filename).write_text(content, encoding="utf-8")
+
+    def append(self, text: str, date: datetime = None, **fields) -> dict:
+        """Append one capture and return its entry (with the assigned id)."""
+        return self.append_many([{"text": text, "date": date, **fields}])[0]
+
+    def append_many(self, captures: list[dict]) -> list[dict]:
+        """Append several captures with a single write and fsync.
+
+        Each capture is a dict with "text", optional "date" (datetime) and any
+        extra fields to store. Returns the entries once they are on disk.
+        """
+        # Writers (the bot, import-markdown) take turns under an exclusive lock, and
+        # each numbers its entries from the last id on disk, not from memory
+        with open(self.log_path, "ab+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                end, last = self._last_line(f)
+                if end < f.seek(0, os.SEEK_END):
+                    f.truncate(end)  # torn line from a writer that crashed mid-append
+                next_id = json.loads(last)["id"] + 1 if last else 1
+
+                entries = []
+                for capture in captures:
+                    capture = dict(capture)
+                    date = capture.pop("date", None) or datetime.now()
+                    entries.append({
+                        "id": next_id + len(entries),
+                        "date": date.isoformat(timespec="seconds"),
+                        "text": capture.pop("text"),
+                        **capture,
+                    })
+
+                f.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries).encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+        if self.markdown_export:
+            for entry in entries:
+                self._export_markdown(entry)
+        return entries
+
+    def unprocessed(self) -> list[dict]:
+        """All entries after the processed cursor, oldest first."""
+        if not self.log_path.exists():
+            return []
+        cursor = self._read_cursor()
+        with open(self.log_path, "rb") as f:
+            f.seek(cursor["offset"])
+            return [json.loads(line) for line in f if line.endswith(b"\n")]
+
+    def mark_processed(self, entry_id: int) -> int:
+        """Advance the cursor past every entry with id <= entry_id. Returns how many were marked."""
+        cursor = self._read_cursor()
+        marked = 0
+        with open(self.log_path, "rb") as f:
+            f.seek(cursor["offset"])
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                entry = json.loads(line)
+                if entry["id"] > entry_id:
+                    break
+                cursor = {"processed_id": entry["id"], "offset": cursor["offset"] + len(line)}
+                marked += 1
+
+        if marked:
+            self._write_cursor(cursor)
+        return marked
+
+    def import_markdown(self) -> int:
+        """Move legacy one-file-per-message captures into the log, oldest first."""
+        files = sorted(self.directory.glob("*_message*.md"))
+        export, self.markdown_export = self.markdown_export, False
+        try:
+            self._import_files(files)
+        finally:
+            self.markdown_export = export
+        return len(files)
+
+    def _import_files(self, files):
+        for path in files:
+            content = path.read_text(encoding="utf-8")
+            text = content.split("---", 1)[-1].strip()
+            stamp = path.name.split("_message")[0]
+            try:
+                date = datetime.strptime(stamp, "%Y-%m-%d_%H-%M")
+            except ValueError:
+                date = datetime.fromtimestamp(path.stat().st_mtime)
+            self.append(text, date)
+            path.unlink()
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("list", "done", "import-markdown"):
+        print(__doc__)
+        sys.exit(1)
+
+    inbox = InboxLog(markdown_export=False)
+    command = sys.argv[1]
+
+    if command == "list":
+        print(json.dumps(inbox.unprocessed(), indent=2, ensure_ascii=False))
+    elif command == "done":
+        if len(sys.argv) < 3:
+            print("Usage: python src/telegram/inbox.py done ID")
+            sys.exit(1)
+        marked = inbox.mark_processed(int(sys.argv[2]))
+        print(f"Marked {marked} message(s) as processed")
+    else:
+        print(f"Imported {inbox.import_markdown()} markdown capture(s)")
+
+
+if __name__ == "__main__":
+    main()
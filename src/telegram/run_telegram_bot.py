@@ -1,7 +1,21 @@
 #!/usr/bin/env python3
-"""Run the Gertrudix Telegram bot."""
+"""Run the Gertrudix Telegram bot.
 
-from bot import run
+Usage:
+    python src/telegram/run_telegram_bot.py            # long polling
+    python src/telegram/run_telegram_bot.py --webhook  # webhook mode (TELEGRAM_WEBHOOK_* in .env)
+"""
+
+import argparse
+
+from bot import run, run_webhook
 
 if __name__ == "__main__":
-    run()
+    parser = argparse.ArgumentParser(description="Run the Gertrudix Telegram bot")
+    parser.add_argument("--webhook", action="store_true", help="Receive updates via webhook instead of polling")
+    args = parser.parse_args()
+
+    if args.webhook:
+        run_webhook()
+    else:
+        run()
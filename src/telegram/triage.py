@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Rule-based pre-triage of Telegram captures.
+
+Tags each message with a likely action (todo, weekly_plan, contact,
+application) and the fields it could extract (category, day, contact,
+company, url), so inbox processing starts from a suggestion instead of
+from scratch. Runs at capture time in the bot; the tag is stored on the
+inbox entry under "triage".
+
+Category names and contact names come from Notion, cached in
+data/telegram_inbox/vocabulary.json. Refresh the cache (and print the
+current to-do categories) from the repo root with:
+
+    python -m src.telegram.triage refresh
+    python -m src.telegram.triage classify "Coffee with Jane Doe on Tuesday"
+"""
+import json
+import re
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+VOCABULARY_PATH = Path(__file__).parent.parent.parent / "data" / "telegram_inbox" / "vocabulary.json"
+
+DAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+URL_RE = re.compile(r"https?://\S+")
+JOB_URL_RE = re.compile(
+    r"https?://(?:[\w-]+\.)*(?:greenhouse\.io|lever\.co|ashbyhq\.com|workable\.com|smartrecruiters\.com)"
+    r"/(?:[\w-]+/)*?(?P<slug>[\w-]+)"
+    r"|https?://\S*/(?:careers|jobs?)/\S*",
+    re.IGNORECASE,
+)
+APPLICATION_RE = re.compile(
+    r"\b(apply|applying|application|applied|role|position|opening|vacanc(?:y|ies)|hiring|job post(?:ing)?|cover letter)\b",
+    re.IGNORECASE,
+)
+CONTACT_RE = re.compile(
+    r"\b(met|meet|talked to|spoke (?:to|with)|chat(?:ted)? with|coffee with|call with|intro(?:duced?)? (?:to|me to)?|"
+    r"reach out to|connect with|follow[ -]?up with|ping|email|message|dm|linkedin|referr(?:al|ed))\b",
+    re.IGNORECASE,
+)
+# A capitalised name right after a contact verb: "coffee with Jane Doe"
+NAME_AFTER_VERB_RE = re.compile(
+    r"\b(?:with|to|met|ping|email|message)\s+(?P<name>[A-Z][a-z]+(?:\s+[A-Z][a-z]+){0,2})"
+)
+URGENT_RE = re.compile(
+    r"\b(today|tonight|tomorrow|this week|asap|urgent|deadline|due|by (?:eod|end of (?:day|week)))\b",
+    re.IGNORECASE,
+)
+DAY_RE = re.compile(r"\b(" + "|".join(DAYS) + r")\b", re.IGNORECASE)
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Which category to suggest for an action, matched against the user's category names
+ACTION_CATEGORY_HINTS = {
+    "application": ["application", "apply"],
+    "contact": ["network", "contact", "people"],
+}
+STOPWORDS = {"and", "the", "for", "with", "other", "fit", "in", "of", "to", "a"}
+
+
+def _words(text):
+    return set(WORD_RE.findall(text.lower()))
+
+
+class Triage:
+    """Classifier whose vocabulary reloads whenever vocabulary.json changes."""
+
+    def __init__(self, vocabulary_path: Path = VOCABULARY_PATH):
+        self.vocabulary_path = vocabulary_path
+        self._mtime = None
+        self.categories = []
+        self.contacts = []
+        self._contact_re = None
+        self._contacts_by_alias = {}
+        self._lock = threading.Lock()  # the bot classifies from worker threads
+
+    def _load(self):
+        with self._lock:
+            self._reload()
+
+    def _reload(self):
+        try:
+            mtime = self.vocabulary_path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+
+        vocabulary = json.loads(self.vocabulary_path.read_text())
+        self.categories = vocabulary.get("categories", [])
+        self.contacts = vocabulary.get("contacts", [])
+
+        # Match full names, plus first names that belong to only one contact
+        aliases = {}
+        first_names = {}
+        for contact in self.contacts:
+            name = contact["name"].strip()
+            if not name:
+                continue
+            aliases[name.lower()] = contact
+            first = name.split()[0].lower()
+            first_names.setdefault(first, []).append(contact)
+        for first, matches in first_names.items():
+            if len(matches) == 1 and len(first) >= 3:
+                aliases.setdefault(first, matches[0])
+
+        self._contacts_by_alias = aliases
+        self._contact_re = None
+        if aliases:
+            alternation = "|".join(re.escape(a) for a in sorted(aliases, key=len, reverse=True))
+            self._contact_re = re.compile(rf"\b({alternation})\b", re.IGNORECASE)
+        self._mtime = mtime
+
+    def _suggest_category(self, text, action):
+        if not self.categories:
+            return None
+        words = _words(text)
+
+        best, best_score = None, 0
+        for category in self.categories:
+            score = len((_words(category) - STOPWORDS) & words)
+            if score > best_score:
+                best, best_score = category, score
+        if best:
+            return best
+
+        for hint in ACTION_CATEGORY_HINTS.get(action, []):
+            for category in self.categories:
+                if hint in category.lower():
+                    return category
+        return None
+
+    def classify(self, text: str) -> dict:
+        """Return {"action", "confidence", "fields", "signals"} for a capture."""
+        self._load()
+        scores = {"todo": 0.5, "weekly_plan": 0.0, "contact": 0.0, "application": 0.0}
+        fields = {}
+        signals = []
+
+        job_url = JOB_URL_RE.search(text)
+        if job_url:
+            scores["application"] += 2
+            fields["url"] = URL_RE.match(text, job_url.start()).group(0)
+            if job_url.group("slug"):
+                fields["company"] = job_url.group("slug").replace("-", " ").title()
+            signals.append("job_url")
+        elif URL_RE.search(text):
+            fields["url"] = URL_RE.search(text).group(0)
+
+        if APPLICATION_RE.search(text):
+            scores["application"] += 1
+            signals.append("application_keyword")
+
+        if self._contact_re:
+            match = self._contact_re.search(text)
+            if match:
+                contact = self._contacts_by_alias[match.group(1).lower()]
+                fields["contact"] = contact["name"]
+                if contact.get("id"):
+                    fields["contact_id"] = contact["id"]
+                scores["contact"] += 1.5
+                signals.append("known_contact")
+
+        if CONTACT_RE.search(text):
+            scores["contact"] += 1
+            signals.append("contact_verb")
+            if "contact" not in fields:
+                name = NAME_AFTER_VERB_RE.search(text)
+                if name and name.group("name").lower() not in DAYS:
+                    fields["contact"] = name.group("name")
+                    scores["contact"] += 0.5
+
+        day = DAY_RE.search(text)
+        if day:
+            fields["day"] = day.group(1).capitalize()
+            scores["weekly_plan"] += 1.5
+            signals.append("day")
+        if URGENT_RE.search(text):
+            scores["weekly_plan"] += 1
+            signals.append("urgent")
+
+        action = max(scores, key=scores.get)
+        total = sum(scores.values())
+        confidence = round(scores[action] / total, 2) if total else 0.0
+
+        if action == "todo" and len(text.split()) < 3:
+            action = "unclear"
+
+        # Weekly-plan items go under a day, not a category
+        category = self._suggest_category(text, action)
+        if category and action in ("todo", "application", "contact"):
+            fields["category"] = category
+
+        return {"action": action, "confidence": confidence, "fields": fields, "signals": signals}
+
+
+def refresh_vocabulary(path: Path = VOCABULARY_PATH) -> dict:
+    """Fetch to-do categories and contact names from Notion into the vocabulary cache."""
+    from src.notion.client import get_contacts, get_todo_page
+
+    return save_vocabulary(get_todo_page(), get_contacts(), path)
+
+
+def save_vocabulary(todo_page: dict, contacts: list, path: Path = VOCABULARY_PATH) -> dict:
+    """Write the vocabulary cache from an already fetched to-do page and contact list."""
+    vocabulary = {
+        "categories": list(todo_page.get("categories", {}).keys()),
+        "contacts": [
+            {"id": c["id"], "name": c["name"], "company": c["company"]}
+            for c in contacts if c["name"]
+        ],
+        "updated_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(vocabulary, indent=2, ensure_ascii=False))
+    tmp.replace(path)
+    return vocabulary
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("refresh", "classify"):
+        print(__doc__)
+        sys.exit(1)
+
+    if sys.argv[1] == "refresh":
+        vocabulary = refresh_vocabulary()
+        print(json.dumps(vocabulary["categories"], ensure_ascii=False))
+    else:
+        print(json.dumps(Triage().classify(" ".join(sys.argv[2:])), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The scraping scripts import each other as top-level modules (they run as python src/scraping/X.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "scraping"))
+
+
+@pytest.fixture
+def blob_dir(tmp_path, monkeypatch):
+    """A throwaway description store."""
+    from scrapers import descriptions
+    monkeypatch.setattr(descriptions, "BLOB_DIR", tmp_path / "blobs")
+    return tmp_path / "blobs"
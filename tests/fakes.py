@@ -0,0 +1,67 @@
+"""Offline stand-ins for the scrapers' HTTP session, serving recorded payloads from fixtures/."""
+import json
+from pathlib import Path
+
+import requests
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_fixture(name: str):
+    return json.loads((FIXTURES / name).read_text())
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, body=None):
+        self.status_code = status_code
+        self.body = body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)
+
+    def json(self):
+        return self.body
+
+
+class FakeSession:
+    """Stands in for the scrapers' shared requests.Session: `route(method, url, params, json)` returns
+    a fixture name (or None for a 404), and every request is recorded in `calls`."""
+
+    def __init__(self, route):
+        self.route = route
+        self.calls = []
+
+    def request(self, method, url, timeout=None, params=None, json=None, headers=None):
+        self.calls.append({"method": method, "url": url, "params": params, "json": json})
+        name = self.route(method, url, params or {}, json or {})
+        return FakeResponse(200, load_fixture(name)) if name else FakeResponse(404)
+
+
+class StreamedResponse:
+    """A streamed response whose body is produced chunk by chunk, never held whole."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=None):
+        yield from self.chunks
+
+
+class StreamingSession:
+    """Stands in for the session in BaseScraper.stream_json: every GET streams `body()`'s chunks."""
+
+    def __init__(self, body):
+        self.body = body
+
+    def get(self, url, timeout=None, stream=False, **kwargs):
+        return StreamedResponse(self.body())
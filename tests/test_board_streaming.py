@@ -0,0 +1,70 @@
+import json
+import tracemalloc
+
+from fakes import StreamingSession
+from scrapers.descriptions import load
+from scrapers.greenhouse import GreenhouseScraper
+
+JOBS = 1000
+DESCRIPTION_CHARS = 16_000  # about 16 MB of body in all
+
+
+def greenhouse_board():
+    """A Greenhouse board body, one posting per chunk."""
+    yield b'{"meta": {"total": %d}, "jobs": [' % JOBS
+    for i in range(JOBS):
+        item = {
+            "id": i,
+            "title": f"Engineer {i}",
+            "absolute_url": f"https://boards.greenhouse.io/acme/jobs/{i}",
+            "location": {"name": "London" if i % 10 == 0 else "Berlin"},
+            "departments": [{"name": "Engineering"}],
+            "updated_at": "2026-10-01T00:00:00Z",
+            "content": f"&lt;p&gt;Posting {i}: " + "x" * DESCRIPTION_CHARS + "&lt;/p&gt;",
+        }
+        yield (b"," if i else b"") + json.dumps(item).encode()
+    yield b"]}"
+
+
+def peak_mb(func):
+    tracemalloc.start()
+    try:
+        result = func()
+        return result, tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def test_run_memory_stays_bounded_when_filters_keep_nothing(blob_dir):
+    scraper = GreenhouseScraper("Acme", "acme", {"locations": ["Tokyo"]})
+    scraper.session = StreamingSession(greenhouse_board)
+
+    jobs, peak = peak_mb(scraper.run)
+
+    assert jobs == []
+    assert peak < 2, f"peak {peak:.1f} MB for a ~{JOBS * DESCRIPTION_CHARS / 1e6:.0f} MB board"
+    assert not blob_dir.exists()
+
+
+def test_run_memory_stays_bounded_while_storing_kept_descriptions(blob_dir):
+    scraper = GreenhouseScraper("Acme", "acme", {"locations": ["London"]})
+    scraper.session = StreamingSession(greenhouse_board)
+
+    jobs, peak = peak_mb(scraper.run)
+
+    assert len(jobs) == JOBS // 10
+    assert all(job.description is None for job in jobs)
+    assert load(jobs[0].description_ref).startswith("Posting 0: xxx")
+    assert peak < 4, f"peak {peak:.1f} MB for a ~{JOBS * DESCRIPTION_CHARS / 1e6:.0f} MB board"
+
+
+def test_fetch_stores_every_description_and_keeps_no_raw_text(blob_dir):
+    scraper = GreenhouseScraper("Acme", "acme", {})
+    scraper.session = StreamingSession(greenhouse_board)
+
+    jobs, peak = peak_mb(scraper.fetch)
+
+    assert len(jobs) == JOBS
+    assert all(job.description is None and job.description_ref for job in jobs)
+    assert "description" not in jobs[0].to_dict()
+    assert peak < 8, f"peak {peak:.1f} MB for a ~{JOBS * DESCRIPTION_CHARS / 1e6:.0f} MB board"
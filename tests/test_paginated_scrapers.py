@@ -0,0 +1,167 @@
+import threading
+import time
+
+import pytest
+
+from fakes import FakeSession
+from scrapers import smartrecruiters
+from scrapers.base import BaseScraper
+from scrapers.descriptions import load
+from scrapers.html_page import HtmlScraper
+from scrapers.smartrecruiters import SmartRecruitersScraper
+from scrapers.workable import WorkableScraper
+
+
+class PagedScraper(BaseScraper):
+    """Serves numbered pages from memory, slowly, and counts how many are in flight."""
+
+    def __init__(self, pages: int, fail_at: int = None):
+        super().__init__("Paged", "paged", {})
+        self.pages = pages
+        self.fail_at = fail_at
+        self.lock = threading.Lock()
+        self.in_flight = self.max_seen = 0
+
+    def request_json(self, request: dict):
+        with self.lock:
+            self.in_flight += 1
+            self.max_seen = max(self.max_seen, self.in_flight)
+        try:
+            time.sleep(0.02)
+            if request["page"] == self.fail_at:
+                raise RuntimeError(f"page {request['page']} failed")
+            return {"page": request["page"], "total": self.pages}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def test_paginate_offsets_yields_every_page_in_order_with_bounded_prefetch():
+    scraper = PagedScraper(pages=10)
+
+    def next_requests(page):
+        return [{"page": n} for n in range(1, page["total"])] if page["page"] == 0 else []
+
+    pages = [page["page"] for page in scraper.paginate({"page": 0}, next_requests, max_in_flight=3)]
+
+    assert pages == list(range(10))
+    assert 1 < scraper.max_seen <= 3
+
+
+def test_paginate_cursor_follows_one_page_at_a_time():
+    scraper = PagedScraper(pages=4)
+
+    def next_requests(page):
+        return [{"page": page["page"] + 1}] if page["page"] + 1 < page["total"] else []
+
+    assert [page["page"] for page in scraper.paginate({"page": 0}, next_requests)] == [0, 1, 2, 3]
+
+
+def test_paginate_raises_on_a_failed_page():
+    scraper = PagedScraper(pages=5, fail_at=3)
+
+    def next_requests(page):
+        return [{"page": n} for n in range(1, page["total"])] if page["page"] == 0 else []
+
+    with pytest.raises(RuntimeError, match="page 3 failed"):
+        list(scraper.paginate({"page": 0}, next_requests))
+
+
+def workable_route(method, url, params, body):
+    if url.endswith("/api/v3/accounts/acme/jobs") and method == "POST":
+        return "workable_jobs_page2.json" if body.get("token") else "workable_jobs_page1.json"
+    if url.endswith("/api/v2/accounts/acme/jobs/5E1A2B3C4D"):
+        return "workable_job_5E1A2B3C4D.json"
+    return None
+
+
+def test_workable_follows_the_cursor_and_parses_jobs():
+    scraper = WorkableScraper("Acme", "acme", {})
+    scraper.session = FakeSession(workable_route)
+
+    jobs = scraper.fetch_jobs()
+
+    assert [job.title for job in jobs] == ["Senior Data Engineer", "Product Designer", "Account Executive"]
+    assert [call["json"].get("token") for call in scraper.session.calls] == [None, "WzE3MjgzMjk2MDAwMDAsMjg0MTAyMF0="]
+    assert jobs[0].location == "London, England, United Kingdom"
+    assert jobs[0].department == "Data"
+    assert jobs[0].url == "https://apply.workable.com/acme/j/5E1A2B3C4D/"
+    assert jobs[1].location == "Berlin, Berlin, Germany (Remote)"
+    assert jobs[2].department == "Sales"
+
+
+def test_workable_run_stores_descriptions_only_for_kept_jobs(blob_dir):
+    scraper = WorkableScraper("Acme", "acme", {"departments": ["Data"]})
+    scraper.session = FakeSession(workable_route)
+
+    jobs = scraper.run()
+
+    assert [job.title for job in jobs] == ["Senior Data Engineer"]
+    text = load(jobs[0].description_ref)
+    assert "Senior Data Engineer to own our pipelines" in text
+    assert "5+ years of Python" in text and "Private health insurance" in text
+    # One posting fetched, for the one job that passed the filters
+    assert sum("/api/v2/" in call["url"] for call in scraper.session.calls) == 1
+    assert len(list(blob_dir.rglob("*.z"))) == 1
+
+
+def test_workable_error_returns_no_jobs():
+    scraper = WorkableScraper("Acme", "missing", {})
+    scraper.session = FakeSession(workable_route)
+
+    assert scraper.fetch_jobs() == []
+
+
+def smartrecruiters_route(method, url, params, body):
+    if url.endswith("/companies/acme/postings"):
+        return f"smartrecruiters_postings_{params['offset']}.json"
+    if url.endswith("/companies/acme/postings/744000012345601"):
+        return "smartrecruiters_posting_744000012345601.json"
+    return None
+
+
+def test_smartrecruiters_requests_every_offset_after_the_first_page(monkeypatch):
+    monkeypatch.setattr(smartrecruiters, "PAGE_SIZE", 2)
+    scraper = SmartRecruitersScraper("Acme", "acme", {})
+    scraper.session = FakeSession(smartrecruiters_route)
+
+    jobs = scraper.fetch_jobs()
+
+    assert [call["params"]["offset"] for call in scraper.session.calls] == [0, 2, 4]
+    assert len(jobs) == 5
+    assert jobs[0].location == "London, England, United Kingdom"
+    assert jobs[0].department == "Engineering"
+    assert jobs[1].location == "Lisbon, Portugal (Remote)"
+    assert jobs[1].department == "Customer Service"
+    assert jobs[3].location == "London, gb"
+    assert jobs[0].url == "https://jobs.smartrecruiters.com/acme/744000012345601"
+
+
+def test_smartrecruiters_run_stores_descriptions_only_for_kept_jobs(monkeypatch, blob_dir):
+    monkeypatch.setattr(smartrecruiters, "PAGE_SIZE", 2)
+    scraper = SmartRecruitersScraper("Acme", "acme", {"departments": ["Engineering"]})
+    scraper.session = FakeSession(smartrecruiters_route)
+
+    jobs = scraper.run()
+
+    assert [job.title for job in jobs] == ["Backend Engineer"]
+    text = load(jobs[0].description_ref)
+    assert text.startswith("Company Description\nWe build tools for shipping logistics.")
+    assert "Qualifications\nPython\nPostgreSQL" in text
+    assert "Additional Information" not in text
+    assert len(list(blob_dir.rglob("*.z"))) == 1
+
+
+def test_smartrecruiters_failed_page_returns_no_jobs(monkeypatch):
+    monkeypatch.setattr(smartrecruiters, "PAGE_SIZE", 2)
+    scraper = SmartRecruitersScraper("Acme", "acme", {})
+    scraper.session = FakeSession(lambda method, url, params, body:
+                                  None if params.get("offset") == 4 else smartrecruiters_route(method, url, params, body))
+
+    assert scraper.fetch_jobs() == []
+
+
+def test_html_bad_selector_returns_no_jobs_instead_of_raising():
+    scraper = HtmlScraper("Acme", "https://acme.example/careers", {}, selectors={"item": "li[", "title": "h3"})
+
+    assert scraper.fetch_jobs() == []
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Anthropic Messages API, for exercising categorize.py offline.
+
+Answers POST /v1/messages with a record_categories tool call that covers
+every job in the request, after --latency seconds. It tracks the prompt
+cache the way the real API reports it: the first request with a given
+cached system prompt counts as a cache write, and later ones as cache reads.
+With --rate-limit-every N, every Nth request gets a 429 with Retry-After,
+so the client's retries are exercised too. Press Ctrl-C for a summary.
+
+1. Start the stand-in (from the repo root), optionally with sample jobs:
+    python tools/messages_standin.py --port 8082 --sample-jobs 500
+
+   It creates a scratch data directory, writes the sample jobs to
+   scraped_tmp.json there, and prints the directory.
+
+2. In another shell, point categorize.py at it and at that directory, so
+   the cache and review queue it writes are the scratch ones:
+    python src/scraping/categorize.py --base-url http://127.0.0.1:8082 --data-dir <scratch dir>
+
+The stand-in refuses to use data/scraped_jobs/ as its scratch directory.
+"""
+import argparse
+import hashlib
+import json
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+REAL_DATA_DIR = Path(__file__).parent.parent / "data" / "scraped_jobs"
+
+# (title, department, profile terms a pre-score might have matched)
+SAMPLE_JOBS = [
+    ("Research Engineer, Interpretability", "Research", ["research engineer", "interpretability", "london"]),
+    ("Account Executive", "Sales", []),
+    ("Policy Analyst", "Policy", ["policy"]),
+    ("Software Engineer, Infrastructure", "Engineering", ["engineer", "python"]),
+    ("Operations Manager", "Operations", []),
+]
+
+
+class FakeMessages:
+    def __init__(self, latency: float, rate_limit_every: int):
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.lock = threading.Lock()
+        self.cached_prefixes = set()
+        self.requests = 0
+        self.rate_limited = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.jobs = 0
+        self.cache_reads = 0
+        self.cache_writes = 0
+
+    def handle(self, body: dict):
+        """Returns (status, headers, payload)."""
+        with self.lock:
+            self.requests += 1
+            if self.rate_limit_every and self.requests % self.rate_limit_every == 0:
+                self.rate_limited += 1
+                return 429, {"retry-after": "1"}, {
+                    "type": "error", "error": {"type": "rate_limit_error", "message": "Stand-in rate limit"}}
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        try:
+            time.sleep(self.latency)
+            return 200, {}, self._respond(body)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def _respond(self, body: dict) -> dict:
+        system = body.get("system") or []
+        cached = "".join(block["text"] for block in system if block.get("cache_control"))
+        prefix = hashlib.sha256(cached.encode()).hexdigest() if cached else None
+        prefix_tokens = len(cached) // 4
+
+        text = body["messages"][-1]["content"]
+        text = text if isinstance(text, str) else "".join(b.get("text", "") for b in text)
+        jobs = json.loads(text[text.index("["):])
+
+        with self.lock:
+            self.jobs += len(jobs)
+            hit = prefix in self.cached_prefixes
+            if prefix and not hit:
+                self.cached_prefixes.add(prefix)
+            self.cache_reads += bool(prefix and hit)
+            self.cache_writes += bool(prefix and not hit)
+
+        answers = []
+        for job in jobs:
+            matched = job.get("profile_terms_matched") or []
+            category = "Apply" if len(matched) >= 3 else "Worth discussing" if matched else "Skip"
+            answers.append({"index": job["index"], "category": category,
+                            "reason": f"Stand-in: {len(matched)} profile terms matched"})
+
+        return {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model"),
+            "content": [{"type": "tool_use", "id": f"toolu_{uuid.uuid4().hex[:24]}",
+                         "name": "record_categories", "input": {"jobs": answers}}],
+            "stop_reason": "tool_use",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": len(text) // 4,
+                "output_tokens": 30 * len(answers),
+                "cache_creation_input_tokens": 0 if hit else prefix_tokens,
+                "cache_read_input_tokens": prefix_tokens if hit else 0,
+            },
+        }
+
+
+def make_handler(fake: FakeMessages):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if self.path.rstrip("/").endswith("/v1/messages"):
+                status, headers, payload = fake.handle(body)
+            else:
+                status, headers, payload = 404, {}, {
+                    "type": "error", "error": {"type": "not_found_error", "message": self.path}}
+
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def write_sample_jobs(count: int, data_dir: Path):
+    now = time.strftime("%Y-%m-%dT%H:%M:%S")
+    jobs = []
+    for i in range(count):
+        title, department, terms = SAMPLE_JOBS[i % len(SAMPLE_JOBS)]
+        jobs.append({
+            "title": title, "company": f"Stand-in Co {i // len(SAMPLE_JOBS)}",
+            "url": f"https://example.com/jobs/{i}", "location": "London", "department": department,
+            "posted_at": now, "source_type": "standin", "scraped_at": now,
+            "prescore": {"score": round(len(terms) / 3, 3), "terms": terms},
+        })
+    tmp_file = data_dir / "scraped_tmp.json"
+    tmp_file.write_text(json.dumps(jobs, indent=2))
+    print(f"Wrote {count} sample jobs to {tmp_file}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Messages API stand-in for categorize.py")
+    parser.add_argument("--port", type=int, default=8082)
+    parser.add_argument("--latency", type=float, default=3.0, help="Seconds per response (default: 3)")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Answer every Nth request with a 429")
+    parser.add_argument("--sample-jobs", type=int, default=0,
+                        help="Write this many sample jobs to scraped_tmp.json in the scratch directory")
+    parser.add_argument("--data-dir", type=Path, default=None,
+                        help="Scratch data directory for categorize.py (default: a new temporary directory)")
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or Path(tempfile.mkdtemp(prefix="gertrudix-standin-"))
+    if data_dir.resolve() == REAL_DATA_DIR.resolve():
+        print(f"Refusing to use the real data directory ({REAL_DATA_DIR}) — pick a scratch directory.")
+        sys.exit(1)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    if args.sample_jobs:
+        write_sample_jobs(args.sample_jobs, data_dir)
+
+    fake = FakeMessages(args.latency, args.rate_limit_every)
+    server = _Server(("127.0.0.1", args.port), make_handler(fake))
+    print(f"Fake Messages API on http://127.0.0.1:{args.port} — Ctrl-C to stop")
+    print(f"Run categorize.py with --base-url http://127.0.0.1:{args.port} --data-dir {data_dir}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n{fake.requests} requests ({fake.rate_limited} rate-limited), {fake.jobs} jobs, "
+              f"max {fake.max_in_flight} in flight")
+        print(f"Prompt cache: {fake.cache_writes} writes, {fake.cache_reads} reads")
+
+
+if __name__ == "__main__":
+    main()
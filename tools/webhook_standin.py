@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for Telegram, for exercising the bot's webhook mode offline.
+
+Acts as a minimal Bot API server (getMe, setWebhook, deleteWebhook,
+sendMessage). Once the bot registers its webhook, it posts a burst of
+Telegram-format message updates to it, concurrently and with the secret
+header, then reports how many were acknowledged and replied to. It also
+checks that an update with a wrong secret is rejected.
+
+1. Start the stand-in (from the repo root):
+    python tools/webhook_standin.py --port 8081 --updates 200
+
+   It creates a scratch inbox directory and prints it.
+
+2. In another shell, start the bot against it, with its inbox in that
+   scratch directory so the fake captures stay out of the real inbox:
+    TELEGRAM_INBOX_DIR=<scratch dir> \\
+    TELEGRAM_API_BASE_URL=http://127.0.0.1:8081 TELEGRAM_BOT_TOKEN=123:standin \\
+    TELEGRAM_WEBHOOK_URL=http://127.0.0.1:8443 TELEGRAM_WEBHOOK_SECRET=standin-secret \\
+    python src/telegram/run_telegram_bot.py --webhook
+
+The stand-in refuses to use data/telegram_inbox/ as its scratch directory.
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl
+
+REAL_INBOX_DIR = Path(__file__).parent.parent / "data" / "telegram_inbox"
+
+CHAT = {"id": 42, "type": "private", "first_name": "Stand-in"}
+USER = {"id": 42, "is_bot": False, "first_name": "Stand-in"}
+BOT_USER = {"id": 123, "is_bot": True, "first_name": "Gertrudix", "username": "gertrudix_standin_bot"}
+
+
+class FakeTelegram:
+    def __init__(self):
+        self.webhook = None
+        self.webhook_ready = threading.Event()
+        self.replies = 0
+        self.lock = threading.Lock()
+
+    def handle(self, method, params):
+        if method == "getMe":
+            return BOT_USER
+        if method == "setWebhook":
+            self.webhook = params
+            self.webhook_ready.set()
+            return True
+        if method == "deleteWebhook":
+            return True
+        if method == "sendMessage":
+            with self.lock:
+                self.replies += 1
+                message_id = self.replies
+            return {"message_id": message_id, "date": int(time.time()), "chat": CHAT,
+                    "from": BOT_USER, "text": params.get("text", "")}
+        return None
+
+
+def make_handler(fake: FakeTelegram):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, as the bot's HTTP client expects
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                params = json.loads(body or b"{}")
+            else:
+                params = dict(parse_qsl(body.decode()))
+
+            method = self.path.rstrip("/").rsplit("/", 1)[-1]
+            result = fake.handle(method, params)
+            payload = {"ok": True, "result": result} if result is not None else \
+                {"ok": False, "error_code": 404, "description": f"Not Found: {method}"}
+
+            data = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # the bot opens many connections at once during a burst
+
+
+def make_update(update_id: int) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": CHAT,
+            "from": USER,
+            "text": f"Stand-in capture #{update_id}: follow up with Jane on Friday",
+        },
+    }
+
+
+def post_update(url: str, secret: str, update: dict):
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(update).encode(),
+        headers={"Content-Type": "application/json", "X-Telegram-Bot-Api-Secret-Token": secret},
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Telegram stand-in for webhook mode")
+    parser.add_argument("--port", type=int, default=8081, help="Port for the fake Bot API")
+    parser.add_argument("--updates", type=int, default=100, help="How many updates to send")
+    parser.add_argument("--concurrency", type=int, default=20, help="Parallel webhook connections")
+    parser.add_argument("--inbox-dir", type=Path, default=None,
+                        help="Scratch inbox directory for the bot (default: a new temporary directory)")
+    args = parser.parse_args()
+
+    inbox_dir = args.inbox_dir or Path(tempfile.mkdtemp(prefix="gertrudix-standin-"))
+    if inbox_dir.resolve() == REAL_INBOX_DIR.resolve():
+        print(f"Refusing to use the real inbox ({REAL_INBOX_DIR}) — pick a scratch directory.")
+        sys.exit(1)
+    inbox_dir.mkdir(parents=True, exist_ok=True)
+
+    fake = FakeTelegram()
+    server = _Server(("127.0.0.1", args.port), make_handler(fake))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Fake Bot API on http://127.0.0.1:{args.port}")
+    print(f"Start the bot with TELEGRAM_INBOX_DIR={inbox_dir} (see the top of this file)")
+    print("Waiting for the bot to set its webhook...")
+
+    fake.webhook_ready.wait()
+    url = fake.webhook["url"]
+    secret = fake.webhook.get("secret_token", "")
+    print(f"Webhook registered: {url} (max_connections={fake.webhook.get('max_connections')})")
+    time.sleep(0.5)  # let the bot's listener finish starting
+
+    status, _ = post_update(url, "wrong-secret", make_update(0))
+    print(f"Wrong secret → HTTP {status} ({'rejected' if status == 403 else 'NOT rejected'})")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda i: post_update(url, secret, make_update(i)), range(1, args.updates + 1)))
+    elapsed = time.perf_counter() - start
+
+    ok = sum(1 for status, _ in results if status == 200)
+    latencies = sorted(latency for _, latency in results)
+    print(f"Posted {args.updates} updates in {elapsed:.2f}s — {ok} accepted")
+    print(f"Webhook latency: median {statistics.median(latencies) * 1000:.1f} ms, "
+          f"max {latencies[-1] * 1000:.1f} ms")
+
+    # Replies are sent once each capture is durable
+    deadline = time.time() + 10
+    while fake.replies < ok and time.time() < deadline:
+        time.sleep(0.1)
+    print(f"Replies received: {fake.replies}/{ok}")
+    log = inbox_dir / "inbox.jsonl"
+    captures = len(log.read_bytes().splitlines()) if log.exists() else 0
+    print(f"Captures in {log}: {captures}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()